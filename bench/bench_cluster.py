@@ -0,0 +1,81 @@
+# bench_cluster.py
+# 군집화 방식 비교: dense(n×n 코사인 거리 행렬) / sparse(정확한 반경 이웃 그래프) / ann(IVF 근사 이웃)
+# (가짜 임베딩: 주제 → 사건 → 기사 계층, 같은 사건 기사 2~10건이 모이고 40%는 단독 기사)
+#
+# 사용법: python bench_cluster.py [기사 수 목록 (기본: 1000,10000,100000)] [차원 (기본: 1536)]
+
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.metrics import adjusted_rand_score
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, "summary"))
+
+import pandas as pd
+from run_cluster import cluster_articles
+
+DENSE_MAX = 10000    # 이보다 크면 dense는 메모리 때문에 건너뜀 (n² float32 여러 벌)
+EMPTY_RATIO = 0.05   # 텍스트가 없는 행(zero vector) 비율
+
+
+def make_embeddings(n, dim, seed=0, noise_ratio=0.4, n_topics=None, topic_spread=1.0, spread=0.5):
+    """
+    주제(보험료, 실적, 인사 ...) 중심 → 사건 중심 → 기사 순으로 퍼뜨린 가짜 임베딩.
+    같은 사건 기사끼리는 코사인 거리 약 0.2, 같은 주제의 다른 사건끼리는 약 0.5입니다.
+    """
+    rng = np.random.default_rng(seed)
+    n_topics = n_topics or max(1, int(np.sqrt(n) / 2))
+    topics = rng.normal(size=(n_topics, dim)).astype(np.float32)
+    topics /= np.linalg.norm(topics, axis=1, keepdims=True)
+    X = np.empty((n, dim), dtype=np.float32)
+    i = 0
+    while i < n:
+        size = 1 if rng.random() < noise_ratio else int(rng.integers(2, 11))
+        size = min(size, n - i)
+        center = topics[rng.integers(n_topics)] + topic_spread * rng.normal(size=dim).astype(np.float32) / np.sqrt(dim)
+        center /= np.linalg.norm(center)
+        X[i:i + size] = center + spread * rng.normal(size=(size, dim)).astype(np.float32) / np.sqrt(dim)
+        i += size
+    X[rng.random(n) < EMPTY_RATIO] = 0.0
+    return X[rng.permutation(n)]
+
+
+def run(method, X):
+    df = pd.DataFrame({"embedding": list(X)})
+    started = time.perf_counter()
+    labels = cluster_articles(df, method=method)["cluster"].to_numpy()
+    return time.perf_counter() - started, labels
+
+
+def main():
+    print("\n📄 사용법: python bench_cluster.py [기사 수 목록 (기본: 1000,10000,100000)] [차원 (기본: 1536)]")
+    sizes = [int(n) for n in sys.argv[1].split(",")] if len(sys.argv) > 1 else [1000, 10000, 100000]
+    dim = int(sys.argv[2]) if len(sys.argv) > 2 else 1536
+
+    for n in sizes:
+        X = make_embeddings(n, dim)
+        print(f"\n🔬 기사 {n:,}건 (차원 {dim}, 빈 텍스트 {int((np.abs(X).sum(axis=1) == 0).sum())}건)")
+        results = {}
+        for method in ("dense", "sparse", "ann"):
+            # sparse는 비교가 n²번이라 느리지만 메모리는 청크 크기만큼만 써서, ann 정확도의 기준으로 항상 돌림
+            if method == "dense" and n > DENSE_MAX:
+                print(f" - {method:6s}: 건너뜀 (n² 메모리)")
+                continue
+            elapsed, labels = run(method, X)
+            results[method] = labels
+            n_clusters = len(set(labels)) - (1 if -1 in labels else 0)
+            print(f" - {method:6s}: {elapsed:7.2f}초, 군집 {n_clusters:,}개, 노이즈 {(labels == -1).sum():,}건")
+
+        reference = results.get("dense", results.get("sparse"))
+        if "dense" in results and "sparse" in results:
+            print(f"   sparse 라벨 == dense 라벨: {bool((results['sparse'] == results['dense']).all())}")
+        if reference is not None and "ann" in results:
+            print(f"   ann 정확도 (정확한 결과 대비 ARI): {adjusted_rand_score(reference, results['ann']):.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# bench_extractor.py
+# 기존 3함수 경로(parse_article_content + extract_journalist_info + time_info)와
+# 단일 패스 extract_article의 처리량(docs/sec)과 최대 메모리 비교
+# (기본: bench/fixtures/naver_article의 저장된 기사 페이지, 없으면 대역 서버 템플릿으로 만든 기사)
+
+import os
+import sys
+import glob
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from crawl.naver_news_scraper import parse_article_content, extract_journalist_info, time_info
+from crawl.article_extractor import extract_article, ArticleRecord, DEFAULT_PARSER
+from bench.local_news_server import render_article
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "naver_article")
+ARTICLE_URL = "https://n.news.naver.com/mnews/article/{oid}/{aid}"
+MIN_DOCS = 200  # 저장된 기사가 적으면 이만큼 되도록 반복해서 처리량을 잼
+
+
+def load_fixtures(fixture_dir=FIXTURE_DIR):
+    """
+    fixture_dir의 저장된 기사 HTML({언론사코드}_{기사번호}.html)을 (url, html) 목록으로 읽고,
+    없으면 대역 서버 템플릿으로 만듭니다.
+    """
+    docs = []
+    for path in sorted(glob.glob(os.path.join(fixture_dir, "*.html"))):
+        oid, _, aid = os.path.splitext(os.path.basename(path))[0].partition("_")
+        with open(path, "r", encoding="utf-8") as f:
+            docs.append((ARTICLE_URL.format(oid=oid, aid=aid or "0000000000"), f.read()))
+    if docs:
+        print(f"📂 저장된 기사 {len(docs)}건: {fixture_dir}")
+        return docs * max(1, MIN_DOCS // len(docs))
+    print(f"⚠️ {fixture_dir}에 *.html 파일이 없어 대역 기사로 대체합니다.")
+    return [(ARTICLE_URL.format(oid="001", aid=f"{i:010d}"), render_article(f"{i:010d}")) for i in range(MIN_DOCS)]
+
+
+def three_function_path(url, html):
+    content_text, soup = parse_article_content(url, html)
+    jour_link, jour_name = extract_journalist_info(soup)
+    return ArticleRecord(content_text, jour_link, jour_name, time_info(soup))
+
+
+def measure(name, func, docs):
+    # tracemalloc은 실행을 크게 느리게 하므로 처리량과 메모리는 따로 잰다
+    started = time.perf_counter()
+    results = [func(url, html) for url, html in docs]
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    for url, html in docs[:20]:
+        func(url, html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f" - {name:<32}: {len(docs) / elapsed:8.1f} docs/sec, 최대 메모리 {peak / 1024 / 1024:6.1f} MB")
+    return results
+
+
+def main():
+    print("\n📄 사용법: python bench_extractor.py [저장된 기사 HTML 폴더 (기본: bench/fixtures/naver_article)]")
+    docs = load_fixtures(sys.argv[1] if len(sys.argv) > 1 else FIXTURE_DIR)
+    print(f"\n🔬 기사 {len(docs)}건, 평균 {sum(len(html) for _, html in docs) // len(docs):,}자")
+
+    baseline = measure("3함수 경로 (html.parser)", three_function_path, docs)
+    single = measure("extract_article (html.parser)", lambda u, h: extract_article(u, h, "html.parser"), docs)
+    results_match = baseline == single
+    if DEFAULT_PARSER != "html.parser":
+        fast = measure(f"extract_article ({DEFAULT_PARSER})", extract_article, docs)
+        results_match = results_match and baseline == fast
+    print(f" - 결과 일치: {results_match}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# bench_near_dup.py
+# 근접 중복 묶음(MinHash + LSH)의 처리 시간과, 전체 쌍 비교(정확한 자카드) 대비 정확도 확인
+# (가짜 기사: 원문 하나를 여러 매체가 조금씩 고쳐 쓴 재전송 기사 + 서로 다른 기사)
+
+import os
+import sys
+import time
+import random
+import itertools
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(BASE_DIR)
+
+from utils.near_dup import NearDupGrouper, normalize_text, SHINGLE_SIZE
+
+WORDS = ["보험", "삼성생명", "금융당국", "실적", "발표", "소비자", "상품", "시장", "규제", "인상",
+         "보험료", "가입자", "손해율", "배당", "계약", "설계사", "판매", "금리", "자본", "건전성"]
+OUTLETS = ["(서울=연합뉴스)", "(서울=뉴스1)", "(서울=뉴시스)", "[머니투데이]"]
+
+
+def make_corpus(n_stories, copies, seed=0):
+    """
+    기사 n_stories건과 기사마다 재전송본 0 ~ copies건을 만들어 (본문 목록, 원문 번호 목록)을 돌려줍니다.
+    """
+    rng = random.Random(seed)
+    texts, stories = [], []
+    for story in range(n_stories):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(80, 200))]
+        texts.append(" ".join(words) + f" 기사{story}")
+        stories.append(story)
+        for _ in range(rng.randint(0, copies)):
+            edited = list(words)
+            for _ in range(max(1, len(edited) // 40)):  # 단어 몇 개 바꾸고 매체명/기자명 붙이기
+                edited[rng.randrange(len(edited))] = rng.choice(WORDS)
+            texts.append(f"{rng.choice(OUTLETS)} " + " ".join(edited) + f" 기사{story} 기자 {rng.randint(1, 99)}")
+            stories.append(story)
+    return texts, stories
+
+
+def exact_pairs(texts, threshold):
+    shingles = []
+    for text in texts:
+        text = normalize_text(text)
+        shingles.append({text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)})
+    return {(i, j) for i, j in itertools.combinations(range(len(texts)), 2)
+            if len(shingles[i] & shingles[j]) / len(shingles[i] | shingles[j]) >= threshold}
+
+
+def main():
+    print("\n📄 사용법: python bench_near_dup.py [최대 원문 기사 수 (기본: 20000)]")
+    max_stories = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    # 1) 작은 말뭉치에서 전체 쌍 비교와 결과 비교
+    texts, _ = make_corpus(300, 3)
+    grouper = NearDupGrouper()
+    groups = grouper.group(texts)
+    truth = exact_pairs(texts, grouper.threshold)
+    found = {(i, j) for i, j in itertools.combinations(range(len(texts)), 2) if groups[i] == groups[j]}
+    hit = len(truth & found)
+    print(f"\n🎯 기사 {len(texts)}건: 정확한 쌍 {len(truth)}개 중 {hit}개 찾음 "
+          f"(재현율 {hit / max(1, len(truth)):.3f}, 정밀도 {hit / max(1, len(found)):.3f})")
+
+    # 2) 크기를 키우며 처리 시간 확인 (전체 쌍 비교라면 쌍 수에 비례)
+    n_stories = 1000
+    while n_stories <= max_stories:
+        texts, stories = make_corpus(n_stories, 3)
+        grouper = NearDupGrouper()
+        started = time.perf_counter()
+        groups = grouper.group(texts)
+        elapsed = time.perf_counter() - started
+        pure = all(stories[i] == stories[rep] for i, rep in enumerate(groups))
+        stats = grouper.stats()
+        print(f" - 기사 {len(texts):6d}건: {elapsed:6.2f}초, 묶음 {stats['groups']}개, 중복 {stats['duplicates']}건, "
+              f"비교 {stats['compared']:,}회 (전체 쌍 {len(texts) * (len(texts) - 1) // 2:,}), 묶음 정확: {pure}")
+        n_stories *= 4
+
+
+if __name__ == "__main__":
+    main()
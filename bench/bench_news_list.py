@@ -0,0 +1,55 @@
+# bench_news_list.py
+# 검색 결과 수집 http 백엔드 확인: 저장해 둔 결과 페이지를 로컬 서버로 내주고 http_news_scraper를 돌려서
+#   - selenium 경로(스크롤한 페이지 전체를 parse_news_items로 파싱)와 같은 dict 스키마/기사 목록인지
+#   - start= 로 페이지를 넘기다 새 링크가 없으면 멈추는지
+# 를 확인하고 걸린 시간을 잽니다.
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from crawl import http_client, rate_limiter
+from crawl.news_list_scraper import http_news_scraper, parse_news_items, SEARCH_PAGE_SIZE
+from bench.local_search_server import start_server, load_pages, FIXTURE_DIR
+
+QUERY, DATE, CATEGORY = "삼성생명", "20250411", "당사"
+
+
+def main():
+    print("\n📄 사용법: python bench_news_list.py [지연(초) (기본: 0.05)]")
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.05
+
+    server, base_url, requests_seen = start_server(latency)
+    # 로컬 서버라서 도메인 속도 제한은 사실상 풀어 둔다
+    rate_limiter._limiter = rate_limiter.DomainRateLimiter(rate=10000, burst=10000)
+    try:
+        started = time.perf_counter()
+        http_result = http_news_scraper(QUERY, DATE, CATEGORY, session=http_client.create_session(), base_url=base_url)
+        elapsed = time.perf_counter() - started
+    finally:
+        server.shutdown()
+
+    # selenium 경로는 스크롤이 끝난 page_source를 같은 parse_news_items로 파싱함
+    with open(os.path.join(FIXTURE_DIR, "scrolled.html"), "r", encoding="utf-8") as f:
+        selenium_result = parse_news_items(f.read(), QUERY, CATEGORY)
+
+    n_pages = len(load_pages())
+    expected_starts = [page * SEARCH_PAGE_SIZE + 1 for page in range(n_pages + 1)]
+    checks = {
+        "스키마(키 순서 포함)가 selenium 경로와 같음": all(list(a) == list(b) for a, b in zip(http_result, selenium_result)),
+        "기사 목록이 selenium 경로와 같음": http_result == selenium_result,
+        "링크 중복 없음": len({item["링크"] for item in http_result}) == len(http_result),
+        f"새 링크가 없는 페이지에서 멈춤 (start={expected_starts})": requests_seen == expected_starts,
+    }
+    print(f"\n🔬 저장된 결과 페이지 {n_pages}개, 기사 {len(selenium_result)}건")
+    print(f" - http: {elapsed:.2f}초, 요청 {len(requests_seen)}번, 기사 {len(http_result)}건")
+    for name, ok in checks.items():
+        print(f" - {'✅' if ok else '❌'} {name}")
+    if not all(checks.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
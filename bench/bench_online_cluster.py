@@ -0,0 +1,72 @@
+# bench_online_cluster.py
+# 온라인 사건 군집기: 기사 하나 붙이는 지연시간, 상태 다시 읽는 시간, 일괄 군집(sparse)과의 일치도
+# (가짜 임베딩은 bench_cluster.py와 같은 주제 → 사건 → 기사 계층)
+#
+# 사용법: python bench_online_cluster.py [기사 수 (기본: 20000)] [차원 (기본: 1536)]
+
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+from sklearn.metrics import adjusted_rand_score
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, "summary"))
+
+from bench_cluster import make_embeddings
+from online_cluster import StoryClusterer, story_labels
+from utils.neighbors import sparse_dbscan
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+def main():
+    print("\n📄 사용법: python bench_online_cluster.py [기사 수 (기본: 20000)] [차원 (기본: 1536)]")
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    dim = int(sys.argv[2]) if len(sys.argv) > 2 else 1536
+    X = make_embeddings(n, dim)
+    valid = np.abs(X).sum(axis=1) > 0
+    print(f"\n🔬 기사 {n:,}건 (차원 {dim}, 빈 텍스트 {(~valid).sum()}건)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench_stories.sqlite3")
+        clusterer = StoryClusterer(path)
+        # 기사가 하루 동안 고르게 들어오고, 1,000건마다 실시간 루프처럼 maintain()을 부름
+        start = time.time()
+        latencies = []
+        for i in range(n):
+            now = start + DAY_SECONDS * i / n
+            began = time.perf_counter()
+            clusterer.assign(f"article-{i}", X[i], now=now)
+            latencies.append(time.perf_counter() - began)
+            if (i + 1) % 1000 == 0:
+                clusterer.maintain(now)
+        began = time.perf_counter()
+        clusterer.maintain(start + DAY_SECONDS)
+        maintain_seconds = time.perf_counter() - began
+        clusterer.close()
+
+        latencies = np.array(latencies) * 1000
+        print(f" - 기사 붙이기: 평균 {latencies.mean():.3f}ms, p50 {np.percentile(latencies, 50):.3f}ms, "
+              f"p99 {np.percentile(latencies, 99):.3f}ms, 최대 {latencies.max():.1f}ms")
+        print(f" - 마지막 maintain(): {maintain_seconds:.2f}초, 상태 파일 {os.path.getsize(path) / 1024 / 1024:.1f}MB")
+
+        began = time.perf_counter()
+        reloaded = StoryClusterer(path)
+        stories = reloaded.stories_for(f"article-{i}" for i in range(n))
+        print(f" - 상태 다시 읽기 + 기사 {n:,}건 사건 조회: {time.perf_counter() - began:.2f}초")
+        print(f" - 통계: {clusterer.stats()}")
+        online = np.array(story_labels([stories.get(f"article-{i}") for i in range(n)]))
+        reloaded.close()
+
+    began = time.perf_counter()
+    batch = sparse_dbscan(X, eps=0.3, min_samples=2)
+    print(f" - 일괄 sparse 군집 (비교용): {time.perf_counter() - began:.2f}초")
+    print(f"   online 일치도 (sparse 대비 ARI): {adjusted_rand_score(batch, online):.4f}")
+
+
+if __name__ == "__main__":
+    main()
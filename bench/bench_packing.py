@@ -0,0 +1,101 @@
+# bench_packing.py
+# 짧은 기사 여러 건을 한 요청에 묶는 pack 모드와 한 건씩 보내는 online 모드 비교
+# (가짜 AsyncOpenAI 클라이언트: 지연 = 기본 지연 + 입력 토큰 수에 비례, 묶음 응답에서 일부 기사를 빠뜨림)
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import tempfile
+import contextlib
+from types import SimpleNamespace
+
+import pandas as pd
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, "summary"))
+os.environ["NEWSBOT_LLM_CACHE"] = "0"
+
+import summarizer
+from summarizer import get_pack_stats
+from run_summarizer import summarize_news_from_excel
+from utils.token_budget import count_tokens
+
+BASE_LATENCY = 0.3          # 요청 하나의 고정 지연(초)
+LATENCY_PER_TOKEN = 0.0002  # 입력 토큰당 추가 지연(초)
+DROP_RATE = 0.05            # 묶음 응답에서 기사를 빠뜨릴 확률
+WORDS = ["보험", "삼성생명", "금융당국", "실적", "발표", "소비자", "상품", "시장", "규제", "인상"]
+
+
+class FakeCompletions:
+    def __init__(self, rng):
+        self.rng = rng
+        self.requests = 0
+        self.prompt_tokens = 0
+
+    async def create(self, **request):
+        content = request["messages"][-1]["content"]
+        tokens = count_tokens(request["messages"][0]["content"] + content)
+        self.requests += 1
+        self.prompt_tokens += tokens
+        await asyncio.sleep(BASE_LATENCY + tokens * LATENCY_PER_TOKEN)
+        answer = {"is_related": True, "label": "Neutral", "summary": "요약"}
+        if request["response_format"]["json_schema"]["name"] == summarizer.PACKED_RESPONSE_SCHEMA_NAME:
+            ids = [part.split("]", 1)[0] for part in content.split("[기사 id=")[1:]]
+            items = [dict(answer, id=i) for i in ids if self.rng.random() > DROP_RATE]
+            body = json.dumps({"items": items}, ensure_ascii=False)
+        else:
+            body = json.dumps(answer, ensure_ascii=False)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=body))],
+                               usage=SimpleNamespace(prompt_tokens=tokens))
+
+
+def make_articles(n_rows, seed=0):
+    rng = random.Random(seed)
+    return pd.DataFrame({
+        "본문": [" ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 150))) + f" ({i})" for i in range(n_rows)],
+        "키워드": [rng.choice(["삼성생명", "홍원학", "실손"]) for _ in range(n_rows)],
+    })
+
+
+def run(mode, input_path, output_path, prompt, max_in_flight):
+    completions = FakeCompletions(random.Random(1))
+    summarizer._async_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        asyncio.run(summarize_news_from_excel(input_path, output_path, prompt, "cnews", max_in_flight, mode))
+    elapsed = time.perf_counter() - started
+    output = pd.read_parquet(output_path)
+    return elapsed, completions, output
+
+
+def main():
+    print("\n📄 사용법: python bench_packing.py [기사 수 (기본: 300)] [동시 요청 수 (기본: 20)]")
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    max_in_flight = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    with open(os.path.join(BASE_DIR, "prompt", "cnews_summary.txt"), "r", encoding="utf-8") as f:
+        prompt = f.read()
+
+    tmp_dir = tempfile.mkdtemp()
+    input_path = os.path.join(tmp_dir, "bench.parquet")
+    make_articles(n_rows).to_parquet(input_path)
+    print(f"\n🔬 기사 {n_rows}건, 프롬프트 {count_tokens(prompt)}토큰, 동시 요청 {max_in_flight}개")
+
+    results = {}
+    for mode in ("online", "pack"):
+        results[mode] = run(mode, input_path, os.path.join(tmp_dir, f"{mode}.parquet"), prompt, max_in_flight)
+        elapsed, completions, output = results[mode]
+        print(f" - {mode:6s}: {elapsed:6.2f}초, 요청 {completions.requests:4d}건, 프롬프트 토큰 {completions.prompt_tokens:,}")
+
+    (online_time, online, online_out), (pack_time, pack, pack_out) = results["online"], results["pack"]
+    aligned = (online_out["본문"] == pack_out["본문"]).all() and pack_out["summary"].notna().all()
+    print(f"\n📊 pack 모드: 시간 {online_time / pack_time:.1f}배 빠름, "
+          f"프롬프트 토큰 {1 - pack.prompt_tokens / online.prompt_tokens:.1%} 절약, 행 정렬 유지: {aligned}")
+    print(f"📦 묶음 통계: {get_pack_stats().stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# bench_process_links.py
+# process_links(순차) vs process_links_async(동시) 본문 수집 벤치마크
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from crawl import html_cache, rate_limiter
+from crawl.naver_news_scraper import process_links, process_links_async
+from bench.local_news_server import start_server
+
+HEADERS = {"User-Agent": "newsbot-bench"}
+
+
+def main():
+    print("\n📄 사용법: python bench_process_links.py [기사 수 (기본: 200)] [지연(초) (기본: 0.1)]")
+    n_links = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+
+    server, base_url = start_server(latency)
+    links = [f"{base_url}/mnews/article/001/{i:010d}" for i in range(n_links)]
+    tmp_dir = tempfile.mkdtemp()
+    # fresh_ttl=0: 매 요청이 네트워크까지 가도록 해서 순수 수집 시간을 비교
+    html_cache._cache = html_cache.HtmlCache(os.path.join(tmp_dir, "bench_cache.sqlite3"), fresh_ttl=0)
+    warm_cache = html_cache.HtmlCache(os.path.join(tmp_dir, "bench_cache.sqlite3"))
+    # 로컬 서버라서 도메인 속도 제한은 사실상 풀어 둔다
+    rate_limiter._limiter = rate_limiter.DomainRateLimiter(rate=10000, burst=10000)
+
+    try:
+        started = time.perf_counter()
+        sync_result = process_links(links, HEADERS)
+        sync_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        async_result = process_links_async(links, HEADERS)
+        async_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        cached_result = process_links_async(links, HEADERS, cache=warm_cache)
+        cached_time = time.perf_counter() - started
+    finally:
+        server.shutdown()
+
+    print(f"\n🔬 기사 {n_links}건, 응답 지연 {latency}초")
+    print(f" - process_links       : {sync_time:.2f}초")
+    print(f" - process_links_async : {async_time:.2f}초 (x{sync_time / async_time:.1f})")
+    print(f" - 캐시 재실행         : {cached_time:.2f}초 ({warm_cache.stats()})")
+    print(f" - 결과 일치           : {sync_result == async_result == cached_result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# bench_storage.py
+# 하루치 기사 데이터로 Excel / Parquet / Arrow(feather) 읽기/쓰기 시간과 파일 크기 비교
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.storage import EXTENSIONS, write_frame, read_frame
+
+PRESSES = ["조선일보", "중앙일보", "동아일보", "한국경제", "매일경제", "연합뉴스", "뉴스1", "뉴시스"]
+KEYWORDS = ["삼성생명", "홍원학", "생명보험", "손해보험", "보험사기", "실손", "삼성전자", "금감원"]
+WORDS = ["보험", "삼성생명", "금융당국", "실적", "발표", "소비자", "상품", "시장", "규제", "인상", "분기", "전망"]
+
+
+def make_day(n_rows, seed=0):
+    """
+    _summary 단계와 비슷한 모양의 하루치 데이터 (본문 1,500~4,000자).
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n_rows):
+        body = " ".join(rng.choice(WORDS) for _ in range(rng.randint(300, 800)))
+        rows.append({
+            "제목": f"[단독] {rng.choice(KEYWORDS)} 관련 기사 {i}",
+            "언론사": rng.choice(PRESSES),
+            "링크": f"https://example.com/news/{i}",
+            "네이버링크": f"https://n.news.naver.com/mnews/article/001/{i:010d}",
+            "분류": "보험",
+            "키워드": rng.choice(KEYWORDS),
+            "본문": body,
+            "기자명": "홍길동 기자",
+            "기자링크": f"https://media.naver.com/journalist/001/{i}",
+            "발행시각": "2025-04-11 09:00:00",
+            "summary": "기사 요약 한 문장입니다.",
+            "label": rng.choice(["Positive", "Negative", "Neutral"]),
+            "is_related": rng.random() < 0.3,
+        })
+    return pd.DataFrame(rows)
+
+
+def main():
+    print("\n📄 사용법: python bench_storage.py [기사 수 (기본: 1500)]")
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1500
+    df = make_day(n_rows)
+    tmp_dir = tempfile.mkdtemp()
+    print(f"\n🔬 기사 {n_rows}건, 본문 평균 {int(df['본문'].str.len().mean()):,}자")
+
+    for fmt, ext in EXTENSIONS.items():
+        path = os.path.join(tmp_dir, f"bench{ext}")
+        started = time.perf_counter()
+        write_frame(df, path)
+        write_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        loaded = read_frame(path)
+        read_time = time.perf_counter() - started
+
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        print(f" - {fmt:<8}: 쓰기 {write_time:6.2f}초, 읽기 {read_time:6.2f}초, 크기 {size_mb:6.1f} MB, 행 {len(loaded)}")
+
+
+if __name__ == "__main__":
+    main()
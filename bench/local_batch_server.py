@@ -0,0 +1,158 @@
+# local_batch_server.py
+# 오프라인 테스트용 OpenAI Batch API 대역 서버 (/v1/files, /v1/batches 일부만 흉내 냄)
+#
+# 사용법: python local_batch_server.py [처리 지연(초)]
+#         OPENAI_BASE_URL=http://127.0.0.1:8766/v1 python run_summarizer.py cnews 20250411 --mode batch
+
+import sys
+import json
+import time
+import uuid
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_completion(body):
+    """
+    요청 본문의 기사 앞부분을 요약처럼 돌려주는 가짜 chat completion 응답.
+    """
+    content = body["messages"][-1]["content"]
+    article = content.rsplit("본문:", 1)[-1].strip()
+    answer = {"is_related": True, "label": "Neutral", "summary": article[:50]}
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": json.dumps(answer, ensure_ascii=False)},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": len(content), "completion_tokens": 20, "total_tokens": len(content) + 20},
+    }
+
+
+class BatchStore:
+    def __init__(self, delay):
+        self.delay = delay
+        self.files = {}
+        self.batches = {}
+        self.lock = threading.Lock()
+
+    def add_file(self, filename, data, purpose):
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        with self.lock:
+            self.files[file_id] = data
+        return {"id": file_id, "object": "file", "bytes": len(data), "created_at": int(time.time()),
+                "filename": filename, "purpose": purpose, "status": "processed"}
+
+    def create_batch(self, request):
+        batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+        batch = {
+            "id": batch_id, "object": "batch", "endpoint": request["endpoint"],
+            "input_file_id": request["input_file_id"], "completion_window": request["completion_window"],
+            "status": "validating", "created_at": int(time.time()),
+            "output_file_id": None, "error_file_id": None,
+            "request_counts": {"total": 0, "completed": 0, "failed": 0},
+        }
+        with self.lock:
+            self.batches[batch_id] = batch
+        threading.Thread(target=self._run, args=(batch_id,), daemon=True).start()
+        return batch
+
+    def _run(self, batch_id):
+        batch = self.batches[batch_id]
+        batch["status"] = "in_progress"
+        time.sleep(self.delay)
+        lines = self.files[batch["input_file_id"]].decode("utf-8").splitlines()
+        outputs = []
+        for line in lines:
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            outputs.append(json.dumps({
+                "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+                "custom_id": request["custom_id"],
+                "response": {"status_code": 200, "request_id": uuid.uuid4().hex, "body": fake_completion(request["body"])},
+                "error": None,
+            }, ensure_ascii=False))
+        output = self.add_file("batch_output.jsonl", ("\n".join(outputs) + "\n").encode("utf-8"), "batch_output")
+        batch["request_counts"] = {"total": len(outputs), "completed": len(outputs), "failed": 0}
+        batch["output_file_id"] = output["id"]
+        batch["completed_at"] = int(time.time())
+        batch["status"] = "completed"
+
+
+def parse_multipart(content_type, data):
+    boundary = content_type.split("boundary=", 1)[1].strip('"').encode("utf-8")
+    fields = {}
+    for part in data.split(b"--" + boundary):
+        if b"\r\n\r\n" not in part:
+            continue
+        head, value = part.split(b"\r\n\r\n", 1)
+        head = head.decode("utf-8", "replace")
+        name = head.split('name="', 1)[1].split('"', 1)[0]
+        filename = head.split('filename="', 1)[1].split('"', 1)[0] if 'filename="' in head else None
+        fields[name] = (filename, value[:-2] if value.endswith(b"\r\n") else value)
+    return fields
+
+
+def make_handler(store):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status, payload, content_type="application/json"):
+            body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _body(self):
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        def do_POST(self):
+            if self.path == "/v1/files":
+                fields = parse_multipart(self.headers["Content-Type"], self._body())
+                filename, data = fields["file"]
+                return self._send(200, store.add_file(filename, data, fields["purpose"][1].decode("utf-8")))
+            if self.path == "/v1/batches":
+                return self._send(200, store.create_batch(json.loads(self._body())))
+            self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+
+        def do_GET(self):
+            parts = self.path.strip("/").split("/")
+            if parts[:2] == ["v1", "batches"] and len(parts) == 3 and parts[2] in store.batches:
+                return self._send(200, store.batches[parts[2]])
+            if parts[:2] == ["v1", "files"] and len(parts) == 4 and parts[3] == "content" and parts[2] in store.files:
+                return self._send(200, store.files[parts[2]], "application/octet-stream")
+            self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_server(delay=1.0, port=0):
+    """
+    백그라운드 스레드에서 서버를 띄우고 (server, base_url)을 돌려줍니다.
+    base_url은 OPENAI_BASE_URL에 그대로 넣으면 됩니다.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(BatchStore(delay)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/v1"
+
+
+if __name__ == "__main__":
+    delay = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    server, base_url = start_server(delay, port=8766)
+    print(f"🧪 로컬 배치 서버 실행 중: {base_url} (처리 지연 {delay}초)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,72 @@
+# local_news_server.py
+# 벤치마크용 로컬 네이버 뉴스 대역 서버 (응답마다 인위적인 지연을 넣을 수 있음)
+
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ARTICLE_TEMPLATE = """<html><head><title>기사 {article_id}</title>{scripts}</head><body>
+{navigation}
+<div class="media_end_head_info_datestamp">
+<span class="media_end_head_info_datestamp_time _ARTICLE_DATE_TIME" data-date-time="2025-04-11 09:{minute:02d}:00">2025.04.11. 오전 9:{minute:02d}</span>
+<span class="media_end_head_info_datestamp_time _ARTICLE_MODIFY_DATE_TIME" data-modify-date-time="2025-04-11 10:{minute:02d}:00">2025.04.11. 오전 10:{minute:02d}</span>
+</div>
+<div class="media_end_head_journalist"><a href="https://media.naver.com/journalist/000/{article_id}">
+<em class="media_end_head_journalist_name">홍길동 기자</em></a></div>
+<div id="newsct_article" class="newsct_article _article_body"><article id="dic_area">{body}</article></div>
+{navigation}
+</body></html>"""
+
+# 실제 기사 페이지처럼 본문 외의 메뉴/스크립트 분량을 채워 넣음
+SCRIPTS = "".join(f"<script>var config{i} = {{'key': 'value{i}', 'list': [1, 2, 3]}};</script>" for i in range(40))
+NAVIGATION = "<ul class=\"nav\">" + "".join(
+    f"<li class=\"nav_item\"><a href=\"https://news.naver.com/section/{i}\"><span>메뉴 {i}</span></a></li>" for i in range(300)
+) + "</ul>"
+
+
+def render_article(article_id):
+    body = "".join(f"<p>삼성생명 관련 기사 {article_id}의 {i}번째 문단입니다. 보험업계 동향을 전합니다.</p>" for i in range(30))
+    minute = sum(map(ord, article_id)) % 60
+    return ARTICLE_TEMPLATE.format(article_id=article_id, minute=minute, body=body,
+                                   scripts=SCRIPTS, navigation=NAVIGATION)
+
+
+def make_handler(latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive 지원
+
+        def do_GET(self):
+            time.sleep(latency)
+            body = render_article(self.path.rsplit("/", 1)[-1]).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_server(latency=0.1, port=0):
+    """
+    백그라운드 스레드에서 서버를 띄우고 (server, base_url)을 돌려줍니다.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(latency))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+if __name__ == "__main__":
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.1
+    server, base_url = start_server(latency, port=8765)
+    print(f"🧪 로컬 뉴스 서버 실행 중: {base_url} (지연 {latency}초)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
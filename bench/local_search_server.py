@@ -0,0 +1,74 @@
+# local_search_server.py
+# 저장해 둔 네이버 뉴스 검색 결과 페이지(bench/fixtures/naver_search)를 start 파라미터대로 내주는 로컬 서버
+#
+# page_{start}.html 이 있으면 그 페이지를, 마지막 페이지를 넘기면 실제 검색처럼 마지막 페이지를 다시 내줌
+
+import os
+import re
+import sys
+import time
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "naver_search")
+
+
+def load_pages(fixture_dir=FIXTURE_DIR):
+    """
+    {start: html} 을 돌려줍니다.
+    """
+    pages = {}
+    for name in os.listdir(fixture_dir):
+        match = re.fullmatch(r"page_(\d+)\.html", name)
+        if match:
+            with open(os.path.join(fixture_dir, name), "r", encoding="utf-8") as f:
+                pages[int(match.group(1))] = f.read()
+    return pages
+
+
+def make_handler(pages, latency, requests_seen):
+    last_start = max(pages)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive 지원
+
+        def do_GET(self):
+            time.sleep(latency)
+            query = parse_qs(urlparse(self.path).query)
+            start = int(query.get("start", ["1"])[0])
+            requests_seen.append(start)
+            body = pages.get(start, pages[last_start]).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_server(latency=0.0, port=0, fixture_dir=FIXTURE_DIR):
+    """
+    백그라운드 스레드에서 서버를 띄우고 (server, base_url, 받은 start 목록)을 돌려줍니다.
+    base_url은 news_list_scraper의 base_url 인자로 그대로 넘기면 됩니다.
+    """
+    requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(load_pages(fixture_dir), latency, requests_seen))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/search.naver", requests_seen
+
+
+if __name__ == "__main__":
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.0
+    server, base_url, _ = start_server(latency, port=8766)
+    print(f"🧪 로컬 검색 결과 서버 실행 중: {base_url} (지연 {latency}초)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
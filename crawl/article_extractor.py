@@ -0,0 +1,93 @@
+# article_extractor.py
+# 기사 HTML에서 본문/기자/발행시각을 한 번의 파싱으로 뽑아내는 추출기
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+def _available_parser():
+    # lxml이 설치돼 있으면 더 빠른 lxml 파서를 기본으로 사용
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return "html.parser"
+    return "lxml"
+
+
+DEFAULT_PARSER = _available_parser()
+
+BODY_CLASSES = {"newsct_article", "_article_content"}
+JOURNALIST_CLASS = "media_end_head_journalist"
+DATESTAMP_CLASS = "_ARTICLE_DATE_TIME"
+TARGET_CLASSES = BODY_CLASSES | {JOURNALIST_CLASS, DATESTAMP_CLASS}
+
+
+def _is_target(class_value):
+    if not class_value:
+        return False
+    classes = class_value.split() if isinstance(class_value, str) else class_value
+    return any(c in TARGET_CLASSES for c in classes)
+
+
+# 필요한 서브트리(본문 컨테이너, 기자 블록, 발행시각 span)만 트리로 만든다
+TARGET_STRAINER = SoupStrainer(attrs={"class": _is_target})
+
+
+class ArticleRecord:
+    __slots__ = ("content", "jour_link", "jour_name", "published_at")
+
+    def __init__(self, content='', jour_link=None, jour_name=None, published_at=''):
+        self.content = content
+        self.jour_link = jour_link
+        self.jour_name = jour_name
+        self.published_at = published_at
+
+    def __eq__(self, other):
+        return isinstance(other, ArticleRecord) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return (f"ArticleRecord(content={self.content[:20]!r}..., jour_link={self.jour_link!r}, "
+                f"jour_name={self.jour_name!r}, published_at={self.published_at!r})")
+
+
+def _find_body(soup, url):
+    if 'sports' in url:
+        return soup.find('div', class_='_article_content')
+    return soup.find('div', id='newsct_article')
+
+
+def extract_article(url, html, parser=DEFAULT_PARSER):
+    """
+    기사 HTML 하나를 파싱해서 ArticleRecord로 돌려줍니다.
+
+    필요한 서브트리만 부분 파싱하고, 본문 컨테이너를 못 찾은 경우에만
+    (클래스가 붙지 않은 본문 div 등) 전체 문서를 다시 파싱합니다.
+
+    Args:
+    url (str): 기사 URL (스포츠 기사 여부 판단용).
+    html (str): 기사 HTML.
+    parser (str): BeautifulSoup 파서 이름 ('lxml', 'html.parser' 등).
+
+    Returns:
+    ArticleRecord: 본문, 기자 링크, 기자 이름, 발행시각.
+    """
+    soup = BeautifulSoup(html, parser, parse_only=TARGET_STRAINER)
+    body = _find_body(soup, url)
+    if body is None:
+        soup = BeautifulSoup(html, parser)
+        body = _find_body(soup, url)
+
+    record = ArticleRecord()
+    record.content = body.get_text(strip=True) if body else ''
+
+    jour = soup.find('div', class_=JOURNALIST_CLASS)
+    if jour:
+        jour_link_tag = jour.find('a')
+        jour_name_tag = jour.find('em', class_='media_end_head_journalist_name')
+        record.jour_link = jour_link_tag.get('href') if jour_link_tag else None
+        record.jour_name = jour_name_tag.get_text(strip=True) if jour_name_tag else None
+
+    span = soup.find('span', class_=DATESTAMP_CLASS)
+    if span is not None and span.has_attr('data-date-time'):
+        record.published_at = span['data-date-time']
+    return record
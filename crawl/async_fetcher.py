@@ -0,0 +1,105 @@
+# async_fetcher.py
+# 기사 본문 HTML을 asyncio + aiohttp로 동시에 받아오는 fetcher
+
+import asyncio
+from urllib.parse import urlparse
+
+import aiohttp
+
+try:
+    from crawl.http_client import DEFAULT_HEADERS, DEFAULT_TIMEOUT
+    from crawl.html_cache import update_from_response
+    from crawl.rate_limiter import get_limiter
+except ImportError:
+    from http_client import DEFAULT_HEADERS, DEFAULT_TIMEOUT
+    from html_cache import update_from_response
+    from rate_limiter import get_limiter
+
+DEFAULT_CONCURRENCY = 20
+DEFAULT_PER_HOST = 8
+
+
+async def _request(session, url, request_headers, timeout, limiter):
+    """
+    속도 제한을 지키며 요청하고, 429/5xx/연결 오류는 백오프 후 재시도합니다.
+    (status, text, headers)를 돌려줍니다.
+    """
+    for attempt in range(limiter.max_retries + 1):
+        delay = limiter.acquire_delay(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            async with session.get(url, headers=request_headers, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                text = await response.text(errors="replace")
+                status, headers = response.status, response.headers
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            limiter.record_result(url, None)
+            if attempt == limiter.max_retries:
+                raise
+            await asyncio.sleep(limiter.backoff_delay(attempt))
+            continue
+        if not limiter.record_result(url, status) or attempt == limiter.max_retries:
+            return status, text, headers
+        await asyncio.sleep(limiter.backoff_delay(attempt, headers.get("Retry-After")))
+
+
+async def _fetch_one(session, url, global_sem, host_sems, per_host, timeout, cache, limiter):
+    entry = None
+    request_headers = {}
+    if cache is not None:
+        # SQLite 조회/저장은 스레드에서 돌려서 이벤트 루프를 막지 않음
+        entry = await asyncio.to_thread(cache.lookup, url)
+        if entry is not None and entry.is_fresh(cache.fresh_ttl):
+            cache.hits += 1
+            return entry.body
+        if entry is not None:
+            request_headers = entry.conditional_headers()
+
+    host = urlparse(url).netloc
+    if host not in host_sems:
+        host_sems[host] = asyncio.Semaphore(per_host)
+    async with global_sem, host_sems[host]:
+        try:
+            status, text, headers = await _request(session, url, request_headers, timeout, limiter)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"⚠️ 본문 요청 실패: {url} ({e})")
+            return None
+    if status >= 400:
+        print(f"⚠️ 본문 요청 실패: {url} (HTTP {status})")
+        return None
+    if cache is None:
+        return text
+    return await asyncio.to_thread(update_from_response, cache, url, entry, status, text, headers)
+
+
+async def fetch_all(urls, headers=None, concurrency=DEFAULT_CONCURRENCY, per_host=DEFAULT_PER_HOST, timeout=DEFAULT_TIMEOUT, cache=None, on_result=None, limiter=None):
+    """
+    URL 목록의 HTML을 동시에 받아옵니다.
+
+    Args:
+    urls (list of str): 받아올 URL 목록.
+    headers (dict): 모든 요청에 붙일 헤더 (None이면 http_client 공통 헤더).
+    concurrency (int): 전체 동시 요청 수 상한.
+    per_host (int): 호스트 하나당 동시 요청 수 상한.
+    timeout (float): 요청 하나당 타임아웃(초).
+    cache (HtmlCache): 주어지면 신선한 항목은 캐시에서 바로 쓰고, 오래된 항목은 조건부 요청으로 재검증.
+    on_result (callable): on_result(index, html) 형태로 URL 하나가 끝날 때마다 호출 (체크포인트 기록용).
+    limiter (DomainRateLimiter): 도메인별 속도 제한기 (None이면 공용 제한기).
+
+    Returns:
+    list: urls와 같은 순서의 HTML 문자열 목록 (실패한 URL은 None).
+    """
+    limiter = limiter or get_limiter()
+    global_sem = asyncio.Semaphore(concurrency)
+    host_sems = {}
+    # keep-alive 커넥션을 재사용하도록 세션 하나를 끝까지 공유
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host)
+    async with aiohttp.ClientSession(headers=headers or DEFAULT_HEADERS, connector=connector) as session:
+        async def run(index, url):
+            html = await _fetch_one(session, url, global_sem, host_sems, per_host, timeout, cache, limiter)
+            if on_result is not None:
+                on_result(index, html)
+            return html
+
+        tasks = [run(i, url) for i, url in enumerate(urls)]
+        return await asyncio.gather(*tasks)
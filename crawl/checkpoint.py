@@ -0,0 +1,72 @@
+# checkpoint.py
+# 본문 수집 결과를 URL 단위로 바로바로 기록하는 append-only 체크포인트 저널
+
+import os
+import json
+import threading
+
+
+class CheckpointJournal:
+    """
+    완료된 URL마다 한 줄(JSON)씩 덧붙여 기록하는 저널.
+
+    중간에 죽어도 그때까지 기록된 줄은 남아 있으므로, --resume으로 다시 실행하면
+    이미 받은 링크는 건너뛰고 저널에서 결과를 다시 채울 수 있습니다.
+
+    Args:
+    path (str): 저널 파일 경로 (.jsonl).
+    resume (bool): True면 기존 저널을 이어 쓰고, False면 새로 시작합니다.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self._lock = threading.Lock()
+        self.records = self._load() if resume else {}
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        if resume and self._ends_mid_line():
+            # 잘린 줄 뒤에 바로 이어 쓰지 않도록 줄바꿈부터 넣는다
+            self._file.write("\n")
+            self._file.flush()
+
+    def _ends_mid_line(self):
+        if os.path.getsize(self.path) == 0:
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def _load(self):
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 기록 도중 죽어서 잘린 마지막 줄은 버린다
+                    continue
+                records[entry["url"]] = entry
+        return records
+
+    def __contains__(self, url):
+        return url in self.records
+
+    def append(self, url, **fields):
+        entry = {"url": url, **fields}
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self.records[url] = entry
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
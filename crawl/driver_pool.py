@@ -0,0 +1,174 @@
+# driver_pool.py
+# 헤드리스 크롬을 한 번만 띄워서 여러 키워드 작업에 돌려쓰는 드라이버 풀
+
+import time
+import queue
+import threading
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+
+DEBUG_PORT_BASE = 9222
+SPAWN_RETRIES = 3         # 브라우저를 다시 띄울 때 시도 횟수
+SPAWN_RETRY_DELAY = 2     # 재시도 사이 대기(초), 시도마다 늘어남
+ACQUIRE_TIMEOUT = 300     # 빌릴 브라우저를 기다리는 최대 시간(초)
+
+
+def web_driver(driver_path, port=DEBUG_PORT_BASE, headless='--headless=new'):
+    options = Options()
+    options.add_argument(headless)
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument(f'--remote-debugging-port={port}')  # crash 방지용 (브라우저마다 포트 분리)
+
+    service = Service(driver_path)
+    driver = webdriver.Chrome(service=service, options=options)
+    return driver
+
+
+class _PooledDriver:
+    def __init__(self, driver, port):
+        self.driver = driver
+        self.port = port
+        self.pages = 0
+
+
+class DriverPool:
+    """
+    크롬 드라이버 풀.
+
+    실행당 한 번 N개의 브라우저를 띄우고 키워드 작업에 빌려줍니다.
+    반납할 때마다 쿠키/탭을 정리하고, max_pages 만큼 쓰였거나
+    작업 중 브라우저가 죽으면 새 브라우저로 교체합니다.
+
+    Args:
+    size (int): 동시에 띄워 둘 브라우저 수.
+    max_pages (int): 브라우저 하나를 교체하기 전까지 처리할 페이지 수.
+    driver_version (str): ChromeDriverManager에 넘길 드라이버 버전 (None이면 최신).
+    headless (str): 헤드리스 옵션 인자.
+    """
+
+    def __init__(self, size=1, max_pages=50, driver_version=None, headless='--headless=new'):
+        self.size = size
+        self.max_pages = max_pages
+        self.headless = headless
+        # ChromeDriverManager 설치는 풀 생성 시 한 번만
+        self.driver_path = ChromeDriverManager(driver_version=driver_version).install()
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._all = []
+        self._closed = False
+        for i in range(size):
+            self._idle.put(self._spawn(DEBUG_PORT_BASE + i))
+
+    def _spawn(self, port):
+        pooled = _PooledDriver(web_driver(self.driver_path, port, self.headless), port)
+        with self._lock:
+            self._all.append(pooled)
+        return pooled
+
+    def _discard(self, pooled):
+        with self._lock:
+            if pooled in self._all:
+                self._all.remove(pooled)
+        if pooled.driver is None:
+            return
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    def _respawn(self, port):
+        """
+        새 브라우저를 띄웁니다. SPAWN_RETRIES번 모두 실패하면 빈 자리(driver=None)를 돌려주고,
+        빈 자리는 다음에 빌려갈 때 acquire()에서 다시 띄웁니다 (풀 크기가 줄어들지 않음).
+        """
+        for attempt in range(1, SPAWN_RETRIES + 1):
+            try:
+                return self._spawn(port)
+            except Exception as e:
+                print(f"⚠️ 브라우저 실행 실패 (port {port}, {attempt}/{SPAWN_RETRIES}): {e}")
+                if attempt < SPAWN_RETRIES:
+                    time.sleep(SPAWN_RETRY_DELAY * attempt)
+        return _PooledDriver(None, port)
+
+    def _recycle(self, pooled, reason):
+        print(f"♻️ 브라우저 교체 (port {pooled.port}, {pooled.pages}페이지 사용, 사유: {reason})")
+        self._discard(pooled)
+        return self._respawn(pooled.port)
+
+    def _reset(self, pooled):
+        driver = pooled.driver
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def acquire(self):
+        if self._closed:
+            raise RuntimeError("이미 종료된 드라이버 풀입니다.")
+        try:
+            pooled = self._idle.get(timeout=ACQUIRE_TIMEOUT)
+        except queue.Empty:
+            raise RuntimeError(f"{ACQUIRE_TIMEOUT}초 동안 빌릴 수 있는 브라우저가 없습니다 (풀 크기 {self.size}).")
+        if pooled.driver is None:
+            pooled = self._respawn(pooled.port)
+            if pooled.driver is None:
+                self._idle.put(pooled)
+                raise RuntimeError(f"브라우저를 띄우지 못했습니다 (port {pooled.port}).")
+        return pooled
+
+    def release(self, pooled, broken=False):
+        if self._closed:
+            self._discard(pooled)
+            return
+        try:
+            if broken:
+                pooled = self._recycle(pooled, "crash")
+            elif pooled.pages >= self.max_pages:
+                pooled = self._recycle(pooled, "max_pages")
+            else:
+                self._reset(pooled)
+        except WebDriverException:
+            pooled = self._recycle(pooled, "reset 실패")
+        self._idle.put(pooled)
+
+    @contextmanager
+    def driver(self):
+        """
+        풀에서 드라이버를 빌려 with 블록 안에서 사용합니다.
+
+        with pool.driver() as driver:
+            driver.get(url)
+        """
+        pooled = self.acquire()
+        broken = False
+        try:
+            yield pooled.driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            pooled.pages += 1
+            self.release(pooled, broken=broken)
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            drivers = list(self._all)
+        for pooled in drivers:
+            self._discard(pooled)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
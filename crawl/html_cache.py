@@ -0,0 +1,222 @@
+# html_cache.py
+# 기사 HTML을 디스크에 저장해 두고 재사용하는 캐시 (ETag/Last-Modified 조건부 요청 + LRU 정리)
+
+import os
+import time
+import zlib
+import sqlite3
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+try:
+    from crawl import http_client
+except ImportError:
+    import http_client
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "html_cache.sqlite3")
+DEFAULT_FRESH_TTL = 12 * 60 * 60        # 이 시간 안의 항목은 네트워크 없이 바로 사용
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60      # 이보다 오래된 항목은 정리
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024   # 캐시 전체 크기 상한 (압축 후 기준)
+TOUCH_FLUSH_EVERY = 256                 # 접근 시각 갱신을 이만큼 모아서 한 번에 기록
+DEFAULT_EVICT_INTERVAL = 60 * 60        # maybe_evict()가 실제로 정리하는 최소 간격(초)
+
+
+def normalize_url(url):
+    """
+    캐시 키용 URL 정규화: scheme/host 소문자, fragment 제거, 쿼리 파라미터 정렬.
+    """
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=False)))
+    path = parts.path or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+class CacheEntry:
+    __slots__ = ("body", "etag", "last_modified", "fetched_at")
+
+    def __init__(self, body, etag, last_modified, fetched_at):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    def is_fresh(self, fresh_ttl, now=None):
+        now = time.time() if now is None else now
+        return now - self.fetched_at < fresh_ttl
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HtmlCache:
+    """
+    정규화된 URL을 키로 본문과 ETag/Last-Modified를 저장하는 SQLite 캐시.
+
+    여러 프로세스(일일 수집, 실시간 루프)가 같은 파일을 동시에 써도 되도록 WAL 모드를 씁니다.
+
+    Args:
+    path (str): SQLite 파일 경로.
+    fresh_ttl (float): 재검증 없이 바로 쓰는 기간(초).
+    max_age (float): 이보다 오래 접근하지 않은 항목은 정리 대상(초).
+    max_bytes (int): 캐시 전체 크기 상한. 넘으면 가장 오래 안 쓴 항목부터 지웁니다.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, fresh_ttl=DEFAULT_FRESH_TTL,
+                 max_age=DEFAULT_MAX_AGE, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.fresh_ttl = fresh_ttl
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.hits = self.revalidated = self.misses = 0
+        self._touched = {}  # 아직 기록하지 않은 접근 시각 {url: accessed_at}
+        self._last_evict = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages (accessed_at)")
+        self._conn.commit()
+
+    def lookup(self, url):
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM pages WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            # 조회마다 쓰기/커밋하지 않도록 접근 시각은 모아 두었다가 한 번에 기록 (LRU 순서용이라 조금 늦어도 됨)
+            self._touched[key] = time.time()
+            if len(self._touched) >= TOUCH_FLUSH_EVERY:
+                self._flush_touched()
+                self._conn.commit()
+        body, etag, last_modified, fetched_at = row
+        return CacheEntry(zlib.decompress(body).decode("utf-8"), etag, last_modified, fetched_at)
+
+    def _flush_touched(self):
+        # self._lock을 잡은 상태에서 호출
+        if self._touched:
+            self._conn.executemany("UPDATE pages SET accessed_at = ? WHERE url = ?",
+                                   [(accessed_at, key) for key, accessed_at in self._touched.items()])
+            self._touched.clear()
+
+    def store(self, url, body, etag=None, last_modified=None):
+        key = normalize_url(url)
+        blob = zlib.compress(body.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._touched.pop(key, None)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, body, etag, last_modified, fetched_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, blob, etag, last_modified, now, now, len(blob)),
+            )
+            self._conn.commit()
+
+    def mark_revalidated(self, url):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, normalize_url(url))
+            )
+            self._conn.commit()
+
+    def evict(self):
+        """
+        max_age를 넘긴 항목을 지우고, 전체 크기가 max_bytes를 넘으면 LRU 순서로 지웁니다.
+        """
+        with self._lock:
+            self._flush_touched()
+            self._last_evict = time.time()
+            self._conn.execute("DELETE FROM pages WHERE accessed_at < ?", (time.time() - self.max_age,))
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._conn.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall()
+                doomed = []
+                for url, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    doomed.append((url,))
+                    total -= size
+                self._conn.executemany("DELETE FROM pages WHERE url = ?", doomed)
+            self._conn.commit()
+
+    def maybe_evict(self, interval=DEFAULT_EVICT_INTERVAL):
+        """
+        마지막 정리 후 interval초가 지났을 때만 evict()를 부릅니다 (계속 도는 실시간 루프용).
+        """
+        if time.time() - self._last_evict >= interval:
+            self.evict()
+            return True
+        return False
+
+    def stats(self):
+        return {"hits": self.hits, "revalidated": self.revalidated, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._flush_touched()
+            self._conn.commit()
+            self._conn.close()
+
+
+def update_from_response(cache, url, entry, status, text, response_headers):
+    """
+    응답 결과를 캐시에 반영하고 사용할 본문을 돌려줍니다 (동기/비동기 fetcher 공용).
+    """
+    if status == 304 and entry is not None:
+        cache.mark_revalidated(url)
+        cache.revalidated += 1
+        return entry.body
+    cache.misses += 1
+    if status == 200:
+        cache.store(url, text, response_headers.get("ETag"), response_headers.get("Last-Modified"))
+    return text
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = HtmlCache()
+    return _cache
+
+
+def cached_get_text(url, headers=None, cache=None):
+    """
+    캐시를 거쳐 URL의 HTML을 가져옵니다.
+
+    신선한 항목은 바로 돌려주고, 오래된 항목은 조건부 요청으로 재검증합니다.
+    """
+    cache = cache or get_cache()
+    entry = cache.lookup(url)
+    if entry is not None and entry.is_fresh(cache.fresh_ttl):
+        cache.hits += 1
+        return entry.body
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        request_headers.update(entry.conditional_headers())
+    response = http_client.get(url, headers=request_headers)
+    return update_from_response(cache, url, entry, response.status_code, response.text, response.headers)
@@ -0,0 +1,99 @@
+# http_client.py
+# 모든 크롤러가 같이 쓰는 HTTP 클라이언트 (keep-alive 커넥션 풀, 압축, 공통 헤더/타임아웃)
+
+import time
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from crawl.rate_limiter import get_limiter
+except ImportError:
+    from rate_limiter import get_limiter
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+DEFAULT_TIMEOUT = 5
+DEFAULT_POOL_CONNECTIONS = 10  # 커넥션 풀을 유지할 호스트 수
+DEFAULT_POOL_MAXSIZE = 20      # 호스트 하나당 유지할 커넥션 수
+
+
+def _accept_encoding():
+    # brotli 디코더가 설치된 경우에만 br을 요청 (없으면 urllib3가 풀지 못함)
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+        except ImportError:
+            return "gzip, deflate"
+    return "gzip, deflate, br"
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept-Encoding": _accept_encoding(),
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def create_session(pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE):
+    """
+    공통 헤더와 커넥션 풀 크기가 설정된 새 requests.Session을 만듭니다.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+def get_session():
+    """
+    프로세스 전체에서 공유하는 세션을 돌려줍니다 (처음 호출할 때 생성).
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def configure(pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE):
+    """
+    공유 세션의 커넥션 풀 크기를 바꿉니다. 동시 작업 수를 늘릴 때 같이 키워 주세요.
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = create_session(pool_connections, pool_maxsize)
+    return _session
+
+
+def get(url, timeout=DEFAULT_TIMEOUT, session=None, limiter=None, **kwargs):
+    """
+    도메인별 속도 제한을 지키며 GET 요청을 보냅니다.
+
+    429/5xx 응답이나 연결 오류는 지수 백오프(지터)로 재시도하고,
+    재시도를 다 쓰면 마지막 응답을 돌려주거나 마지막 예외를 다시 던집니다.
+    """
+    session = session or get_session()
+    limiter = limiter or get_limiter()
+    for attempt in range(limiter.max_retries + 1):
+        limiter.wait(url)
+        try:
+            response = session.get(url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            limiter.record_result(url, None)
+            if attempt == limiter.max_retries:
+                raise
+            time.sleep(limiter.backoff_delay(attempt))
+            continue
+        if not limiter.record_result(url, response.status_code) or attempt == limiter.max_retries:
+            return response
+        time.sleep(limiter.backoff_delay(attempt, response.headers.get("Retry-After")))
@@ -0,0 +1,96 @@
+# keyword_scheduler.py
+# 키워드별 수집 작업을 제한된 워커 풀에서 병렬로 실행하는 스케줄러
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+
+class HostLimiter:
+    """
+    호스트별 예의(politeness) 제한.
+
+    같은 호스트에 동시에 보내는 요청 수를 max_per_host로 막고,
+    연속 요청 사이에 최소 min_interval 초 간격을 둡니다.
+    """
+
+    def __init__(self, max_per_host=2, min_interval=0.2):
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._last_request = {}
+
+    def _host_state(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.Semaphore(self.max_per_host)
+                self._last_request[host] = 0.0
+            return self._semaphores[host]
+
+    def _wait_interval(self, host):
+        while True:
+            with self._lock:
+                wait = self._last_request[host] + self.min_interval - time.monotonic()
+                if wait <= 0:
+                    self._last_request[host] = time.monotonic()
+                    return
+            time.sleep(wait)
+
+    @contextmanager
+    def slot(self, url):
+        host = urlparse(url).netloc
+        semaphore = self._host_state(host)
+        with semaphore:
+            self._wait_interval(host)
+            yield
+
+
+def run_keyword_jobs(selected_keywords, worker, concurrency=4):
+    """
+    (category, query) 작업들을 병렬로 실행하고 원래 순서대로 결과를 합칩니다.
+
+    Args:
+    selected_keywords (dict): {카테고리: [키워드, ...]}
+    worker (callable): worker(category, query) -> 뉴스 리스트
+    concurrency (int): 동시에 실행할 작업 수.
+
+    Returns:
+    tuple: (원래 키워드 순서대로 합친 뉴스 리스트, [(category, query, 건수, 소요시간), ...])
+    """
+    jobs = [(category, query)
+            for category, keyword_list in selected_keywords.items()
+            for query in keyword_list]
+
+    def timed(category, query):
+        started = time.perf_counter()
+        try:
+            news = worker(category, query)
+        except Exception as e:
+            print(f"❌ 키워드 수집 실패: {category}/{query} ({e})")
+            news = []
+        return news, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(timed, category, query) for category, query in jobs]
+        results = [future.result() for future in futures]
+
+    all_news_list = []
+    timings = []
+    for (category, query), (news, elapsed) in zip(jobs, results):
+        all_news_list.extend(news)
+        timings.append((category, query, len(news), elapsed))
+    return all_news_list, timings
+
+
+def print_timings(timings, wall_time=None):
+    print("\n⏱️ 키워드별 소요 시간")
+    for category, query, count, elapsed in sorted(timings, key=lambda t: t[3], reverse=True):
+        print(f" - [{category}] {query}: {elapsed:.2f}초 ({count}건)")
+    total = sum(t[3] for t in timings)
+    print(f" 합계 {total:.2f}초", end="")
+    if wall_time is not None:
+        print(f" / 실제 경과 {wall_time:.2f}초", end="")
+    print()
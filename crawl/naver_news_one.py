@@ -1,18 +1,21 @@
 # naver_news_one.py
 # 네이버뉴스 한개만
 
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import os
 import sys
 
+try:
+    from crawl.html_cache import cached_get_text
+    from crawl.article_extractor import extract_article
+except ImportError:
+    from html_cache import cached_get_text
+    from article_extractor import extract_article
+
 def fetch_article_content(url):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-    response = requests.get(url, headers=headers, timeout=5)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    html = cached_get_text(url)
+    soup = BeautifulSoup(html, 'html.parser')
 
     if 'sports' in url:
         content = soup.find('div', class_='_article_content')
@@ -35,9 +38,8 @@ def extract_journalist_info(soup):
     return jour_link, jour_name
 
 def process_link(link):
-    content_text, soup = fetch_article_content(link)
-    jour_link, jour_name = extract_journalist_info(soup)
-    return content_text, jour_link, jour_name
+    record = extract_article(link, cached_get_text(link))
+    return record.content, record.jour_link, record.jour_name
 
 def main():
     if len(sys.argv) > 1:
@@ -46,10 +48,6 @@ def main():
         print("test url")
         url = "https://n.news.naver.com/mnews/article/020/0003627641?sid=103"
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-
     content, jour_link, jour_name = process_link(url)
     print("본문:", content)
     print("기자 링크:", jour_link)
@@ -1,33 +1,45 @@
 # naver_news_scraper.py
 
-import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import os
 import sys
-
-def read_excel_file(date, prefix):
-    filename = f"{prefix}_{date}.xlsx"
-    file_path = os.path.join("../data", filename)
-
-    if os.path.exists(file_path):
-        df = pd.read_excel(file_path, engine='openpyxl')
-        df = df.dropna(subset=['네이버링크'])
-        df = df.drop_duplicates(subset='네이버링크').reset_index(drop=True)
-        return df
-    else:
-        print(f"파일이 존재하지 않아요: {file_path}")
+import asyncio
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.storage import DATA_DIR, load_stage, save_stage
+
+try:
+    from crawl import http_client
+    from crawl.async_fetcher import fetch_all
+    from crawl.html_cache import cached_get_text, get_cache
+    from crawl.article_extractor import extract_article
+    from crawl.checkpoint import CheckpointJournal
+    from crawl.rate_limiter import get_limiter
+except ImportError:
+    import http_client
+    from async_fetcher import fetch_all
+    from html_cache import cached_get_text, get_cache
+    from article_extractor import extract_article
+    from checkpoint import CheckpointJournal
+    from rate_limiter import get_limiter
+
+def read_news_list(date, prefix):
+    df = load_stage(prefix, date)
+    if df is None:
         return None
+    df = df.dropna(subset=['네이버링크'])
+    df = df.drop_duplicates(subset='네이버링크').reset_index(drop=True)
+    return df
 
-def save_excel_file(df, date, prefix):
-    filename = f"{prefix}_{date}_naver.xlsx"
-    file_path = os.path.join("../data", filename)
-    df.to_excel(file_path, index=False)
-    print(f"뉴스 데이터가 {filename} 파일로 저장되었습니다.")
+def save_news_file(df, date, prefix):
+    save_stage(df, prefix, date, stage="naver")
 
 def fetch_article_content(url, headers):
-    response = requests.get(url, headers=headers, timeout=5)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    html = cached_get_text(url, headers)
+    return parse_article_content(url, html)
+
+def parse_article_content(url, html):
+    soup = BeautifulSoup(html, 'html.parser')
 
     if 'sports' in url:
         content = soup.find('div', class_='_article_content')
@@ -80,33 +92,88 @@ def process_links(links, headers):
 
     return contents, jour_links, jour_names, times
 
+def process_links_async(links, headers, concurrency=20, per_host=8, cache=None, journal=None):
+    """
+    process_links와 같은 네 개의 리스트를 돌려주지만,
+    본문 다운로드는 asyncio로 동시에 처리합니다.
+
+    journal(CheckpointJournal)이 주어지면 이미 기록된 링크는 다시 받지 않고,
+    새로 받은 링크는 끝나는 즉시 저널에 기록합니다.
+    """
+    contents = [''] * len(links)
+    jour_links = [''] * len(links)
+    jour_names = [''] * len(links)
+    times = [''] * len(links)
+
+    def fill(i, content, jour_link, jour_name, published_at):
+        contents[i], jour_links[i], jour_names[i], times[i] = content, jour_link, jour_name, published_at
+
+    pending = []
+    for i, url in enumerate(links):
+        if not (isinstance(url, str) and url.startswith('http')):
+            continue
+        if journal is not None and url in journal:
+            entry = journal.records[url]
+            fill(i, entry['본문'], entry['기자링크'], entry['기자명'], entry['발행시각'])
+        else:
+            pending.append((i, url))
+
+    if journal is not None and len(pending) < len(links):
+        print(f"⏩ 저널에서 {len(journal.records)}건 복구, 남은 링크 {len(pending)}건만 수집합니다.")
+
+    def on_result(k, html):
+        i, url = pending[k]
+        if html is None:
+            fill(i, '', None, None, '')
+            return
+        record = extract_article(url, html)
+        fill(i, record.content, record.jour_link, record.jour_name, record.published_at)
+        if journal is not None:
+            journal.append(url, 본문=record.content, 기자링크=record.jour_link,
+                           기자명=record.jour_name, 발행시각=record.published_at)
+
+    asyncio.run(fetch_all([url for _, url in pending], headers, concurrency=concurrency,
+                          per_host=per_host, cache=cache or get_cache(), on_result=on_result))
+
+    return contents, jour_links, jour_names, times
+
+def journal_path(date, prefix):
+    return os.path.join(DATA_DIR, f"{prefix}_{date}_naver.journal.jsonl")
+
 def main():
-    print("\n📄 사용법: python naver_news_scraper.py [health|cnews] [날짜: YYYYMMDD]")
+    print("\n📄 사용법: python naver_news_scraper.py [health|cnews] [날짜: YYYYMMDD] [--resume]")
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    resume = '--resume' in sys.argv[1:]
 
-    if len(sys.argv) != 3:
+    if len(args) != 2:
         print("\n❗ 인자 오류: 파일 접두사와 날짜를 정확히 입력해 주세요.")
         sys.exit(1)
 
-    file_prefix = sys.argv[1]
-    date_str = sys.argv[2]
+    file_prefix = args[0]
+    date_str = args[1]
 
-    df = read_excel_file(date_str, file_prefix)
+    df = read_news_list(date_str, file_prefix)
 
     if df is not None:
         print(f"데이터프레임의 크기: {df.shape}")
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
+        headers = http_client.DEFAULT_HEADERS
 
         links = list(df['네이버링크'])
-        contents, jour_links, jour_names, times = process_links(links, headers)
+        with CheckpointJournal(journal_path(date_str, file_prefix), resume=resume) as journal:
+            contents, jour_links, jour_names, times = process_links_async(links, headers, journal=journal)
 
         df['본문'] = contents
         df['기자명'] = jour_names
         df['기자링크'] = jour_links
         df['발행시각'] = times
-        save_excel_file(df, date_str, file_prefix)
+        save_news_file(df, date_str, file_prefix)
+
+        cache = get_cache()
+        print(f"🗄️ HTML 캐시: {cache.stats()}")
+        print(f"🚦 요청 제한 통계: {get_limiter().stats()}")
+        cache.evict()
     else:
         print("데이터프레임을 가져올 수 없어서 프로세스를 중지합니다.")
 
@@ -2,34 +2,43 @@
 
 import os
 import sys
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 import pandas as pd
 import time
+import threading
 from urllib.parse import quote
 
-def web_driver():
-    options = Options()
-    options.add_argument('--headless=new')  # 최신 버전용!
+import requests
 
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--disable-gpu')
-    options.add_argument('--window-size=1920,1080')
-    options.add_argument('--remote-debugging-port=9222')  # crash 방지용
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.storage import save_stage
 
-    service = Service(ChromeDriverManager(driver_version="129.0.6668.59").install())
+try:
+    from crawl import http_client
+    from crawl.driver_pool import DriverPool
+    from crawl.keyword_scheduler import HostLimiter, run_keyword_jobs, print_timings
+    from crawl.rate_limiter import get_limiter
+except ImportError:
+    import http_client
+    from driver_pool import DriverPool
+    from keyword_scheduler import HostLimiter, run_keyword_jobs, print_timings
+    from rate_limiter import get_limiter
 
-    driver = webdriver.Chrome(service=service, options=options)
-    return driver
+CHROME_DRIVER_VERSION = "129.0.6668.59"
+SEARCH_BASE_URL = "https://search.naver.com/search.naver"
+SEARCH_PAGE_SIZE = 10  # 검색 결과 한 페이지당 기사 수 (start 파라미터 증가폭)
+SEARCH_MAX_PAGES = 40
+DEFAULT_CONCURRENCY = 4
 
-def build_naver_news_url(query, date):
+def create_driver_pool(size=1, max_pages=50):
+    return DriverPool(size=size, max_pages=max_pages, driver_version=CHROME_DRIVER_VERSION)
+
+def build_naver_news_url(query, date, start=None, base_url=SEARCH_BASE_URL):
     encoded_query = quote(query)
     option_date = f"ds={str(int(date[:4]))}.{date[4:6]}.{date[-2:]}&de={date[:4]}.{date[4:6]}.{date[-2:]}"
-    url = f"https://search.naver.com/search.naver?where=news&query={encoded_query}&sm=tab_opt&sort=0&photo=0&field=0&pd=3&{option_date}"
+    url = f"{base_url}?where=news&query={encoded_query}&sm=tab_opt&sort=0&photo=0&field=0&pd=3&{option_date}"
+    if start is not None:
+        url += f"&start={start}"
     print(url)
     return url
 
@@ -43,66 +52,104 @@ def scroll_down(driver):
             break
         last_height = new_height
 
-def naver_news_scraper(query, date, category):
-    url = build_naver_news_url(query, date)
-    driver = web_driver()
+def parse_news_items(page_source, query, category):
+    soup = BeautifulSoup(page_source, "html.parser")
+    news_items = soup.select(".news_area")
     news_list = []
+    for item in news_items:
+        title_elem = item.select_one(".news_tit")
+        title = title_elem.text.strip()
+        link = title_elem["href"]
+        press_elem = item.select_one(".info.press")
+        press = press_elem.text.strip() if press_elem else "언론사 정보 없음"
+        press = press.replace("언론사 선정","")
+        desc_elem = item.select_one(".dsc_txt_wrap")
+        description = desc_elem.text.strip() if desc_elem else "요약 정보 없음"
+
+        test = item.find("div", class_="info_group")
+        naver_link = test.find_all('a')[-1].get('href') if 'naver' in test.find_all('a')[-1].get('href') else None
+
+        news_list.append({
+            "제목": title,
+            "언론사": press,
+            # "요약": description,
+            "링크": link,
+            "네이버링크": naver_link,
+            "분류": category,
+            "키워드": query  # 각 뉴스 항목에 해당 키워드 추가
+        })
+    return news_list
+
+def naver_news_scraper(query, date, category, pool=None, limiter=None):
+    url = build_naver_news_url(query, date)
+    own_pool = pool is None
+    if own_pool:
+        pool = create_driver_pool()
     try:
-        driver.get(url)
-        time.sleep(1)
-        scroll_down(driver)
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        news_items = soup.select(".news_area")
-        for item in news_items:
-            title_elem = item.select_one(".news_tit")
-            title = title_elem.text.strip()
-            link = title_elem["href"]
-            press_elem = item.select_one(".info.press")
-            press = press_elem.text.strip() if press_elem else "언론사 정보 없음"
-            press = press.replace("언론사 선정","")
-            desc_elem = item.select_one(".dsc_txt_wrap")
-            description = desc_elem.text.strip() if desc_elem else "요약 정보 없음"
-
-            test = item.find("div", class_="info_group")
-            naver_link = test.find_all('a')[-1].get('href') if 'naver' in test.find_all('a')[-1].get('href') else None
-
-            news_list.append({
-                "제목": title,
-                "언론사": press,
-                # "요약": description,
-                "링크": link,
-                "네이버링크": naver_link,
-                "분류": category,
-                "키워드": query  # 각 뉴스 항목에 해당 키워드 추가
-            })
+        with pool.driver() as driver:
+            if limiter is not None:
+                with limiter.slot(url):
+                    driver.get(url)
+            else:
+                driver.get(url)
+            time.sleep(1)
+            scroll_down(driver)
+            page_source = driver.page_source
     finally:
-        driver.quit()
+        if own_pool:
+            pool.close()
+
+    return parse_news_items(page_source, query, category)
+
+def http_news_scraper(query, date, category, session=None, base_url=SEARCH_BASE_URL, max_pages=SEARCH_MAX_PAGES, limiter=None):
+    """
+    브라우저 없이 검색 결과 페이지를 HTTP GET으로 받아서 파싱합니다.
+
+    스크롤 대신 start 파라미터(1, 11, 21, ...)로 페이지를 넘기고,
+    새 기사가 더 이상 나오지 않으면 멈춥니다.
+    """
+    if session is None:
+        session = http_client.get_session()
+    news_list = []
+    seen_links = set()
+    for page in range(max_pages):
+        url = build_naver_news_url(query, date, start=page * SEARCH_PAGE_SIZE + 1, base_url=base_url)
+        if limiter is not None:
+            with limiter.slot(url):
+                response = http_client.get(url, session=session)
+        else:
+            response = http_client.get(url, session=session)
+        response.raise_for_status()
+        page_items = [item for item in parse_news_items(response.text, query, category)
+                      if item["링크"] not in seen_links]
+        if not page_items:
+            break
+        for item in page_items:
+            seen_links.add(item["링크"])
+        news_list.extend(page_items)
 
     return news_list
 
-def save_to_excel(file_prefix, all_news_list, date):
+def save_news_list(file_prefix, all_news_list, date):
     if all_news_list:
-        data_directory = "../data/"
-        if not os.path.exists(data_directory):
-            os.makedirs(data_directory)
         df = pd.DataFrame(all_news_list)
         df = df[~df['제목'].str.contains('운세')]
         if file_prefix=='health':
             desired_press = ['조선일보', '중앙일보','동아일보','한국경제','매일경제']
             df = df[df['언론사'].isin(desired_press)]
-        filename = f"{data_directory}{file_prefix}_{date}.xlsx"
-        df.to_excel(filename, index=False)
-        print(f"뉴스 데이터가 {filename} 파일로 저장되었습니다.")
+        save_stage(df, file_prefix, date)
 
 if __name__ == "__main__":
-    print("\n📄 사용법: python news_list_scraper.py [health|cnews] [날짜: YYYYMMDD]")
+    print("\n📄 사용법: python news_list_scraper.py [health|cnews] [날짜: YYYYMMDD] [http|selenium (기본: http)] [동시 작업 수 (기본: 4)]")
 
-    if len(sys.argv) != 3:
+    if len(sys.argv) not in (3, 4, 5):
         print("\n❗ 인자 오류: 파일 접두사와 날짜를 정확히 입력해 주세요.")
         sys.exit(1) 
 
     file_prefix = sys.argv[1]
     date_str = sys.argv[2]
+    backend = sys.argv[3] if len(sys.argv) >= 4 else "http"
+    concurrency = int(sys.argv[4]) if len(sys.argv) == 5 else DEFAULT_CONCURRENCY
 
     if file_prefix=='health':
         selected_keywords = {
@@ -126,11 +173,35 @@ if __name__ == "__main__":
             "금융": ["금융위", "금감원", "김병환", "이복현", "금융지주"]
         }
 
-    all_news_list = []
-
-    for category, keyword_list in selected_keywords.items():
-        for query in keyword_list:
-            news = naver_news_scraper(query, date_str, category)
-            all_news_list.extend(news)
+    # 브라우저/세션은 실행당 한 번만 만들어서 모든 키워드에 재사용
+    # http 모드에서 요청이 실패한 키워드만 selenium으로 다시 수집
+    session = http_client.configure(pool_maxsize=max(concurrency, http_client.DEFAULT_POOL_MAXSIZE))
+    limiter = HostLimiter()
+    pool = create_driver_pool(size=concurrency) if backend == "selenium" else None
+    pool_lock = threading.Lock()
+
+    def fallback_pool():
+        global pool
+        with pool_lock:
+            if pool is None:
+                pool = create_driver_pool(size=concurrency)
+        return pool
+
+    def scrape_keyword(category, query):
+        if backend == "http":
+            try:
+                return http_news_scraper(query, date_str, category, session=session, limiter=limiter)
+            except requests.RequestException as e:
+                print(f"⚠️ HTTP 수집 실패, selenium으로 재시도: {query} ({e})")
+        return naver_news_scraper(query, date_str, category, pool=fallback_pool(), limiter=limiter)
+
+    started = time.perf_counter()
+    try:
+        all_news_list, timings = run_keyword_jobs(selected_keywords, scrape_keyword, concurrency=concurrency)
+    finally:
+        if pool is not None:
+            pool.close()
+    print_timings(timings, wall_time=time.perf_counter() - started)
+    print(f"🚦 요청 제한 통계: {get_limiter().stats()}")
 
-    save_to_excel(file_prefix, all_news_list, date_str)
+    save_news_list(file_prefix, all_news_list, date_str)
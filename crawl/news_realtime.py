@@ -7,9 +7,19 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 from dotenv import load_dotenv
 import openai
+import sys
 import json
 import time
 
+try:
+    from crawl import http_client
+except ImportError:
+    import http_client
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.article_registry import ArticleRegistry, DATA_DIR
+from utils.dedup import make_deduplicator
+
 load_dotenv()
 
 KAKAO_TOKEN = os.getenv("ACCESS_TOKEN")
@@ -19,6 +29,11 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 KAKAO_URL = "https://kapi.kakao.com/v2/api/talk/memo/default/send"
 NAVER_NEWS_URL = "https://news.naver.com/"
+SENT_ARTICLES_FILE = "sent_articles.json"  # 예전 형식, 있으면 한 번만 레지스트리로 옮김
+REGISTRY_PATH = os.path.join(DATA_DIR, "kakao_registry.sqlite3")
+REGISTRY_RETENTION_DAYS = 30
+DEDUP_KIND = os.getenv("NEWSBOT_DEDUP", "windowed")  # windowed | registry
+DEDUP_PATH = os.path.join(DATA_DIR, "kakao_dedup.bin")
 
 TARGET_KEYWORDS = ["삼성생명", "홍원학"]
 HEADERS = {
@@ -61,7 +76,7 @@ class NewsCrawler:
         self.categories = categories
 
     def crawl(self):
-        response = requests.get(self.news_url)
+        response = http_client.get(self.news_url)
         soup = BeautifulSoup(response.text, "html.parser")
         news_items = []
 
@@ -89,7 +104,7 @@ class NewsCrawler:
 
     def get_article_content(self, url):
         try:
-            response = requests.get(url, timeout=5)
+            response = http_client.get(url)
             soup = BeautifulSoup(response.text, "html.parser")
 
             content_div = soup.find("div", {"id": "newsct_article"})
@@ -172,18 +187,9 @@ class NewsBot:
 
         self.news_crawler = NewsCrawler(news_url=NAVER_NEWS_URL, categories=self.categories)
         self.notifier = KakaoNotifier(headers=HEADERS)
-        self.sent_articles = self.load_sent_articles()
-
-    def load_sent_articles(self, filepath="sent_articles.json"):
-        try:
-            with open(filepath, 'r') as file:
-                return set(json.load(file))
-        except (FileNotFoundError, json.JSONDecodeError):
-            return set()
-
-    def save_sent_articles(self, filepath="sent_articles.json"):
-        with open(filepath, 'w') as file:
-            json.dump(list(self.sent_articles), file)
+        self.registry = ArticleRegistry(REGISTRY_PATH)
+        self.registry.import_legacy_json(SENT_ARTICLES_FILE, notified=True)
+        self.dedup = make_deduplicator(DEDUP_KIND, DEDUP_PATH, self.registry, notified=True)
 
     def run(self):
         print("[뉴스봇 실행 중 ⏰]", datetime.now())
@@ -193,15 +199,22 @@ class NewsBot:
         if not news:
             print("📭 전송할 뉴스 없음")
 
+        urls = [item['url'] for item in news]
+        unsent = set(self.dedup.filter_new(urls))
+        self.registry.mark_seen(urls)
+
         for item in news:
-            if item['url'] not in self.sent_articles:
+            if item['url'] in unsent:
                 self.notifier.notify(item)
-                self.sent_articles.add(item['url'])
+                self.registry.mark_notified([item['url']])
+                self.dedup.add([item['url']])
+                unsent.discard(item['url'])
                 print(f"📦 기사 저장: {item['title']}")
             else:
                 print(f"🔍 중복 감지, 기사 스킵: {item['title']}")
 
-        self.save_sent_articles()
+        self.dedup.save()
+        self.registry.prune(REGISTRY_RETENTION_DAYS)
 if __name__ == "__main__":
     bot = NewsBot()
     while True:
@@ -0,0 +1,169 @@
+# rate_limiter.py
+# 도메인별 토큰 버킷 + 429/5xx 지수 백오프(지터) + 서킷 브레이커
+
+import time
+import random
+import threading
+from urllib.parse import urlparse
+
+THROTTLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    초당 rate개씩 토큰이 차고 최대 burst개까지 쌓이는 버킷.
+    reserve()는 토큰 하나를 예약하고, 그 토큰을 쓰기까지 기다려야 하는 시간을 돌려줍니다.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def reserve(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold번 쌓이면 cooldown초 동안 호스트를 쉬게 합니다.
+    """
+
+    def __init__(self, failure_threshold, cooldown):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+
+    def remaining(self):
+        return max(0.0, self.open_until - time.monotonic())
+
+    def record_success(self):
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.open_until = time.monotonic() + self.cooldown
+            self.failures = 0
+            return True
+        return False
+
+
+class DomainRateLimiter:
+    """
+    크롤러 공용 요청 속도 제한기.
+
+    Args:
+    rate (float): 도메인당 초당 요청 수.
+    burst (int): 순간적으로 허용할 최대 요청 수.
+    max_retries (int): 429/5xx/연결 오류 시 재시도 횟수.
+    backoff_base (float): 첫 백오프 시간(초). 재시도마다 두 배.
+    backoff_max (float): 백오프 최대 시간(초).
+    failure_threshold (int): 서킷을 여는 연속 실패 횟수.
+    cooldown (float): 서킷이 열렸을 때 호스트를 쉬는 시간(초).
+    """
+
+    def __init__(self, rate=10.0, burst=20, max_retries=4, backoff_base=1.0, backoff_max=30.0,
+                 failure_threshold=5, cooldown=60.0):
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._breakers = {}
+        self.counters = {
+            "requests": 0,
+            "throttled": 0,
+            "circuit_opened": 0,
+            "rate_wait": 0.0,
+            "backoff_wait": 0.0,
+            "circuit_wait": 0.0,
+        }
+
+    def _state(self, host):
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+            self._breakers[host] = CircuitBreaker(self.failure_threshold, self.cooldown)
+        return self._buckets[host], self._breakers[host]
+
+    def acquire_delay(self, url):
+        """
+        요청 하나를 보내기 전에 기다려야 할 시간(초)을 계산하고 기록합니다.
+        서킷이 열려 있으면 열린 시간만큼, 아니면 토큰 버킷 대기 시간만큼 기다립니다.
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket, breaker = self._state(host)
+            circuit_wait = breaker.remaining()
+            rate_wait = bucket.reserve()
+            self.counters["requests"] += 1
+            self.counters["circuit_wait"] += circuit_wait
+            self.counters["rate_wait"] += rate_wait
+        return circuit_wait + rate_wait
+
+    def backoff_delay(self, attempt, retry_after=None):
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        delay = random.uniform(0, delay)  # full jitter
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        with self._lock:
+            self.counters["backoff_wait"] += delay
+        return delay
+
+    def record_result(self, url, status=None):
+        """
+        응답 결과를 기록합니다. status가 None이면 연결 오류로 봅니다.
+        재시도해야 하는 결과(스로틀링/서버 오류/연결 오류)면 True를 돌려줍니다.
+        """
+        host = urlparse(url).netloc
+        failed = status is None or status in THROTTLE_STATUSES
+        with self._lock:
+            _, breaker = self._state(host)
+            if not failed:
+                breaker.record_success()
+                return False
+            self.counters["throttled"] += 1
+            if breaker.record_failure():
+                self.counters["circuit_opened"] += 1
+                print(f"🚧 {host} 연속 실패로 {self.cooldown:.0f}초 동안 요청을 멈춥니다.")
+        return True
+
+    def wait(self, url):
+        delay = self.acquire_delay(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        for key in ("rate_wait", "backoff_wait", "circuit_wait"):
+            stats[key] = round(stats[key], 2)
+        return stats
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter():
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = DomainRateLimiter()
+    return _limiter
@@ -26,15 +26,20 @@ import bs4
 
 
 
-import requests
+import os
+import sys
 from bs4 import BeautifulSoup
 import bs4
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from crawl import http_client
+from crawl.html_cache import cached_get_text
+
 url = 'https://n.news.naver.com/mnews/article/123/0002356709?sid=101'
 
 def fetch_article_content(url, headers):
-    response = requests.get(url, headers=headers, timeout=5)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    html = cached_get_text(url, headers)
+    soup = BeautifulSoup(html, 'html.parser')
 
     if 'sports' in url:
         content = soup.find('div', class_='_article_content')
@@ -60,10 +65,7 @@ def extract_journalist_info(soup):
 
 @tool
 def fetch_text_content_from_url(url: str):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-    content_text, soup = fetch_article_content(url, headers)
+    content_text, soup = fetch_article_content(url, http_client.DEFAULT_HEADERS)
 
     jour_link, jour_name = extract_journalist_info(soup)
 
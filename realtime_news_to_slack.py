@@ -1,23 +1,26 @@
 import os
-import re
 import sys
-import json
 import time
 import random
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 from urllib.parse import quote
 
-from summary.summarizer import NewsSummarizer
+from summary.summarizer import NewsSummarizer, get_parse_stats, make_cascade, get_cascade_stats, \
+    get_prompt_cache_stats
+from summary.preclassifier import load_preclassifier
+from summary.embedder import EMBEDDING_MODEL, cluster_text, embed_texts
+from summary.online_cluster import make_story_clusterer
 from crawl.naver_news_one import process_link
+from crawl.html_cache import get_cache
+from crawl.driver_pool import DriverPool
 from api.slack_sender import send_slack_message, format_news_to_message
+from utils.article_registry import ArticleRegistry, DATA_DIR
+from utils.dedup import make_deduplicator
+from utils.prompt_registry import get_prompt_registry
+from utils.embedding_store import EmbeddingStore
+from utils.token_budget import TokenBudgeter
 
-with open(f"./prompt/cnews_summary.txt", 'r',encoding='utf-8') as file:
-    prompt = file.read()
 news_sources = [
     # 종합지
     "조선일보", "중앙일보", "동아일보", "한국일보", "국민일보", "서울신문", "세계일보",
@@ -43,193 +46,157 @@ news_sources = [
 ]
 
 # ✅ 파일 경로 설정 (상단에 추가)
-PROCESSED_LINKS_FILE = "processed_links.json"
-
-# ✅ 링크 로드 함수
-def load_processed_links():
-    if os.path.exists(PROCESSED_LINKS_FILE):
-        with open(PROCESSED_LINKS_FILE, "r", encoding="utf-8") as f:
-            return set(json.load(f))
-    return set()
-
-# ✅ 링크 저장 함수
-def save_processed_links(processed_links):
-    with open(PROCESSED_LINKS_FILE, "w", encoding="utf-8") as f:
-        json.dump(list(processed_links), f, ensure_ascii=False, indent=2)
-
-# ✅ 전역 링크 세트
-processed_links = load_processed_links()
+PROCESSED_LINKS_FILE = "processed_links.json"  # 예전 형식, 있으면 한 번만 레지스트리로 옮김
+REGISTRY_PATH = os.path.join(DATA_DIR, "slack_registry.sqlite3")
+REGISTRY_RETENTION_DAYS = 30
+DEDUP_KIND = os.getenv("NEWSBOT_DEDUP", "windowed")  # windowed | registry
+DEDUP_PATH = os.path.join(DATA_DIR, "slack_dedup.bin")
+
+# ✅ 처리한 기사 레지스트리 (SQLite) + 메모리 고정 중복 제거기
+registry = ArticleRegistry(REGISTRY_PATH)
+registry.import_legacy_json(PROCESSED_LINKS_FILE)
+dedup = make_deduplicator(DEDUP_KIND, DEDUP_PATH, registry)
+
+# ✅ 확실히 관련 없는 기사를 LLM 전에 거르는 사전 분류기 (학습된 모델이 있을 때만)
+preclassifier = load_preclassifier("cnews")
+# ✅ 작은 모델이 먼저 판단하고 관련 있는 부정 기사/애매한 기사만 큰 모델로 넘김 (NEWSBOT_CASCADE=1일 때만, 기본은 큰 모델만)
+cascade = make_cascade()
+analyzer = cascade or NewsSummarizer()
+# ✅ 부정 기사를 사건(story) 단위로 묶어서 이미 알린 사건의 후속 기사는 알림 생략 (NEWSBOT_ONLINE_CLUSTER=0이면 끔)
+stories = make_story_clusterer("cnews")
+embedding_store = EmbeddingStore(EMBEDDING_MODEL) if stories is not None else None
+cluster_budgeter = TokenBudgeter("cluster", model=EMBEDDING_MODEL)
+
+def assign_story(naver_link, title, content):
+    """
+    기사를 임베딩해서 사건 군집기에 붙이고 사건 번호를 돌려줍니다. 꺼져 있거나 임베딩에 실패하면 None.
+    (임베딩은 저장소에 남으므로 일일 run_cluster가 다시 요청하지 않음)
+    """
+    if stories is None:
+        return None
+    try:
+        vectors = embed_texts([cluster_text(title, content, cluster_budgeter)], embedding_store)
+        if vectors is None:
+            return None
+        story_id, is_new = stories.assign(naver_link, vectors[0], title, datetime.now().strftime('%Y%m%d'))
+        print(f"🧩 사건 {story_id} ({'새 사건' if is_new else '기존 사건'})")
+        return story_id
+    except Exception as e:
+        print(f"⚠️ 사건 묶기 실패: {e}")
+        return None
 
 def generate_random_phone_number():
     middle = random.randint(1000, 9999)
     last = random.randint(1000, 9999)
     return f"010-{middle}-{last}"
 
-def parse_response(response):
-    try:
-        # 여러 번 나누어진 응답을 하나로 합치기
-        if isinstance(response, list):
-            response = "".join(response)
-        
-        # 마크다운 코드 블록 제거
-        response = response.strip()
-        if '```json' in response:
-            response = response.split('```json')[1]
-        if '```' in response:
-            response = response.split('```')[0]
-        response = response.strip()
-        
-        # JSON 문자열 정규화
-        response = response.replace('\n', ' ').replace('\r', '')
-        response = re.sub(r'\s+', ' ', response)
-        response = response.replace('False','false').replace('True','true')
-        response = re.sub("'", '', response)
-
-        # 중복된 JSON 응답 제거
-        if response.count('{') > 1:
-            # 마지막 완전한 JSON 객체만 사용
-            last_brace = response.rfind('}')
-            if last_brace != -1:
-                response = response[:last_brace+1]
-        
-        # JSON 파싱
-        result = json.loads(response)
-        print(result)
-        
-        # 필수 필드가 없는 경우 기본값 설정
-        if 'is_related' not in result:
-            result['is_related'] = False
-        if 'label' not in result:
-            result['label'] = 'False'
-        if 'summary' not in result:
-            result['summary'] = '요약 실패'
-            
-        # label 값이 예상된 형식이 아닌 경우 수정
-        if isinstance(result['label'], bool):
-            result['label'] = 'True' if result['label'] else 'False'
-        elif result['label'] not in ['True', 'False', 'Positive', 'Negative', 'Neutral']:
-            result['label'] = 'False'
-            
-        return result
-    except Exception as e:
-        print(f"Unexpected error in parse_response: {e}")
-        print(f"Raw response: {response}")
-        return {
-            'is_related': False,
-            'label': 'Neutral',
-            'summary': '요약 실패'
-        }
-
-def process_content_with_prompt(content, prompt):
+def process_content_with_prompt(content, prompt, keyword="", title=""):
     try:
-        summarizer = NewsSummarizer()
-        sentdict_raw = summarizer.summarize_with_gpt(content, prompt)
-        sentdict = parse_response(sentdict_raw)
-
-        if sentdict is None:
-            raise ValueError("Parsed dictionary is None.")
-
-        is_related = sentdict.get('is_related', False)
-        label = sentdict.get('label')
-        summary = sentdict.get('summary')
-
-        return is_related, label, summary
+        if preclassifier is not None and preclassifier.should_skip(keyword, title, content):
+            # 확실히 관련 없는 기사는 LLM을 부르지 않음
+            sentdict = preclassifier.skipped_fields()
+        else:
+            sentdict = analyzer.analyze(prompt, content)
+        return sentdict['is_related'], sentdict['label'], sentdict['summary']
     except Exception as e:
         print(f"Error in process_content_with_prompt: {str(e)}")
         print(f"Content: {content[:100]}...")  # 첫 100자만 로깅
         return False, "False", "요약 실패"
 
-def web_driver():
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--disable-gpu')
-    options.add_argument('--window-size=1920,1080')
-    options.add_argument('--remote-debugging-port=9222')
-
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-    return driver
-
 def build_naver_news_url(query, date):
     encoded_query = quote(query)
     option_date = f"ds={str(int(date[:4]))}.{date[4:6]}.{date[-2:]}&de={date[:4]}.{date[4:6]}.{date[-2:]}"
     url = f"https://search.naver.com/search.naver?where=news&query={encoded_query}&sm=tab_opt&sort=1&photo=0&field=0&pd=3&{option_date}"
     return url
 
-def naver_news_scraper(query, date, category):
+def naver_news_scraper(query, date, category, pool):
     print(f"🔍 검색 시작 - 카테고리: '{category}', 키워드: '{query}'")
     url = build_naver_news_url(query, date)
-    driver = web_driver()
     results = [] 
-    try:
+    with pool.driver() as driver:
         driver.get(url)
         time.sleep(1)
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        news_items = soup.select(".news_area")
-        print(f"📰 발견된 뉴스 수: {len(news_items)}")
+        page_source = driver.page_source
+    soup = BeautifulSoup(page_source, "html.parser")
+    news_items = soup.select(".news_area")
+    print(f"📰 발견된 뉴스 수: {len(news_items)}")
+
+    naver_links = []
+    for item in news_items:
+        test = item.find("div", class_="info_group")
+        naver_links.append(test.find_all('a')[-1].get('href') if test and 'naver' in test.find_all('a')[-1].get('href') else None)
+    # 처리 여부는 한 번에 조회하고, 새로 본 링크도 한 번에 기록
+    new_links = set(dedup.filter_new(naver_links))
+    registry.mark_seen(naver_links)
+
+    for i, item in enumerate(news_items):
+        test = item.find("div", class_="info_group")
+        naver_link = naver_links[i]
+        print(f" 네이버 링크 상태({i}/{len(news_items)})")
+        if naver_link is not None and naver_link in new_links:
+
+            title_elem = item.select_one(".news_tit")
+            title = title_elem.text.strip()
+            link = title_elem["href"]
+            press_elem = item.select_one(".info.press")
+            press = press_elem.text.strip() if press_elem else "언론사 정보 없음"
+            desc_elem = item.select_one(".dsc_txt_wrap")
+            description = desc_elem.text.strip() if desc_elem else "요약 정보 없음"
+
+            time_elem = test.find('span', class_='info').text.strip()
+        
         
-        for i, item in enumerate(news_items):
-            test = item.find("div", class_="info_group")
-            naver_link = test.find_all('a')[-1].get('href') if test and 'naver' in test.find_all('a')[-1].get('href') else None
-            print(f" 네이버 링크 상태({i}/{len(news_items)})")
-            if naver_link is not None and naver_link not in processed_links:
-
-                title_elem = item.select_one(".news_tit")
-                title = title_elem.text.strip()
-                link = title_elem["href"]
-                press_elem = item.select_one(".info.press")
-                press = press_elem.text.strip() if press_elem else "언론사 정보 없음"
-                desc_elem = item.select_one(".dsc_txt_wrap")
-                description = desc_elem.text.strip() if desc_elem else "요약 정보 없음"
-
-                time_elem = test.find('span', class_='info').text.strip()
-            
-            
-                # 시간 파싱 및 필터링
-                time_delta_minutes = None
-                if '분 전' in time_elem:
-                    time_delta_minutes = int(time_elem.replace('분 전', '').strip())
-                elif '시간 전' in time_elem:
-                    time_delta_minutes = int(time_elem.replace('시간 전', '').strip()) * 60
-
-                content, jour_link, jour_name = process_link(naver_link)
-                summarizer = NewsSummarizer()
-                is_related, label, summary = process_content_with_prompt(content, prompt)
+            # 시간 파싱 및 필터링
+            time_delta_minutes = None
+            if '분 전' in time_elem:
+                time_delta_minutes = int(time_elem.replace('분 전', '').strip())
+            elif '시간 전' in time_elem:
+                time_delta_minutes = int(time_elem.replace('시간 전', '').strip()) * 60
+
+            content, jour_link, jour_name = process_link(naver_link)
+            prompt = get_prompt_registry().get("cnews_summary.txt")  # 수정하면 재시작 없이 반영
+            is_related, label, summary = process_content_with_prompt(content, prompt, query, title)
+            registry.mark_processed([naver_link])
+            dedup.add([naver_link])
+            new_links.discard(naver_link)
  
-                print(f"📊 분석 결과:")
-                print(f"  - 관련성: {is_related}")
-                print(f"  - 감정: {label}")
-                print(f"  - 요약: {summary}")
-                print(f"  - 기자: {jour_name}")
-                print(f"  - 기자 링크: {jour_link}")
+            print(f"📊 분석 결과:")
+            print(f"  - 관련성: {is_related}")
+            print(f"  - 감정: {label}")
+            print(f"  - 요약: {summary}")
+            print(f"  - 기자: {jour_name}")
+            print(f"  - 기자 링크: {jour_link}")
  
-                if label == "Negative" and time_delta_minutes is not None and time_delta_minutes <= 2:
-                    random_phone_number = generate_random_phone_number() if press in news_sources else None
-
-                    news_item = {
-                        "category": category,
-                        "keyword": query,
-                        "title": title,
-                        "press": press,
-                        "description": description,
-                        "url": link,
-                        "naver_link": naver_link,
-                        "time": time_elem,
-                        "content": content,
-                        "jour_name": jour_name,
-                        "phone_number" : random_phone_number,
-                        "is_related": is_related,
-                        "sentiment": label,
-                        "neg_sent": summary,
-                    }
-                    message = format_news_to_message(news_item)
-                    send_slack_message("#news-feed", message)
-                    print(f"📤 슬랙으로 전송 완료 - 제목: '{title}'")
-                    results.append(news_item)
-    finally:
-        driver.quit()
+            story_id = assign_story(naver_link, title, content) if label == "Negative" else None
+            if label == "Negative" and time_delta_minutes is not None and time_delta_minutes <= 2:
+                if story_id is not None and not stories.should_alert(story_id):
+                    print(f"🔕 이미 알린 사건({story_id})의 후속 기사라 알림 생략 - 제목: '{title}'")
+                    continue
+                random_phone_number = generate_random_phone_number() if press in news_sources else None
+
+                news_item = {
+                    "category": category,
+                    "keyword": query,
+                    "title": title,
+                    "press": press,
+                    "description": description,
+                    "url": link,
+                    "naver_link": naver_link,
+                    "time": time_elem,
+                    "content": content,
+                    "jour_name": jour_name,
+                    "phone_number" : random_phone_number,
+                    "is_related": is_related,
+                    "sentiment": label,
+                    "neg_sent": summary,
+                }
+                message = format_news_to_message(news_item)
+                send_slack_message("#news-feed", message)
+                registry.mark_notified([naver_link])
+                if story_id is not None:
+                    stories.mark_reported(story_id, naver_link)
+                print(f"📤 슬랙으로 전송 완료 - 제목: '{title}'")
+                results.append(news_item)
     return results
 
 if __name__ == "__main__":
@@ -244,8 +211,26 @@ if __name__ == "__main__":
         "금융": ["금융위", "금감원", "김병환", "이복현", "금융지주"]
     }
 
-    while True:
-        for category, keyword_list in selected_keywords.items():
-            for query in keyword_list:
-                naver_news_scraper(query, date, category)
+    # 브라우저는 루프 밖에서 한 번만 띄우고 계속 재사용
+    with DriverPool(size=1, max_pages=100, headless='--headless') as pool:
+        while True:
+            for category, keyword_list in selected_keywords.items():
+                for query in keyword_list:
+                    naver_news_scraper(query, date, category, pool)
+            dedup.save()
+            print(f"🧾 응답 파싱: {get_parse_stats().stats()}")
+            if preclassifier is not None:
+                print(f"🧮 사전 분류기: {preclassifier.stats()}")
+            if cascade is not None:
+                print(f"🪜 2단계 모델: {get_cascade_stats().stats()}")
+            print(f"🧷 프롬프트 캐시: {get_prompt_cache_stats().stats()}")
+            print(f"🧠 중복 제거 상태: {dedup.stats()}")
+            if stories is not None:
+                stories.maintain()  # 저장 + 가까운 사건 합치기/퍼진 사건 나누기
+                print(f"🧩 사건 군집: {stories.stats()}")
+            if get_cache().maybe_evict():  # 계속 도는 루프라서 주기적으로 HTML 캐시 정리
+                print(f"🗄️ HTML 캐시 정리: {get_cache().stats()}")
+            pruned = registry.prune(REGISTRY_RETENTION_DAYS)
+            if pruned:
+                print(f"🧹 레지스트리에서 오래된 기사 {pruned}건 정리")
 
@@ -0,0 +1,139 @@
+# batch_summarizer.py
+# 일일 요약을 OpenAI Batch API로 한 번에 제출하고 결과를 받아오는 모듈
+#
+# 진행 상태는 data/{prefix}_{date}_batch.json에 남기므로, 중간에 끊겨도 다시 실행하면
+# 이미 제출한 배치를 이어서 기다립니다. (OPENAI_BASE_URL로 로컬 대역 서버를 쓸 수 있음)
+
+import os
+import sys
+import json
+import time
+import openai
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.storage import DATA_DIR
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+POLL_INTERVAL = 30
+FAILED_STATUSES = {"failed", "expired", "cancelled"}
+
+
+def batch_state_path(file_prefix, date, data_dir=DATA_DIR):
+    return os.path.join(data_dir, f"{file_prefix}_{date}_batch.json")
+
+
+def _load_state(state_path):
+    if not os.path.exists(state_path):
+        return None
+    with open(state_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_state(state_path, state):
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, state_path)
+
+
+def write_batch_file(jobs, summarizer, prompt, jsonl_path):
+    """
+    jobs [(행 번호, 본문, 키워드)]를 Batch API 입력 JSONL로 씁니다. custom_id는 행 번호입니다.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(jsonl_path)), exist_ok=True)
+    with open(jsonl_path, "w", encoding="utf-8") as f:
+        for i, text, keywords in jobs:
+            f.write(json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": summarizer.build_request(prompt, text, keywords, structured=True),
+            }, ensure_ascii=False) + "\n")
+    return jsonl_path
+
+
+def submit_batch(client, jsonl_path):
+    with open(jsonl_path, "rb") as f:
+        input_file = client.files.create(file=f, purpose="batch")
+    batch = client.batches.create(input_file_id=input_file.id, endpoint=BATCH_ENDPOINT,
+                                  completion_window=COMPLETION_WINDOW)
+    return batch
+
+
+def wait_for_batch(client, batch_id, poll_interval=POLL_INTERVAL):
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        done = f"{counts.completed}/{counts.total}" if counts else "-"
+        print(f"⏳ 배치 {batch_id}: {batch.status} ({done})")
+        if batch.status == "completed" or batch.status in FAILED_STATUSES:
+            return batch
+        time.sleep(poll_interval)
+
+
+def download_results(client, batch):
+    """
+    배치 출력 파일을 읽어 {행 번호: 응답 원문}으로 돌려줍니다. 실패한 요청은 빠집니다.
+    """
+    results = {}
+    if not batch.output_file_id:
+        return results
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        response = item.get("response") or {}
+        if item.get("error") or response.get("status_code") != 200:
+            continue
+        choices = response["body"].get("choices") or []
+        if choices:
+            results[int(item["custom_id"])] = choices[0]["message"]["content"].strip()
+    return results
+
+
+def run_batch(jobs, summarizer, prompt, state_path, poll_interval=POLL_INTERVAL):
+    """
+    jobs를 배치 하나로 제출하고 끝날 때까지 기다린 뒤 {행 번호: 응답 원문}을 돌려줍니다.
+
+    state_path에 제출한 배치가 있으면 새로 제출하지 않고 그 배치를 이어서 기다립니다.
+    배치가 실패/만료되면 받은 결과만 돌려주고, 나머지 행은 호출한 쪽에서 온라인으로 처리합니다.
+    """
+    client = openai.OpenAI()
+    state = _load_state(state_path)
+    if state and state.get("request_count") != len(jobs):
+        print(f"⚠️ 저장된 배치({state['batch_id']})와 요청 수가 달라 새로 제출합니다.")
+        state = None
+
+    if state is None:
+        if not jobs:
+            return {}
+        jsonl_path = os.path.splitext(state_path)[0] + "_input.jsonl"
+        write_batch_file(jobs, summarizer, prompt, jsonl_path)
+        batch = submit_batch(client, jsonl_path)
+        state = {"batch_id": batch.id, "input_file": jsonl_path, "request_count": len(jobs),
+                 "submitted_at": time.time()}
+        _save_state(state_path, state)
+        print(f"📤 배치 제출: {batch.id} ({len(jobs)}건)")
+    else:
+        print(f"🔁 제출해 둔 배치를 이어서 기다립니다: {state['batch_id']}")
+
+    batch = wait_for_batch(client, state["batch_id"], poll_interval)
+    results = download_results(client, batch)
+    if batch.status in FAILED_STATUSES:
+        print(f"⚠️ 배치가 {batch.status} 상태로 끝났습니다. 받은 결과 {len(results)}/{len(jobs)}건")
+    else:
+        print(f"📥 배치 결과 {len(results)}/{len(jobs)}건 수신")
+    return results
+
+
+def finish_batch(state_path):
+    """
+    결과를 저장한 뒤 상태 파일과 입력 JSONL을 정리합니다.
+    """
+    state = _load_state(state_path)
+    if state is None:
+        return
+    if os.path.exists(state.get("input_file", "")):
+        os.remove(state["input_file"])
+    os.remove(state_path)
@@ -0,0 +1,43 @@
+# embedder.py
+# 군집화용 임베딩 텍스트 만들기와 동기 임베딩 요청 (일일 군집화와 실시간 루프가 같은 텍스트/저장소를 씀)
+
+import os
+import sys
+import openai
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.token_budget import pack_by_tokens
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIM = 1536
+EMBED_BATCH_TOKENS = 50000  # 임베딩 요청 하나의 입력 토큰 상한 (API 한도보다 넉넉히 작게)
+EMBED_BATCH_ITEMS = 512     # 임베딩 요청 하나에 넣을 최대 텍스트 수 (API 한도 2048)
+
+
+def cluster_text(title, content, budgeter):
+    """
+    제목 + 본문 앞부분(임베딩 모델 토큰 기준 예산에 맞춰 자름). 줄바꿈은 공백으로 바꿉니다.
+    """
+    title = title if isinstance(title, str) else ""
+    content = budgeter.fit(content, title) if isinstance(content, str) else ""
+    return (title + " " + content).replace("\n", " ")
+
+
+def embed_texts(texts, store, model=EMBEDDING_MODEL):
+    """
+    저장소에 없는 텍스트만 토큰 수 기준으로 묶어 요청하고, texts 순서대로 (n, dim) 배열을 돌려줍니다.
+    요청에 실패한 텍스트의 행은 0입니다. 아무것도 받지 못했으면 None을 돌려줍니다.
+    """
+    _, missing = store.lookup(texts)
+    pending = list(dict.fromkeys(texts[i] for i in missing))
+    for batch in pack_by_tokens([(i, text, "") for i, text in enumerate(pending)], EMBED_BATCH_TOKENS,
+                                max_items=EMBED_BATCH_ITEMS, model=model):
+        batch_texts = [text for _, text, _ in batch]
+        try:
+            response = openai.embeddings.create(input=batch_texts, model=model)
+        except Exception as e:
+            print(f"⚠️ Embedding error: {e}")
+            continue
+        store.add(batch_texts, [item.embedding for item in sorted(response.data, key=lambda item: item.index)])
+    vectors, _ = store.lookup(texts, count=False)
+    return vectors
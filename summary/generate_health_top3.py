@@ -5,25 +5,31 @@ import openai
 import pandas as pd
 from dotenv import load_dotenv
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.storage import find_stage_file, stage_path, read_frame
+from utils.token_budget import TokenBudgeter
+
 def load_prompt(prompt_path: str) -> str:
     with open(prompt_path, "r", encoding="utf-8") as f:
         return f.read()
 
 def load_negative_articles(file_path: str) -> pd.DataFrame:
-    df = pd.read_excel(file_path)
+    df = read_frame(file_path)
     if 'label' not in df.columns:
         raise ValueError("'label' column not found in Excel file.")
     return df[df['label'] == True]
 
 def generate_report(prompt: str, articles: pd.DataFrame) -> str:
+    budgeter = TokenBudgeter("excerpt")
     article_list = []
     for idx, row in articles.iterrows():
         article_list.append({
             "index": idx,
             "title": row["제목"],
             "summary": row["summary"],
-            "content": row["본문"][:100]
+            "content": budgeter.fit(row["본문"])
         })
+    budgeter.report()
 
     # JSON 형식 문자열로 변환
     formatted_articles = json.dumps(article_list, ensure_ascii=False, indent=2)
@@ -60,10 +66,13 @@ def main():
     print(f" - 날짜     : {date_str}")
 
     prompt_path = f"../prompt/{file_prefix}_top3.txt"
-    excel_path = f"../data/{file_prefix}_{date_str}_summary.xlsx"
+    summary_path = find_stage_file(file_prefix, date_str, "summary")
+    if summary_path is None:
+        print(f"\n🚫 입력 파일을 찾을 수 없습니다: {stage_path(file_prefix, date_str, 'summary')}\n")
+        return
 
     prompt = load_prompt(prompt_path)
-    articles = load_negative_articles(excel_path)
+    articles = load_negative_articles(summary_path)
 
     if articles.empty:
         print("오늘은 부정 기사가 없습니다. 축하합니다 🎉")
@@ -4,21 +4,27 @@ import openai
 import pandas as pd
 from dotenv import load_dotenv
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.storage import find_stage_file, stage_path, read_frame
+from utils.token_budget import TokenBudgeter
+
 def load_prompt(prompt_path: str) -> str:
     with open(prompt_path, "r", encoding="utf-8") as f:
         return f.read()
 
 def load_negative_articles(file_path: str) -> pd.DataFrame:
-    df = pd.read_excel(file_path)
+    df = read_frame(file_path)
     df = df[df['is_related'] == True].reset_index(drop=True)
     if 'label' not in df.columns:
         raise ValueError("'label' column not found in Excel file.")
     return df[df['label'] == 'Negative']
 
 def generate_report(prompt: str, articles: pd.DataFrame) -> str:
+    budgeter = TokenBudgeter("report")
     content = ""
     for _, row in articles.iterrows():
-        content += f"- 제목: {row['제목']}\n  언론사: {row['언론사']}\n  요약: {row['summary']}\n  본문일부: {row['본문']}\n\n\n"
+        content += f"- 제목: {row['제목']}\n  언론사: {row['언론사']}\n  요약: {row['summary']}\n  본문일부: {budgeter.fit(row['본문'])}\n\n\n"
+    budgeter.report()
 
     full_prompt = prompt + "\n\n" + content
 
@@ -51,10 +57,13 @@ def main():
     print(f" - 날짜     : {date_str}")
 
     prompt_path = f"../prompt/{file_prefix}_negative_report.txt"
-    excel_path = f"../data/{file_prefix}_{date_str}_summary.xlsx"
+    summary_path = find_stage_file(file_prefix, date_str, "summary")
+    if summary_path is None:
+        print(f"\n🚫 입력 파일을 찾을 수 없습니다: {stage_path(file_prefix, date_str, 'summary')}\n")
+        return
 
     prompt = load_prompt(prompt_path)
-    articles = load_negative_articles(excel_path)
+    articles = load_negative_articles(summary_path)
 
     if articles.empty:
         print("오늘은 부정 기사가 없습니다. 축하합니다 🎉")
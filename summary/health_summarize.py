@@ -1,11 +1,15 @@
 # health_summarize.py
 
+import os
 import pandas as pd
 import sys
 from summarizer import NewsSummarizer
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.storage import find_stage_file, stage_path, read_frame, save_frame
+
 def summarize_news_from_excel(input_file, output_file, prompt):
-    df = pd.read_excel(input_file)
+    df = read_frame(input_file)
 
     summarizer = NewsSummarizer()
 
@@ -23,8 +27,8 @@ def summarize_news_from_excel(input_file, output_file, prompt):
 
     df['요약'] = summaries
 
-    # 요약된 결과를 새로운 엑셀 파일로 저장
-    df.to_excel(output_file, index=False)
+    # 요약된 결과를 새로운 파일로 저장
+    save_frame(df, output_file)
     print(f"요약이 완료되었습니다. 결과는 {output_file}에 저장되었습니다.")
 
 if __name__ == "__main__":
@@ -38,8 +42,10 @@ if __name__ == "__main__":
     with open("../prompt/health_summary.py", 'r', encoding='utf-8') as file:
         prompt = file.read()
 
-    data_directory = "../data/"
-    input_path = f"{data_directory}{file_prefix}_{date_str}_naver.xlsx"
-    output_path = f"{data_directory}{file_prefix}_{date_str}_summary.xlsx"
+    input_path = find_stage_file(file_prefix, date_str, "naver")
+    output_path = stage_path(file_prefix, date_str, "summary")
+    if input_path is None:
+        print(f"\n🚫 입력 파일을 찾을 수 없습니다: {stage_path(file_prefix, date_str, 'naver')}\n")
+        sys.exit(1)
 
     summarize_news_from_excel(input_path, output_path, prompt)
@@ -0,0 +1,451 @@
+# online_cluster.py
+# 요약이 끝난 기사를 하나씩 기존 사건(story 클러스터)에 붙이거나 새 사건을 여는 온라인 군집기
+#
+# 상태는 data/{prefix}_stories.sqlite3에 남깁니다.
+#   stories : 사건별 벡터 합, 기사 수, 대표 제목, 알림 시각, 합쳐진 사건 번호
+#   members : 기사 키(네이버 링크)별 사건 번호, 벡터, 날짜, 알림 여부
+# 메모리에는 최근 active_days일 안에 기사가 붙은 사건의 중심만 들고 있어서, 기사 하나를 붙일 때
+# 중심 행렬과 내적 한 번이면 됩니다. 주기적으로 maintain()을 불러 가까운 사건은 합치고 퍼진 사건은 나눕니다.
+#
+# 실시간 루프와 일일 run_cluster가 같은 파일을 동시에 열어도 되도록
+#   - 사건 번호는 DB가 발급 (AUTOINCREMENT)
+#   - 벡터 합/기사 수는 덮어쓰지 않고, 쓰기 잠금(BEGIN IMMEDIATE) 안에서 저장된 값에 새 기사분만 더함
+#   - 저장한 뒤에는 다른 프로세스가 쓴 것까지 다시 읽음
+#
+# 환경변수
+#   NEWSBOT_ONLINE_CLUSTER : 0이면 실시간 루프에서 사건 묶음/중복 알림 억제를 하지 않음
+
+import os
+import sys
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from collections import Counter
+
+import numpy as np
+from sklearn.cluster import KMeans
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.storage import DATA_DIR
+from utils.neighbors import IVFIndex
+
+ASSIGN_THRESHOLD = 0.3   # 사건 중심과 코사인 거리가 이 이하면 그 사건에 붙임 (run_cluster의 eps와 같음)
+MERGE_THRESHOLD = 0.15   # 두 사건 중심의 거리가 이 이하면 합침
+SPLIT_SPREAD = 0.2       # 기사들과 중심의 평균 거리가 이보다 크면 둘로 나눠 봄
+SPLIT_MIN_SIZE = 4       # 이보다 작은 사건은 나누지 않음
+ACTIVE_DAYS = 3          # 이 기간 동안 기사가 붙지 않은 사건은 메모리에서 내림 (디스크에는 남음)
+IVF_MIN_STORIES = 2000   # 활성 사건이 이만큼 이상이면 IVF 색인으로 가까운 목록의 사건만 비교 (이하는 전체 내적 < 1ms)
+IVF_N_PROBE = 4          # 기사마다 볼 가까운 목록 수
+IVF_KMEANS_ITER = 5      # 색인은 저장/정리 때마다 다시 만들므로 가벼운 k-means로 만듦
+DAY_SECONDS = 24 * 60 * 60
+
+
+def story_state_path(file_prefix, data_dir=DATA_DIR):
+    return os.path.join(data_dir, f"{file_prefix}_stories.sqlite3")
+
+
+def _unit(vector):
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+class StoryClusterer:
+    """
+    Args:
+    path (str): SQLite 상태 파일 경로.
+    threshold (float): 기존 사건에 붙일 최대 코사인 거리.
+    merge_threshold (float): 합칠 사건 중심 사이 최대 거리.
+    split_spread (float): 나눠 볼 사건의 평균 퍼짐(1 - |벡터 합| / 기사 수).
+    active_days (float): 메모리에 들고 있을 사건의 최근 활동 기간(일).
+    ivf_min_stories (int): 활성 사건이 이 이상이면 IVF 색인으로 후보 사건만 비교 (근사).
+    """
+
+    def __init__(self, path, threshold=ASSIGN_THRESHOLD, merge_threshold=MERGE_THRESHOLD,
+                 split_spread=SPLIT_SPREAD, active_days=ACTIVE_DAYS, ivf_min_stories=IVF_MIN_STORIES):
+        self.path = path
+        self.threshold = threshold
+        self.merge_threshold = merge_threshold
+        self.split_spread = split_spread
+        self.active_days = active_days
+        self.ivf_min_stories = ivf_min_stories
+        self.assigned = self.opened = self.merged = self.split = self.suppressed = 0
+        self.assign_seconds = 0.0
+        self._new_members = []      # 아직 기록하지 않은 (key, story_id, vector, date, added_at)
+        self._reported = {}         # 아직 기록하지 않은 알림 시각 {story_id: reported_at}
+        self._notified = []         # 아직 기록하지 않은 알림 보낸 기사 키
+        self._lock = threading.RLock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS stories (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                vector_sum BLOB NOT NULL,
+                count INTEGER NOT NULL,
+                title TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                reported_at REAL,
+                merged_into INTEGER
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS members (
+                key TEXT PRIMARY KEY,
+                story_id INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                date TEXT,
+                added_at REAL NOT NULL,
+                notified INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_members_story ON members (story_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_stories_updated ON stories (updated_at)")
+        with self._lock:
+            self._reload()
+
+    @contextmanager
+    def _transaction(self):
+        # 쓰기 잠금을 잡고 시작하므로 그 안에서 읽은 값은 커밋할 때까지 다른 프로세스가 바꾸지 못함
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _reload(self, now=None, index=True):
+        # 디스크 상태(다른 프로세스가 쓴 것 포함)로 활성 사건과 기사 목록을 다시 읽음 (self._lock을 잡은 상태에서 호출)
+        cutoff = (now or time.time()) - self.active_days * DAY_SECONDS
+        self._stories = {}          # 활성 사건: id -> {sum, count, title, created_at, updated_at, reported_at}
+        self._members = {}          # 활성 사건의 기사 키 -> 사건 번호
+        rows = self._conn.execute(
+            "SELECT id, vector_sum, count, title, created_at, updated_at, reported_at FROM stories "
+            "WHERE merged_into IS NULL AND count > 0 AND updated_at >= ?", (cutoff,)).fetchall()
+        for sid, vector_sum, count, title, created_at, updated_at, reported_at in rows:
+            self._stories[sid] = {"sum": np.frombuffer(vector_sum, dtype=np.float32).copy(), "count": count,
+                                  "title": title, "created_at": created_at, "updated_at": updated_at,
+                                  "reported_at": reported_at}
+        for start in range(0, len(rows), 500):
+            ids = [row[0] for row in rows[start:start + 500]]
+            placeholders = ",".join("?" * len(ids))
+            for key, sid in self._conn.execute(
+                    f"SELECT key, story_id FROM members WHERE story_id IN ({placeholders})", ids):
+                self._members[key] = sid
+        self._rebuild(index)
+
+    def _rebuild(self, index=True):
+        self._order = list(self._stories)
+        self._ivf = self._list_bounds = None
+        if self._order:
+            self._centroids = np.stack([_unit(self._stories[sid]["sum"]) for sid in self._order])
+            if index and len(self._order) >= self.ivf_min_stories:
+                # 목록별로 행이 붙어 있도록 순서를 바꿔서, 후보 비교가 복사 없는 슬라이스 내적이 되게 함
+                self._ivf = IVFIndex(n_probe=IVF_N_PROBE, kmeans_iter=IVF_KMEANS_ITER).fit(self._centroids)
+                permutation = np.concatenate(self._ivf.lists)
+                self._list_bounds = np.concatenate([[0], np.cumsum([len(rows) for rows in self._ivf.lists])])
+                self._order = [self._order[i] for i in permutation]
+                self._centroids = self._centroids[permutation]
+        else:
+            self._centroids = None
+        self._indexed = len(self._order)  # 이 뒤에 붙은 행(새 사건)은 색인 밖이라 항상 비교
+        self._rows = {sid: row for row, sid in enumerate(self._order)}
+
+    def _nearest(self, vector):
+        # (가장 가까운 행, 유사도). 색인이 있으면 가까운 목록 n_probe개와 색인 뒤에 새로 붙은 행만 비교
+        if self._ivf is None:
+            sims = self._centroids[:len(self._order)] @ vector
+            row = int(np.argmax(sims))
+            return row, float(sims[row])
+        ranges = [(self._list_bounds[i], self._list_bounds[i + 1]) for i in self._ivf.nearest_lists(vector)]
+        ranges.append((self._indexed, len(self._order)))
+        best_row, best_sim = -1, -np.inf
+        for start, end in ranges:
+            if end > start:
+                sims = self._centroids[start:end] @ vector
+                row = int(np.argmax(sims))
+                if sims[row] > best_sim:
+                    best_row, best_sim = start + row, float(sims[row])
+        return best_row, best_sim
+
+    def _append_row(self, sid):
+        centroid = _unit(self._stories[sid]["sum"])[None, :]
+        self._rows[sid] = len(self._order)
+        self._order.append(sid)
+        if self._centroids is None:
+            self._centroids = centroid
+        else:
+            if len(self._order) > len(self._centroids):
+                # 행렬을 두 배씩 늘려서 사건을 열 때마다 복사하지 않음
+                grown = np.zeros((len(self._centroids) * 2, self._centroids.shape[1]), dtype=np.float32)
+                grown[:len(self._order) - 1] = self._centroids[:len(self._order) - 1]
+                self._centroids = grown
+            self._centroids[len(self._order) - 1] = centroid[0]
+
+    def _insert_story(self, vector_sum, count, title, created_at, updated_at=None, reported_at=None):
+        # 사건 번호는 DB가 발급하므로 같은 파일을 쓰는 다른 프로세스와 겹치지 않음
+        cursor = self._conn.execute(
+            "INSERT INTO stories (vector_sum, count, title, created_at, updated_at, reported_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (np.asarray(vector_sum, dtype=np.float32).tobytes(), count, title, created_at,
+             updated_at or created_at, reported_at))
+        return cursor.lastrowid
+
+    def _write_story(self, sid):
+        # maintain()의 쓰기 잠금 안에서, 방금 다시 읽은 값에 합치기/나누기를 반영한 사건 행을 그대로 씀
+        story = self._stories[sid]
+        self._conn.execute(
+            "UPDATE stories SET vector_sum = ?, count = ?, updated_at = ?, reported_at = ? WHERE id = ?",
+            (story["sum"].astype(np.float32).tobytes(), story["count"], story["updated_at"],
+             story["reported_at"], sid))
+
+    def assign(self, key, vector, title="", date=None, now=None):
+        """
+        기사 하나를 가장 가까운 활성 사건에 붙이거나(거리 <= threshold) 새 사건을 엽니다.
+        (사건 번호, 새 사건 여부)를 돌려줍니다. 이미 붙인 기사는 원래 사건을, 빈 벡터는 (None, False)를 돌려줍니다.
+        """
+        started = time.perf_counter()
+        now = now or time.time()
+        vector = _unit(np.asarray(vector, dtype=np.float32))
+        if not vector.any():
+            return None, False
+        with self._lock:
+            sid = self._members.get(key)
+            if sid is not None:
+                return sid, False
+            best = None
+            if self._order:
+                row, sim = self._nearest(vector)
+                if row >= 0 and 1.0 - sim <= self.threshold:
+                    best = self._order[row]
+            is_new = best is None
+            if is_new:
+                # 벡터 합/기사 수는 save()에서 더하므로 빈 사건으로 먼저 만들어 번호만 받음
+                best = self._insert_story(np.zeros_like(vector), 0, title, now)
+                self._stories[best] = {"sum": np.zeros_like(vector), "count": 0, "title": title,
+                                       "created_at": now, "updated_at": now, "reported_at": None}
+                self.opened += 1
+            story = self._stories[best]
+            story["sum"] += vector
+            story["count"] += 1
+            story["updated_at"] = now
+            if is_new:
+                self._append_row(best)
+            else:
+                self._centroids[self._rows[best]] = _unit(story["sum"])
+            self._members[key] = best
+            self._new_members.append((key, best, vector, date, now))
+            self.assigned += 1
+            self.assign_seconds += time.perf_counter() - started
+        return best, is_new
+
+    def story_of(self, key):
+        with self._lock:
+            if key in self._members:
+                return self._members[key]
+            row = self._conn.execute("SELECT story_id FROM members WHERE key = ?", (key,)).fetchone()
+            return self._resolve(row[0]) if row else None
+
+    def _resolve(self, sid):
+        # 합쳐진 사건이면 최종 사건 번호를 따라감
+        while True:
+            row = self._conn.execute("SELECT merged_into FROM stories WHERE id = ?", (sid,)).fetchone()
+            if row is None or row[0] is None:
+                return sid
+            sid = row[0]
+
+    def stories_for(self, keys):
+        """
+        {기사 키: 사건 번호}를 돌려줍니다. 붙인 적 없는 기사는 빠집니다.
+        """
+        return {key: sid for key, sid in ((key, self.story_of(key)) for key in keys) if sid is not None}
+
+    def is_reported(self, sid):
+        with self._lock:
+            if sid in self._stories:
+                return self._stories[sid]["reported_at"] is not None
+            row = self._conn.execute("SELECT reported_at FROM stories WHERE id = ?", (self._resolve(sid),)).fetchone()
+        return bool(row and row[0] is not None)
+
+    def should_alert(self, sid):
+        """
+        이미 알린 사건이면 False(알림 생략 건수에 집계), 아니면 True.
+        """
+        if self.is_reported(sid):
+            self.suppressed += 1
+            return False
+        return True
+
+    def mark_reported(self, sid, key=None, now=None):
+        now = now or time.time()
+        with self._lock:
+            if sid in self._stories and self._stories[sid]["reported_at"] is None:
+                self._stories[sid]["reported_at"] = now
+            self._reported.setdefault(sid, now)
+            if key is not None:
+                self._notified.append(key)
+
+    def _flush(self):
+        # 쌓아 둔 기사/알림을 기록 (_transaction 안에서 호출). 벡터 합과 기사 수는 저장된 값에 새 기사분만 더함
+        deltas, skipped = {}, set()
+        for key, sid, vector, date, added_at in self._new_members:
+            sid = self._resolve(sid)
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO members (key, story_id, vector, date, added_at) VALUES (?, ?, ?, ?, ?)",
+                (key, sid, vector.tobytes(), date, added_at)).rowcount
+            if not inserted:
+                skipped.add(sid)
+                continue  # 다른 프로세스가 먼저 붙인 기사는 그쪽 사건을 따름 (다시 읽을 때 반영)
+            vector_sum, count, updated_at = deltas.get(sid, (0.0, 0, added_at))
+            deltas[sid] = (vector_sum + vector, count + 1, max(updated_at, added_at))
+        for sid, (vector_sum, count, updated_at) in deltas.items():
+            stored_sum, stored_count = self._conn.execute(
+                "SELECT vector_sum, count FROM stories WHERE id = ?", (sid,)).fetchone()
+            self._conn.execute(
+                "UPDATE stories SET vector_sum = ?, count = ?, updated_at = MAX(updated_at, ?) WHERE id = ?",
+                ((np.frombuffer(stored_sum, dtype=np.float32) + vector_sum).astype(np.float32).tobytes(),
+                 stored_count + count, updated_at, sid))
+        # 그 기사 때문에 열었다가 기사가 하나도 남지 않은 빈 사건은 지움
+        self._conn.executemany("DELETE FROM stories WHERE id = ? AND count = 0", [(sid,) for sid in skipped])
+        self._conn.executemany("UPDATE stories SET reported_at = COALESCE(reported_at, ?) WHERE id = ?",
+                               [(reported_at, self._resolve(sid)) for sid, reported_at in self._reported.items()])
+        self._conn.executemany("UPDATE members SET notified = 1 WHERE key = ?", [(k,) for k in self._notified])
+        self._new_members.clear()
+        self._reported.clear()
+        self._notified.clear()
+
+    def save(self):
+        """
+        쌓아 둔 기사/알림을 기록하고, 다른 프로세스가 쓴 것까지 다시 읽습니다.
+        """
+        with self._lock:
+            if not (self._new_members or self._reported or self._notified):
+                return
+            with self._transaction():
+                self._flush()
+                self._reload()
+
+    def _member_rows(self, sid):
+        rows = self._conn.execute("SELECT key, vector, notified FROM members WHERE story_id = ?", (sid,)).fetchall()
+        return [row[0] for row in rows], np.stack([np.frombuffer(row[1], dtype=np.float32) for row in rows]), \
+            [bool(row[2]) for row in rows]
+
+    def _merge(self, keep, drop, now):
+        target, source = self._stories[keep], self._stories.pop(drop)
+        target["sum"] += source["sum"]
+        target["count"] += source["count"]
+        target["updated_at"] = max(target["updated_at"], source["updated_at"])
+        reported = [t for t in (target["reported_at"], source["reported_at"]) if t is not None]
+        target["reported_at"] = min(reported) if reported else None
+        self._conn.execute("UPDATE members SET story_id = ? WHERE story_id = ?", (keep, drop))
+        self._conn.execute("UPDATE stories SET merged_into = ?, updated_at = ? WHERE id = ?", (keep, now, drop))
+        self._write_story(keep)
+        for key, sid in self._members.items():
+            if sid == drop:
+                self._members[key] = keep
+        self.merged += 1
+
+    def _split(self, sid, now):
+        keys, vectors, notified = self._member_rows(sid)
+        parts = KMeans(n_clusters=2, n_init=3, random_state=0).fit_predict(vectors)
+        centers = [_unit(vectors[parts == p].sum(axis=0)) for p in (0, 1)]
+        if 1.0 - float(centers[0] @ centers[1]) <= self.threshold:
+            return False
+        # 기사가 많은 쪽이 원래 사건 번호를 유지하고, 나머지는 새 사건이 됨 (알림 여부는 기사 기준으로 나눔)
+        stay = 0 if (parts == 0).sum() >= (parts == 1).sum() else 1
+        story = self._stories[sid]
+        moved = parts != stay
+        reported_at = story["reported_at"]
+        if any(notified):
+            stay_reported = any(n for n, m in zip(notified, moved) if not m)
+            moved_reported = any(n for n, m in zip(notified, moved) if m)
+        else:
+            stay_reported = moved_reported = reported_at is not None  # 어느 기사로 알렸는지 모르면 둘 다 알린 것으로 봄
+        story["sum"] = vectors[~moved].sum(axis=0)
+        story["count"] = int((~moved).sum())
+        story["reported_at"] = (reported_at or now) if stay_reported else None
+        moved_keys = [k for k, m in zip(keys, moved) if m]
+        new_story = {
+            "sum": vectors[moved].sum(axis=0), "count": len(moved_keys),
+            "title": story["title"], "created_at": now, "updated_at": story["updated_at"],
+            "reported_at": (reported_at or now) if moved_reported else None,
+        }
+        new_sid = self._insert_story(new_story["sum"], new_story["count"], new_story["title"], now,
+                                     new_story["updated_at"], new_story["reported_at"])
+        self._stories[new_sid] = new_story
+        self._write_story(sid)
+        self._conn.executemany("UPDATE members SET story_id = ? WHERE key = ?", [(new_sid, k) for k in moved_keys])
+        for key in moved_keys:
+            self._members[key] = new_sid
+        self.split += 1
+        return True
+
+    def maintain(self, now=None):
+        """
+        저장 → 다시 읽기(오래된 사건은 내림) → 가까운 사건 합치기 → 퍼진 사건 나누기.
+        모두 쓰기 잠금 하나 안에서 하므로 다른 프로세스의 기록과 섞이지 않습니다.
+        """
+        now = now or time.time()
+        with self._lock, self._transaction():
+            self._flush()
+            self._reload(now, index=False)  # 합치기/나누기 뒤에 색인을 다시 만드므로 여기서는 생략
+            if len(self._order) > 1:
+                dist = 1.0 - self._centroids @ self._centroids.T
+                rows, cols = np.nonzero(np.triu(dist <= self.merge_threshold, k=1))
+                for r, c in sorted(zip(rows, cols), key=lambda rc: dist[rc[0], rc[1]]):
+                    keep, drop = self._order[r], self._order[c]
+                    if keep in self._stories and drop in self._stories:
+                        if self._stories[drop]["count"] > self._stories[keep]["count"]:
+                            keep, drop = drop, keep
+                        self._merge(keep, drop, now)
+            for sid in list(self._stories):
+                story = self._stories[sid]
+                spread = 1.0 - np.linalg.norm(story["sum"]) / story["count"]
+                if story["count"] >= SPLIT_MIN_SIZE and spread > self.split_spread:
+                    self._split(sid, now)
+            self._rebuild()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "active_stories": len(self._stories),
+                "assigned": self.assigned,
+                "opened": self.opened,
+                "merged": self.merged,
+                "split": self.split,
+                "suppressed": self.suppressed,
+                "avg_assign_ms": round(self.assign_seconds / self.assigned * 1000, 3) if self.assigned else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            self.save()
+            self._conn.close()
+
+
+def make_story_clusterer(file_prefix, data_dir=DATA_DIR):
+    """
+    NEWSBOT_ONLINE_CLUSTER가 0이 아니면 {prefix}의 사건 군집기를, 아니면 None을 돌려줍니다.
+    """
+    if os.getenv("NEWSBOT_ONLINE_CLUSTER", "1").lower() in ("0", "false", "no"):
+        return None
+    return StoryClusterer(story_state_path(file_prefix, data_dir))
+
+
+def story_labels(story_ids, min_samples=2):
+    """
+    행별 사건 번호 목록을 run_cluster와 같은 라벨로 바꿉니다: 이 목록 안에서 기사가 min_samples건 이상인
+    사건은 0부터 차례로 번호를 매기고, 나머지(단독 기사, 사건 없음)는 -1.
+    """
+    counts = Counter(sid for sid in story_ids if sid is not None)
+    numbering = {}
+    labels = []
+    for sid in story_ids:
+        if sid is None or counts[sid] < min_samples:
+            labels.append(-1)
+            continue
+        labels.append(numbering.setdefault(sid, len(numbering)))
+    return labels
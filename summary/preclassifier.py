@@ -0,0 +1,234 @@
+# preclassifier.py
+# 분명히 관련 없는 기사를 LLM 호출 전에 걸러내는 로컬 사전 분류기
+# (글자 n-gram TF-IDF + 로지스틱 회귀, 과거 _summary 파일의 is_related/label로 학습)
+#
+# 사용법: python preclassifier.py train [health|cnews]
+#         python preclassifier.py eval [health|cnews] [검증 일수 (기본: 3)]
+#
+# 환경변수
+#   NEWSBOT_PRECLASSIFIER : 건너뛸 기준 확률 (기본 0.95, 0이면 사전 분류기를 쓰지 않음)
+
+import os
+import re
+import sys
+import glob
+import time
+
+import joblib
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.storage import DATA_DIR, EXTENSIONS, read_frame
+
+DEFAULT_THRESHOLD = 0.95   # '관련 없음' 확률이 이 이상일 때만 LLM을 건너뜀
+MAX_BODY_CHARS = 1000      # 분류에는 본문 앞부분만 사용
+EVAL_THRESHOLDS = (0.8, 0.9, 0.95, 0.98)
+SKIPPED_SUMMARY = "사전 분류: 관련 없음"
+
+
+def preclassifier_path(file_prefix, data_dir=DATA_DIR):
+    return os.path.join(data_dir, f"preclassifier_{file_prefix}.joblib")
+
+
+def preclassifier_threshold():
+    return float(os.getenv("NEWSBOT_PRECLASSIFIER", str(DEFAULT_THRESHOLD)))
+
+
+def article_text(keywords, title, content):
+    # 같은 본문이라도 키워드별로 관련성 기준이 달라서 키워드와 제목을 앞에 붙임
+    parts = [str(v) for v in (keywords, title) if isinstance(v, str) and v]
+    body = content[:MAX_BODY_CHARS] if isinstance(content, str) else ""
+    return " ".join(parts + [body])
+
+
+def frame_texts(df):
+    empty = [""] * len(df)
+    return [article_text(k, t, c) for k, t, c in zip(df.get("키워드", empty), df.get("제목", empty), df["본문"])]
+
+
+def _truthy(value):
+    # 저장 형식에 따라 True / "True" / 1 / numpy.bool_ 등으로 섞여 있음
+    return str(value) in ("True", "true", "1", "1.0")
+
+
+def relevance_target(df, file_prefix):
+    """
+    학습 정답: cnews는 is_related, health는 label == "True"(활용 가능).
+    """
+    column = "is_related" if file_prefix == "cnews" else "label"
+    return df[column].map(_truthy).astype(bool)
+
+
+def load_history(file_prefix, data_dir=DATA_DIR):
+    """
+    data_dir의 {prefix}_{YYYYMMDD}_summary 파일을 모두 읽어 'date' 컬럼을 붙여 돌려줍니다.
+    같은 날짜가 여러 형식으로 있으면 하나만 씁니다. 요약에 실패한 행과 사전 분류기가 건너뛴 행은 뺍니다
+    (건너뛴 행의 라벨은 LLM 판단이 아니라 분류기 자신의 추측이라서, 다시 학습하면 추측을 정답으로 배우게 됨).
+    """
+    frames, seen = [], set()
+    pattern = re.compile(rf"^{re.escape(file_prefix)}_(\d{{8}})_summary$")
+    for path in sorted(glob.glob(os.path.join(data_dir, f"{file_prefix}_*_summary.*"))):
+        stem, ext = os.path.splitext(os.path.basename(path))
+        match = pattern.match(stem)
+        if not match or ext not in EXTENSIONS.values() or match.group(1) in seen:
+            continue
+        seen.add(match.group(1))
+        df = read_frame(path)
+        df["date"] = match.group(1)
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    df = df[df["본문"].notna() & ~df["summary"].isin(["요약 실패", SKIPPED_SUMMARY]) & df["label"].notna()]
+    if file_prefix == "cnews":
+        df = df[df["is_related"].notna()]
+    return df.reset_index(drop=True)
+
+
+class PreClassifier:
+    """
+    '관련 없음' 확률이 threshold 이상인 기사만 건너뛰게 하는 분류기.
+    애매하거나 관련 있어 보이는 기사는 그대로 LLM으로 보냅니다.
+
+    Args:
+    file_prefix (str): health | cnews
+    threshold (float): 건너뛸 기준 확률.
+    """
+
+    def __init__(self, file_prefix, threshold=DEFAULT_THRESHOLD, pipeline=None):
+        self.file_prefix = file_prefix
+        self.threshold = threshold
+        self.pipeline = pipeline
+        self.screened = self.skipped = 0
+
+    @staticmethod
+    def build_pipeline():
+        return Pipeline([
+            ("tfidf", TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4), min_df=2,
+                                      max_features=200000, sublinear_tf=True)),
+            ("clf", LogisticRegression(class_weight="balanced", max_iter=1000)),
+        ])
+
+    def fit(self, df):
+        texts = frame_texts(df)
+        target = relevance_target(df, self.file_prefix).astype(int)
+        if target.nunique() < 2:
+            raise ValueError("학습 데이터에 관련/무관 기사가 모두 있어야 합니다.")
+        self.pipeline = self.build_pipeline().fit(texts, target)
+        return self
+
+    def irrelevant_proba(self, texts):
+        proba = self.pipeline.predict_proba(texts)
+        return proba[:, list(self.pipeline.classes_).index(0)]
+
+    def should_skip(self, keywords, title, content):
+        skip = bool(self.irrelevant_proba([article_text(keywords, title, content)])[0] >= self.threshold)
+        self.screened += 1
+        self.skipped += skip
+        return skip
+
+    def skip_mask(self, df):
+        texts = frame_texts(df)
+        mask = self.irrelevant_proba(texts) >= self.threshold
+        self.screened += len(texts)
+        self.skipped += int(mask.sum())
+        return mask
+
+    def skipped_fields(self):
+        if self.file_prefix == "cnews":
+            return {"is_related": False, "label": "Neutral", "summary": SKIPPED_SUMMARY}
+        return {"is_related": False, "label": "False", "summary": SKIPPED_SUMMARY}
+
+    def stats(self):
+        return {
+            "screened": self.screened,
+            "skipped": self.skipped,
+            "skip_ratio": round(self.skipped / self.screened, 3) if self.screened else 0.0,
+            "threshold": self.threshold,
+        }
+
+    def save(self, path=None):
+        path = path or preclassifier_path(self.file_prefix)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        joblib.dump({"file_prefix": self.file_prefix, "pipeline": self.pipeline, "trained_at": time.time()}, path)
+        return path
+
+    @classmethod
+    def load(cls, path, threshold=DEFAULT_THRESHOLD):
+        saved = joblib.load(path)
+        return cls(saved["file_prefix"], threshold, saved["pipeline"])
+
+
+def load_preclassifier(file_prefix, data_dir=DATA_DIR):
+    """
+    학습된 모델이 있고 NEWSBOT_PRECLASSIFIER가 0이 아니면 분류기를, 아니면 None을 돌려줍니다.
+    """
+    threshold = preclassifier_threshold()
+    path = preclassifier_path(file_prefix, data_dir)
+    if threshold <= 0 or not os.path.exists(path):
+        return None
+    model = PreClassifier.load(path, threshold)
+    print(f"🧮 사전 분류기 사용: {os.path.basename(path)} (건너뛰기 기준 {threshold})")
+    return model
+
+
+def evaluate(df, file_prefix, holdout_days=3, thresholds=EVAL_THRESHOLDS):
+    """
+    마지막 holdout_days일을 검증용으로 떼고 나머지로 학습한 뒤, 기준 확률별로
+    '관련 없음' 판정의 정밀도/재현율, 잘못 건너뛴 관련 기사 비율, 줄어드는 LLM 호출 비율을 돌려줍니다.
+    """
+    days = sorted(df["date"].unique())
+    if len(days) <= holdout_days:
+        raise ValueError(f"검증하려면 {holdout_days}일보다 많은 날짜가 필요합니다 (현재 {len(days)}일).")
+    train, test = df[df["date"].isin(days[:-holdout_days])], df[df["date"].isin(days[-holdout_days:])]
+    model = PreClassifier(file_prefix).fit(train)
+    proba = model.irrelevant_proba(frame_texts(test))
+    irrelevant = ~relevance_target(test, file_prefix).to_numpy(dtype=bool)
+
+    rows = []
+    for threshold in thresholds:
+        skip = proba >= threshold
+        true_skip = int((skip & irrelevant).sum())
+        rows.append({
+            "threshold": threshold,
+            "precision": round(true_skip / skip.sum(), 3) if skip.sum() else 1.0,
+            "recall": round(true_skip / irrelevant.sum(), 3) if irrelevant.sum() else 0.0,
+            "missed_related": round(int((skip & ~irrelevant).sum()) / max(1, int((~irrelevant).sum())), 3),
+            "calls_avoided": round(float(skip.mean()), 3),
+        })
+    return {"train_days": len(days) - holdout_days, "test_days": holdout_days,
+            "train_rows": len(train), "test_rows": len(test), "results": pd.DataFrame(rows)}
+
+
+def main():
+    print("\n📄 사용법: python preclassifier.py [train|eval] [health|cnews] [검증 일수 (eval, 기본: 3)]")
+
+    if len(sys.argv) not in (3, 4) or sys.argv[1] not in ("train", "eval"):
+        print("\n❗ 인자 오류: 명령과 파일 접두사를 정확히 입력해 주세요.")
+        return
+
+    command, file_prefix = sys.argv[1], sys.argv[2]
+    df = load_history(file_prefix)
+    if df.empty:
+        print(f"\n🚫 학습에 쓸 {file_prefix}_*_summary 파일이 없습니다: {DATA_DIR}\n")
+        return
+    print(f"\n📚 과거 요약 {df['date'].nunique()}일치, {len(df)}건")
+
+    if command == "train":
+        started = time.perf_counter()
+        path = PreClassifier(file_prefix).fit(df).save()
+        print(f"✅ 학습 완료 ({time.perf_counter() - started:.1f}초): {path}")
+        return
+
+    holdout_days = int(sys.argv[3]) if len(sys.argv) == 4 else 3
+    report = evaluate(df, file_prefix, holdout_days)
+    print(f"🧪 학습 {report['train_days']}일 ({report['train_rows']}건) / 검증 {report['test_days']}일 ({report['test_rows']}건)")
+    print("   precision/recall: '관련 없음' 판정 기준, missed_related: 건너뛴 관련 기사 비율, calls_avoided: 줄어드는 LLM 호출 비율")
+    print(report["results"].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,17 @@ from tqdm import tqdm
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.storage import find_stage_file, stage_path, read_frame, save_frame
+from utils.token_budget import TokenBudgeter, pack_by_tokens
+from utils.embedding_store import EmbeddingStore
+from utils.neighbors import sparse_dbscan
+from embedder import EMBEDDING_MODEL, EMBEDDING_DIM, EMBED_BATCH_TOKENS, EMBED_BATCH_ITEMS, cluster_text
+from online_cluster import StoryClusterer, story_state_path, story_labels
+
 client = None  # 글로벌 AsyncOpenAI 클라이언트
+EMBED_MAX_IN_FLIGHT = 4     # 동시에 보낼 임베딩 요청 수
+CLUSTER_METHODS = ("sparse", "ann", "dense", "online")
 
 def load_api_key():
     global client
@@ -21,65 +31,119 @@ def load_api_key():
         raise ValueError("❌ OPENAI_API_KEY가 .env에서 로드되지 않았어요!")
     client = AsyncOpenAI(api_key=api_key)
 
-def load_data(file_path, max_chars=800):
-    df = pd.read_excel(file_path)
+def load_data(file_path, max_tokens=None):
+    df = read_frame(file_path)
     df = df.dropna(subset=["label"]).reset_index(drop=True)
-    #df["text"] = df["제목"].fillna("") + " " + df["본문"].apply(lambda x: x[:max_chars]).fillna("")
+    # 제목 + 본문 앞부분을 임베딩 모델 토큰 기준 예산에 맞춰 자름
+    budgeter = TokenBudgeter("cluster", max_tokens=max_tokens, model=EMBEDDING_MODEL)
     def get_text(row):
         if row["label"] in [True, "Negative"]:
-            title = row["제목"] if pd.notna(row["제목"]) else ""
-            content = row["본문"][:max_chars] if pd.notna(row["본문"]) else ""
-            return title + " " + content
+            # 실시간 루프와 같은 방식으로 만든 텍스트라서 본문이 같으면 실시간에서 만든 임베딩을 저장소에서 그대로 씀
+            return cluster_text(row["제목"], row["본문"], budgeter)
         return None
 
     df["text"] = df.apply(get_text, axis=1)
+    budgeter.report()
     return df
 
-async def async_get_embedding(text, model="text-embedding-3-small", retry=3):
-    if text is None:
-        return [0.0] * 1536  # 만약 text가 None이라면 실패 시 zero vector 반환
-
-    text = text.replace("\n", " ")
+async def async_get_embeddings(texts, model=EMBEDDING_MODEL, retry=3):
+    # 임베딩 API는 배열 입력을 받으므로 여러 텍스트를 한 요청으로 보냄
     for _ in range(retry):
         try:
             response = await client.embeddings.create(
-                input=[text],
+                input=texts,
                 model=model
             )
-            return response.data[0].embedding
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
         except Exception as e:
             print(f"⚠️ Embedding error: {e}")
             await asyncio.sleep(2)
-    return [0.0] * 1536  # 실패 시 zero vector
+    return None  # 실패하면 저장하지 않고 zero vector로 둠
 
-async def embed_all_async(df, batch_size=100):
+async def embed_all_async(df, store=None, max_in_flight=EMBED_MAX_IN_FLIGHT):
     print("▶ 임베딩 생성 중 (비동기)...")
-    texts = df["text"].tolist()
-    embeddings = []
-
-    for i in tqdm(range(0, len(texts), batch_size)):
-        batch = texts[i:i+batch_size]
-        tasks = [async_get_embedding(text) for text in batch]
-        results = await asyncio.gather(*tasks)
-        embeddings.extend(results)
-
-    df["embedding"] = embeddings
+    if store is None:
+        store = EmbeddingStore(EMBEDDING_MODEL)
+    texts = [text.replace("\n", " ") if isinstance(text, str) and text.strip() else None for text in df["text"]]
+    valid = [i for i, text in enumerate(texts) if text is not None]
+
+    # 저장소에 없는 텍스트만 토큰 수 기준으로 묶어서 요청
+    _, missing = store.lookup([texts[i] for i in valid])
+    pending = list(dict.fromkeys(texts[valid[j]] for j in missing))
+    batches = pack_by_tokens([(j, text, "") for j, text in enumerate(pending)], EMBED_BATCH_TOKENS,
+                             max_items=EMBED_BATCH_ITEMS, model=EMBEDDING_MODEL)
+    print(f"🗂️ 임베딩 {len(valid)}건 중 저장소에 있음 {len(valid) - len(missing)}건, "
+          f"새로 요청 {len(pending)}건 ({len(batches)}개 요청)")
+
+    semaphore = asyncio.Semaphore(max_in_flight)
+    progress = tqdm(total=len(pending))
+
+    async def embed_batch(batch):
+        batch_texts = [text for _, text, _ in batch]
+        async with semaphore:
+            vectors = await async_get_embeddings(batch_texts)
+        if vectors is not None:
+            store.add(batch_texts, vectors)
+        progress.update(len(batch))
+
+    await asyncio.gather(*(embed_batch(batch) for batch in batches))
+    progress.close()
+
+    vectors, _ = store.lookup([texts[i] for i in valid], count=False)
+    embeddings = np.zeros((len(df), store.dim or EMBEDDING_DIM), dtype=np.float32)  # 텍스트가 없으면 zero vector
+    if vectors is not None:
+        embeddings[valid] = vectors
+    df["embedding"] = list(embeddings)
+    print(f"🗃️ 임베딩 저장소: {store.stats()}")
     return df
 
-def cluster_articles(df, eps=0.3, min_samples=2):
-    print("▶ 유사도 계산 및 클러스터링 중...")
-    X = np.array(df["embedding"].tolist())
-    sim_matrix = cosine_similarity(X)
-
-    # 거리 행렬로 변환 (음수 방지)
-    distance_matrix = 1 - sim_matrix
-    distance_matrix = np.clip(distance_matrix, 0, 1)
+def cluster_articles(df, eps=0.3, min_samples=2, method="sparse"):
+    """
+    임베딩을 DBSCAN으로 군집화해 'cluster' 컬럼(노이즈는 -1)을 붙입니다.
 
-    clustering = DBSCAN(eps=eps, min_samples=min_samples, metric="precomputed")
-    labels = clustering.fit_predict(distance_matrix)
+    Args:
+    method (str): "sparse"(반경 이웃 희소 그래프, 기본), "ann"(IVF 근사 이웃, 기사 수가 아주 많을 때),
+                  "dense"(예전 방식: n×n 코사인 거리 행렬).
+    """
+    print(f"▶ 유사도 계산 및 클러스터링 중 ({method})...")
+    X = np.array(df["embedding"].tolist())
+    if method == "dense":
+        sim_matrix = cosine_similarity(X)
+
+        # 거리 행렬로 변환 (음수 방지)
+        distance_matrix = 1 - sim_matrix
+        distance_matrix = np.clip(distance_matrix, 0, 1)
+
+        clustering = DBSCAN(eps=eps, min_samples=min_samples, metric="precomputed")
+        labels = clustering.fit_predict(distance_matrix)
+    else:
+        # 텍스트가 없는 행(zero vector)은 그래프에서 빼고 노이즈(-1)로 둠
+        labels = sparse_dbscan(X, eps, min_samples, ann=method == "ann")
     df["cluster"] = labels
     return df
 
+def cluster_online(df, file_prefix, date_str, min_samples=2):
+    """
+    실시간 루프가 쌓아 둔 사건 군집 상태를 이어서 씁니다. 이미 붙어 있는 기사는 그 사건을 그대로 쓰고,
+    새 기사만 가까운 사건에 붙인 뒤, 사건별 기사 수로 'cluster' 라벨(min_samples건 미만은 -1)을 매깁니다.
+    """
+    print("▶ 사건 군집 상태로 클러스터링 중 (online)...")
+    clusterer = StoryClusterer(story_state_path(file_prefix))
+    # 실시간 루프와 같은 키(네이버 링크)를 쓰고, 링크가 없으면 텍스트로 대신함
+    links = df["네이버링크"] if "네이버링크" in df.columns else [None] * len(df)
+    keys = [link if isinstance(link, str) else text for link, text in zip(links, df["text"])]
+    known = clusterer.stories_for(k for k, text in zip(keys, df["text"]) if isinstance(text, str))
+    for key, text, title, vector in zip(keys, df["text"], df["제목"], df["embedding"]):
+        if isinstance(text, str) and key not in known:
+            clusterer.assign(key, vector, title if isinstance(title, str) else "", date_str)
+    clusterer.maintain()
+    stories = clusterer.stories_for(k for k, text in zip(keys, df["text"]) if isinstance(text, str))
+    df["cluster"] = story_labels([stories.get(k) if isinstance(text, str) else None
+                                  for k, text in zip(keys, df["text"])], min_samples)
+    print(f"🧩 기존 사건에서 가져옴 {len(known)}건, 새로 붙임 {clusterer.assigned}건: {clusterer.stats()}")
+    clusterer.close()
+    return df
+
 def select_representative(group):
     priority = ["조선일보", "중앙일보", "동아일보", "서울경제", "한국경제", "매일경제"]
     
@@ -122,36 +186,47 @@ def extract_representatives(df):
             representatives.append(pd.DataFrame([rep]))
     return pd.concat(representatives, ignore_index=True)
 
-def save_results(df, output_path="대표기사_결과_openai.xlsx"):
-    df.to_excel(output_path, index=False)
+def save_results(df, output_path="대표기사_결과_openai.parquet"):
+    save_frame(df, output_path)
     print(f"✅ 완료! 결과 저장됨: {output_path}")
 
 def main():
-    print("\n📄 사용법: python run_cluster.py [health|cnews] [날짜: YYYYMMDD]")
-
-    if len(sys.argv) != 3:
+    print("\n📄 사용법: python run_cluster.py [health|cnews] [날짜: YYYYMMDD] [--method sparse|ann|dense|online]")
+
+    args = sys.argv[1:]
+    method = "sparse"
+    if "--method" in args:
+        idx = args.index("--method")
+        method = args[idx + 1] if idx + 1 < len(args) else ""
+        del args[idx:idx + 2]
+    if len(args) != 2 or method not in CLUSTER_METHODS:
         print("\n❗ 인자 오류: 파일 접두사와 날짜를 >정확히 입력해 주세요.")
         return
 
-    file_prefix = sys.argv[1]
-    date_str = sys.argv[2]
+    file_prefix = args[0]
+    date_str = args[1]
 
     print(f"\n🔍 처리 중인 파일 정보:")
     print(f" - 카테고리 : {file_prefix}")
     print(f" - 날짜     : {date_str}")
 
-    data_directory = "../data/"
-
-    input_path = f"{data_directory}{file_prefix}_{date_str}_summary.xlsx"
-    output_path = f"{data_directory}{file_prefix}_{date_str}_cluster.xlsx"
+    input_path = find_stage_file(file_prefix, date_str, "summary")
+    output_path = stage_path(file_prefix, date_str, "cluster")
+    if input_path is None:
+        print(f"\n🚫 입력 파일을 찾을 수 없습니다: {stage_path(file_prefix, date_str, 'summary')}\n")
+        return
 
     load_api_key()
     df = load_data(input_path)
     df = asyncio.run(embed_all_async(df))  # async 처리!
-    df = cluster_articles(df)
+    if method == "online":
+        df = cluster_online(df, file_prefix, date_str)
+    else:
+        df = cluster_articles(df, method=method)
     df = force_cluster_for_exclusives(df)
     result_df = extract_representatives(df)
-    save_results(result_df, output_path)
+    # 벡터는 임베딩 저장소에 남으므로 결과 파일에는 쓰지 않음
+    save_results(result_df.drop(columns=["embedding"]), output_path)
 
 if __name__ == "__main__":
     main()
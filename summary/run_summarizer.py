@@ -1,174 +1,211 @@
 # run_summarizer.py
 
+import os
 import pandas as pd
 import sys
 import asyncio
-from summarizer import NewsSummarizer
+import time
+from summarizer import NewsSummarizer, DEFAULT_MAX_IN_FLIGHT, PACK_MAX_TOKENS, PACK_MAX_ITEMS, \
+    parse_response, get_parse_stats, get_pack_stats, make_cascade, get_cascade_stats, get_prompt_cache_stats
+from batch_summarizer import run_batch, finish_batch, batch_state_path
+from preclassifier import load_preclassifier
 from datetime import datetime
-import json
-import re
-
-def parse_response(response):
-    try:
-        # 여러 번 나누어진 응답을 하나로 합치기
-        if isinstance(response, list):
-            response = "".join(response)
-        
-        # 마크다운 코드 블록 제거
-        response = response.strip()
-        if '```json' in response:
-            response = response.split('```json')[1]
-        if '```' in response:
-            response = response.split('```')[0]
-        response = response.strip()
-        
-        # JSON 문자열 정규화
-        response = response.replace('\n', ' ').replace('\r', '')
-        response = re.sub(r'\s+', ' ', response)
-        response = response.replace('False','false').replace('True','true')
-        response = re.sub("'", '', response)
-
-        # 중복된 JSON 응답 제거
-        if response.count('{') > 1:
-            # 마지막 완전한 JSON 객체만 사용
-            last_brace = response.rfind('}')
-            if last_brace != -1:
-                response = response[:last_brace+1]
-        
-        # JSON 파싱
-        result = json.loads(response)
-        
-        # 필수 필드가 없는 경우 기본값 설정
-        if 'is_related' not in result:
-            result['is_related'] = False
-        if 'label' not in result:
-            result['label'] = 'False'
-        if 'summary' not in result:
-            result['summary'] = '요약 실패'
-            
-        # label 값이 예상된 형식이 아닌 경우 수정
-        if isinstance(result['label'], bool):
-            result['label'] = 'True' if result['label'] else 'False'
-        elif result['label'] not in ['True', 'False', 'Positive', 'Negative', 'Neutral']:
-            result['label'] = 'False'
-            
-        return result
-    except Exception as e:
-        print(f"Unexpected error in parse_response: {e}")
-        print(f"Raw response: {response}")
-        return {
-            'is_related': False,
-            'label': 'Neutral',
-            'summary': '요약 실패'
-        }
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.storage import find_stage_file, stage_path, read_frame, save_frame
+from utils.token_budget import TokenBudgeter, count_tokens, pack_by_tokens
+from utils.near_dup import make_grouper
+from utils.prompt_registry import get_prompt_registry, PROMPT_DIR
 
-async def process_content_with_prompt(content, keywords, prompt):
+async def process_content_with_prompt(content, keywords, prompt, summarizer=None, sentdict_raw=None):
     try:
-        summarizer = NewsSummarizer()
-        # 키워드를 프롬프트에 포함
-        full_prompt = f"{prompt}\n\n관련 키워드: {keywords}"
-        # GPT 호출을 asyncio.to_thread로 비동기 처리
-        sentdict_raw = await asyncio.to_thread(summarizer.summarize_with_gpt, full_prompt, content)
-        
-        # 응답이 여러 번 나누어진 경우 리스트로 변환
-        if isinstance(sentdict_raw, str):
-            sentdict_raw = [sentdict_raw]
-        
-        sentdict = parse_response(sentdict_raw)
-
+        summarizer = summarizer or NewsSummarizer()
+        sentdict = None
+        if sentdict_raw is not None:
+            # 배치로 받아 둔 응답: 스키마에 맞으면 그대로 쓰고, 아니면 온라인으로 다시 요청
+            sentdict = parse_response(sentdict_raw)
+            if sentdict is not None:
+                summarizer.remember_raw(prompt, content, sentdict_raw, keywords)
+                summarizer.remember_fields(prompt, content, sentdict, keywords)
         if sentdict is None:
-            raise ValueError("GPT 응답을 파싱할 수 없습니다.")
-
-        is_related = sentdict.get('is_related', False)
-        label = sentdict.get('label')
-        summary = sentdict.get('summary')
-
-        if label is None or summary is None:
-            raise ValueError("GPT 응답에 필수 필드가 없습니다.")
-
-        return is_related, label, summary
+            # 키워드는 프롬프트 뒤에 붙여서 전송
+            sentdict = await summarizer.aanalyze(prompt, content, keywords)
+        return sentdict['is_related'], sentdict['label'], sentdict['summary']
     except Exception as e:
         print(f"Error in process_content_with_prompt: {str(e)}")
         print(f"Content: {content[:100]}...")  # 첫 100자만 로깅
         return False, "False", "요약 실패"
 
-async def summarize_news_from_excel(input_file, output_file, prompt, file_prefix):
-    df = pd.read_excel(input_file)
+async def summarize_news_from_excel(input_file, output_file, prompt, file_prefix, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                                    mode="online", batch_state=None):
+    df = read_frame(input_file)
     df  = df.drop_duplicates(subset='본문').reset_index(drop=True)
     labels, summarys, is_relateds = [None]*len(df), [None]*len(df), [None]*len(df)
+    summarizer = NewsSummarizer()
+    # online 모드는 작은 모델이 먼저 판단하고 필요한 기사만 큰 모델로 넘김 (batch/pack은 큰 모델 그대로)
+    cascade = make_cascade() if mode == "online" else None
+    # 고정 크기 묶음 대신 세마포어로 동시 요청 수만 제한 (하나가 끝나면 바로 다음 요청 시작)
+    semaphore = asyncio.Semaphore(max_in_flight)
+    batch_results = {}
+    # 긴 기사는 프롬프트 + 본문이 토큰 예산을 넘지 않도록 줄여서 보냄 (저장되는 본문은 원문 그대로)
+    budgeter = TokenBudgeter("summary", model=summarizer.model)
+    # 재전송/살짝 고친 기사는 묶음마다 대표 기사 하나만 요약하고 결과를 나머지에 복사
+    grouper = make_grouper()
+    dup_groups = grouper.group(df['본문']) if grouper is not None else list(range(len(df)))
+    duplicates = {i: rep for i, rep in enumerate(dup_groups) if rep != i}
+    # 로컬 사전 분류기가 확실히 관련 없다고 보는 기사는 LLM을 부르지 않음
+    prefiltered = {}
+    preclassifier = load_preclassifier(file_prefix)
+    if preclassifier is not None:
+        candidates = df[df['본문'].notna() & ~df.index.isin(list(duplicates))]
+        for i, skip in zip(candidates.index, preclassifier.skip_mask(candidates)):
+            if skip:
+                prefiltered[i] = preclassifier.skipped_fields()
+    texts = {}
+    for i, row in df.iterrows():
+        if pd.notna(row['본문']) and i not in prefiltered and i not in duplicates:
+            keywords = row['키워드'] if '키워드' in row else ""
+            texts[i] = budgeter.fit(row['본문'], f"{prompt}\n\n관련 키워드: {keywords}")
+
+    start = time.perf_counter()
+    if mode == "batch":
+        # 캐시에 없는 행만 배치로 보내고, 배치에서 빠진 행은 아래에서 온라인으로 처리
+        jobs = []
+        for i, row in df.iterrows():
+            keywords = row['키워드'] if '키워드' in row else ""
+            if i in texts and not summarizer.is_cached(prompt, texts[i], keywords):
+                jobs.append((i, texts[i], keywords))
+        batch_results = await asyncio.to_thread(run_batch, jobs, summarizer, prompt, batch_state)
+
+    packed_results = {}
+    if mode == "pack":
+        # 캐시에 없는 행을 토큰 예산 안에서 여러 건씩 묶어 한 요청으로 보냄 (id = 행 번호)
+        pending = []
+        for i, row in df.iterrows():
+            keywords = row['키워드'] if '키워드' in row else ""
+            if i in texts and not summarizer.is_cached(prompt, texts[i], keywords):
+                pending.append((i, texts[i], keywords))
+        packs = pack_by_tokens(pending, PACK_MAX_TOKENS, overhead=count_tokens(prompt, summarizer.model),
+                               max_items=PACK_MAX_ITEMS, model=summarizer.model)
+        print(f"📦 {len(pending)}건을 {len(packs)}개 요청으로 묶어 보냅니다.")
+
+        async def process_pack(pack):
+            async with semaphore:
+                results = await summarizer.apack_analyze(prompt, pack)
+            packed_results.update({int(article_id): fields for article_id, fields in results.items()})
+
+        await asyncio.gather(*(process_pack(pack) for pack in packs))
 
     async def process_row(i, text, keywords, file_prefix):
-        print(f"Processing article {i+1}/{len(df)}...")
-        try:
-            is_related, label, summary = await process_content_with_prompt(text, keywords, prompt)
-            if is_related is None or label is None or summary is None:
-                raise ValueError("GPT 응답이 올바르지 않습니다.")
-            
-            is_relateds[i] = is_related if file_prefix == "cnews" else None
-            labels[i] = label
-            summarys[i] = summary
-        except Exception as e:
-            print(f"Error processing row {i+1}: {str(e)}")
-            is_relateds[i] = None
-            labels[i] = "오류"
-            summarys[i] = "요약 실패"
+        async with semaphore:
+            print(f"Processing article {i+1}/{len(df)}...")
+            try:
+                if i in packed_results:
+                    sentdict = packed_results[i]
+                    is_related, label, summary = sentdict['is_related'], sentdict['label'], sentdict['summary']
+                else:
+                    is_related, label, summary = await process_content_with_prompt(
+                        text, keywords, prompt, cascade or summarizer, batch_results.get(i))
+                if is_related is None or label is None or summary is None:
+                    raise ValueError("GPT 응답이 올바르지 않습니다.")
+
+                is_relateds[i] = is_related if file_prefix == "cnews" else None
+                labels[i] = label
+                summarys[i] = summary
+            except Exception as e:
+                print(f"Error processing row {i+1}: {str(e)}")
+                is_relateds[i] = None
+                labels[i] = "오류"
+                summarys[i] = "요약 실패"
 
     tasks = []
     for i, row in df.iterrows():
-        text = row['본문']
         keywords = row['키워드'] if '키워드' in row else ""
-        if pd.notna(text):
-            tasks.append(process_row(i, text, keywords, file_prefix))
+        if i in texts:
+            tasks.append(process_row(i, texts[i], keywords, file_prefix))
+        elif i in prefiltered:
+            is_relateds[i] = prefiltered[i]['is_related'] if file_prefix == "cnews" else None
+            labels[i] = prefiltered[i]['label']
+            summarys[i] = prefiltered[i]['summary']
+        elif i in duplicates:
+            continue  # 대표 기사 결과가 나오면 아래에서 복사
         else:
             is_relateds[i] = None
             labels[i] = None
-            summarys[i] = None 
-
-        # 10개씩 실행 후 기다림
-        if len(tasks) == 100:
-            await asyncio.gather(*tasks)
-            tasks = []
+            summarys[i] = None
 
+    # 결과는 행 번호 자리에 채우므로 끝나는 순서와 상관없이 행 순서가 유지됨
+    await asyncio.gather(*tasks)
+    for i, rep in duplicates.items():
+        is_relateds[i], labels[i], summarys[i] = is_relateds[rep], labels[rep], summarys[rep]
+    elapsed = time.perf_counter() - start
     if tasks:
-        await asyncio.gather(*tasks)
+        print(f"⏱️ [{mode}] {len(tasks)}건 요약 {elapsed:.1f}초 (동시 요청 최대 {max_in_flight}개, {len(tasks) / elapsed:.2f}건/초)")
+    if mode == "pack":
+        print(f"📦 묶음 요청: {get_pack_stats().stats()}")
+    if cascade is not None:
+        print(f"🪜 2단계 모델 ({cascade.small.model} → {cascade.large.model}): {get_cascade_stats().stats()}")
+
+    budgeter.report()
+    if grouper is not None:
+        print(f"🪞 근접 중복: {grouper.stats()}")
+    if preclassifier is not None:
+        print(f"🧮 사전 분류기: {preclassifier.stats()}")
+    print(f"🧾 응답 파싱: {get_parse_stats().stats()}")
+    print(f"🧷 프롬프트 캐시: {get_prompt_cache_stats().stats()}")
+    if summarizer.cache is not None:
+        print(f"🗃️ LLM 캐시: {summarizer.cache.stats()}")
+        summarizer.cache.evict()
 
     df['summary'] = summarys
     df['label'] = labels
     if file_prefix == "cnews":
         df['is_related'] = is_relateds
-    df.to_excel(output_file, index=False)
+    df['dup_group'] = dup_groups
+    save_frame(df, output_file)
+    if mode == "batch":
+        finish_batch(batch_state)
     print(f"요약이 완료되었습니다. 결과는 {output_file}에 저장되었습니다.")
 
 async def main():
-    print("\n📄 사용법: python summarize_from_excel.py [health|cnews] [날짜: YYYYMMDD]")
-
-    if len(sys.argv) != 3:
+    print("\n📄 사용법: python run_summarizer.py [health|cnews] [날짜: YYYYMMDD] [동시 요청 수(선택)] [--mode online|batch|pack]")
+
+    args = sys.argv[1:]
+    mode = "online"
+    if "--mode" in args:
+        idx = args.index("--mode")
+        mode = args[idx + 1] if idx + 1 < len(args) else ""
+        del args[idx:idx + 2]
+    if len(args) not in (2, 3) or mode not in ("online", "batch", "pack"):
         print("\n❗ 인자 오류: 파일 접두사와 날짜를 정확히 입력해 주세요.")
         return
 
-    file_prefix = sys.argv[1]
-    date_str = sys.argv[2]
+    file_prefix = args[0]
+    date_str = args[1]
+    max_in_flight = int(args[2]) if len(args) == 3 else DEFAULT_MAX_IN_FLIGHT
 
     print(f"\n🔍 처리 중인 파일 정보:")
     print(f" - 카테고리 : {file_prefix}")
     print(f" - 날짜     : {date_str}")
+    print(f" - 모드     : {mode}")
 
     try:
-        with open(f"../prompt/{file_prefix}_summary.txt", 'r', encoding='utf-8') as file:
-            prompt = file.read()
+        prompt = get_prompt_registry().get(f"{file_prefix}_summary.txt")
     except FileNotFoundError:
-        print(f"\n🚫 프롬프트 파일을 찾을 수 없습니다: ../prompt/{file_prefix}_summary.py\n")
+        print(f"\n🚫 프롬프트 파일을 찾을 수 없습니다: {os.path.join(PROMPT_DIR, f'{file_prefix}_summary.txt')}\n")
         return
 
-    data_directory = "../data/"
-    input_path = f"{data_directory}{file_prefix}_{date_str}_naver.xlsx"
-    output_path = f"{data_directory}{file_prefix}_{date_str}_summary.xlsx"
+    input_path = find_stage_file(file_prefix, date_str, "naver")
+    output_path = stage_path(file_prefix, date_str, "summary")
+    if input_path is None:
+        print(f"\n🚫 입력 파일을 찾을 수 없습니다: {stage_path(file_prefix, date_str, 'naver')}\n")
+        return
 
     print(f"\n📂 입력 파일 경로 : {input_path}")
     print(f"📁 출력 파일 경로 : {output_path}\n")
 
-    await summarize_news_from_excel(input_path, output_path, prompt, file_prefix)
+    await summarize_news_from_excel(input_path, output_path, prompt, file_prefix, max_in_flight,
+                                    mode, batch_state_path(file_prefix, date_str))
 
     print("\n✅ 뉴스 요약 완료!\n")
 
@@ -1,34 +1,679 @@
 # summary/summarizer.py
 import os
-import openai
+import re
 import sys
+import json
+import math
+import time
+import asyncio
+import openai
+import threading
+from collections import deque
+from typing import Literal
 from dotenv import load_dotenv
+from pydantic import BaseModel, ValidationError
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.llm_cache import get_llm_cache, make_key
+from utils.token_budget import count_tokens
 
 load_dotenv()
 
-class NewsSummarizer:
+MODEL = "gpt-4o"
+SYSTEM_PROMPT = "You are a helpful assistant that summarizes news articles. You must respond in JSON format only."
+FAILED_RESPONSE = "{\"is_related\": false, \"label\": \"False\", \"summary\": \"요약 실패\"}"
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv("NEWSBOT_MAX_IN_FLIGHT", "20"))  # 동시에 보낼 최대 요청 수
+SCHEMA_RETRIES = 1  # 응답이 스키마에 맞지 않을 때만 다시 요청하는 횟수
+LABELS = ("True", "False", "Positive", "Negative", "Neutral")
+FAILED_FIELDS = {'is_related': False, 'label': 'Neutral', 'summary': '요약 실패'}
+
+# 2단계 모델 분석(cascade): 작은 모델이 먼저 판단하고, 관련 있는 부정 기사나 확신도가 낮은 기사만 큰 모델로 넘김
+#   NEWSBOT_CASCADE                : 1이면 작은 모델이 먼저 판단 (기본 0: 모든 기사를 큰 모델(MODEL)로 바로 보냄)
+#   NEWSBOT_CASCADE_MODEL          : 1단계 모델 (기본 gpt-4o-mini)
+#   NEWSBOT_CASCADE_MIN_CONFIDENCE : 1단계 판단 확신도가 이보다 낮으면 큰 모델로 넘김 (기본 0.8)
+#   NEWSBOT_CASCADE_ESCALATE       : 관련 있는 기사 중 큰 모델로 넘길 감정 (쉼표 구분, 기본 Negative)
+CASCADE_SMALL_MODEL = "gpt-4o-mini"
+CASCADE_MIN_CONFIDENCE = 0.8
+CASCADE_ESCALATE_LABELS = ("Negative",)
+
+
+class ArticleAnalysis(BaseModel):
+    is_related: bool
+    label: Literal["True", "False", "Positive", "Negative", "Neutral"]
+    summary: str
+
+
+# OpenAI structured outputs(strict)용 JSON 스키마: 모델이 이 형식으로만 답하게 강제
+RESPONSE_SCHEMA_NAME = "article_analysis"
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": RESPONSE_SCHEMA_NAME,
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "is_related": {"type": "boolean"},
+                "label": {"type": "string", "enum": list(LABELS)},
+                "summary": {"type": "string"},
+            },
+            "required": ["is_related", "label", "summary"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+# 여러 기사를 한 요청에 묶어 보낼 때(pack 모드) 쓰는 설정과 응답 스키마
+PACK_MAX_TOKENS = 6000          # 묶음 하나의 입력 토큰 상한 (프롬프트 포함)
+PACK_MAX_ITEMS = 8              # 묶음 하나에 넣을 최대 기사 수
+PACK_TOKENS_PER_ITEM = 200      # 기사 하나당 응답 토큰 여유분
+PACK_INSTRUCTION = ("아래에 기사 여러 건이 [기사 id=...] 형식으로 이어집니다. 각 기사를 위 기준으로 따로 판단해서 "
+                    "items 배열에 기사마다 id와 결과를 하나씩 넣어 주세요. 기사를 빠뜨리거나 합치지 마세요.")
+PACKED_RESPONSE_SCHEMA_NAME = "article_analysis_list"
+PACKED_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": PACKED_RESPONSE_SCHEMA_NAME,
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "items": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "string"},
+                            **RESPONSE_FORMAT["json_schema"]["schema"]["properties"],
+                        },
+                        "required": ["id", "is_related", "label", "summary"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["items"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+class PackedArticleAnalysis(ArticleAnalysis):
+    id: str
+
+
+class ParseStats:
+    """
+    응답 파싱 결과 집계: ok(스키마 그대로 통과), repaired(예전 형식 응답을 고쳐서 통과),
+    retried(스키마 실패로 다시 요청), failed(끝내 실패), api_error(API 호출 자체 실패).
+    """
+
     def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {"ok": 0, "repaired": 0, "retried": 0, "failed": 0, "api_error": 0}
+
+    def record(self, outcome):
+        with self._lock:
+            self.counters[outcome] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        parsed = stats["ok"] + stats["repaired"] + stats["failed"]
+        stats["failure_rate"] = round(stats["failed"] / parsed, 3) if parsed else 0.0
+        return stats
+
+
+_parse_stats = ParseStats()
+
+
+def get_parse_stats():
+    return _parse_stats
+
+
+class PackStats:
+    """
+    pack 모드 집계: 보낸 묶음 요청 수, 실제 프롬프트 토큰(usage 기준), 같은 기사를 한 건씩 보냈을 때의
+    예상 프롬프트 토큰, 묶음에서 빠지거나 깨져서 한 건씩 다시 보낸 기사 수.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "articles": 0, "prompt_tokens": 0,
+                         "single_prompt_tokens": 0, "split": 0, "fallback": 0}
+
+    def add(self, **values):
+        with self._lock:
+            for key, value in values.items():
+                self.counters[key] += value
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        single = stats["single_prompt_tokens"]
+        stats["prompt_tokens_saved"] = single - stats["prompt_tokens"]
+        stats["saved_ratio"] = round(stats["prompt_tokens_saved"] / single, 3) if single else 0.0
+        return stats
+
+
+_pack_stats = PackStats()
+
+
+def get_pack_stats():
+    return _pack_stats
+
+
+class PromptCacheStats:
+    """
+    API usage의 prompt_tokens_details.cached_tokens 집계: 프롬프트 앞부분이 OpenAI 쪽 캐시에서
+    처리된 토큰 비율(cached_ratio)과 캐시를 한 번이라도 쓴 요청 수(hit_requests).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "hit_requests": 0, "prompt_tokens": 0, "cached_tokens": 0}
+
+    def record(self, usage):
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None) or 0
+        with self._lock:
+            self.counters["requests"] += 1
+            self.counters["hit_requests"] += cached_tokens > 0
+            self.counters["prompt_tokens"] += prompt_tokens
+            self.counters["cached_tokens"] += cached_tokens
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        stats["cached_ratio"] = round(stats["cached_tokens"] / stats["prompt_tokens"], 3) if stats["prompt_tokens"] else 0.0
+        return stats
+
+
+_prompt_cache_stats = PromptCacheStats()
+
+
+def get_prompt_cache_stats():
+    return _prompt_cache_stats
+
+
+def instruction_message(user_message):
+    # 시스템 프롬프트 + 작업 프롬프트: 모든 요청에서 똑같은 앞부분이라 OpenAI 프롬프트 캐시에 걸림
+    return f"{SYSTEM_PROMPT}\n\n{user_message}"
+
+
+def article_message(text, keywords=None):
+    # 요청마다 달라지는 부분(키워드, 본문)은 맨 뒤에 둠
+    if keywords:
+        return f"관련 키워드: {keywords}\n\n본문: {text}"
+    return f"본문: {text}"
+
+
+def parse_packed_response(response, article_ids):
+    """
+    묶음 응답에서 기사별 결과를 꺼내 {id: dict}로 돌려줍니다.
+    스키마에 맞지 않는 항목, 모르는 id, 중복 id는 버립니다 (호출한 쪽에서 한 건씩 다시 요청).
+    """
+    try:
+        items = json.loads(response).get("items")
+    except (TypeError, ValueError, AttributeError):
+        return {}
+    results = {}
+    for item in items if isinstance(items, list) else []:
+        try:
+            parsed = PackedArticleAnalysis.model_validate(item)
+        except ValidationError:
+            continue
+        if parsed.id in article_ids and parsed.id not in results:
+            results[parsed.id] = parsed.model_dump(exclude={"id"})
+    return results
+
+
+def _repair_legacy(response):
+    # 스키마 강제 전에 캐시된 응답이나 다른 엔드포인트의 응답: 코드 블록/따옴표/불리언 표기를 정리
+    response = response.strip()
+    if '```' in response:
+        response = response.split('```json')[-1].split('```')[0]
+    start, end = response.find('{'), response.rfind('}')
+    if start == -1 or end == -1:
+        raise ValueError("JSON 객체를 찾을 수 없습니다.")
+    response = response[start:end + 1]
+    response = re.sub(r'\bTrue\b', 'true', re.sub(r'\bFalse\b', 'false', response))
+    result = json.loads(response)
+    if isinstance(result.get('label'), bool):
+        result['label'] = 'True' if result['label'] else 'False'
+    elif result.get('label') not in LABELS:
+        result['label'] = 'False'
+    result.setdefault('is_related', False)
+    return ArticleAnalysis.model_validate(result)
+
+
+def parse_response(response):
+    """
+    모델 응답을 {is_related, label, summary} dict로 검증해서 돌려줍니다. 스키마에 맞지 않으면 None.
+    """
+    if isinstance(response, list):
+        response = "".join(response)
+    try:
+        result = ArticleAnalysis.model_validate_json(response)
+        get_parse_stats().record("ok")
+    except ValidationError:
+        try:
+            result = _repair_legacy(response)
+            get_parse_stats().record("repaired")
+        except (ValueError, ValidationError):
+            get_parse_stats().record("failed")
+            print(f"⚠️ 응답이 스키마에 맞지 않습니다: {response[:200]}")
+            return None
+    return result.model_dump()
+
+
+_async_client = None
+_async_client_lock = threading.Lock()
+
+
+def get_async_client():
+    """
+    프로세스 전체에서 공유하는 AsyncOpenAI 클라이언트를 돌려줍니다 (처음 호출할 때 생성).
+    같은 커넥션 풀을 계속 쓰므로 요청마다 클라이언트를 만들 필요가 없습니다.
+    """
+    global _async_client
+    if _async_client is None:
+        with _async_client_lock:
+            if _async_client is None:
+                _async_client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _async_client
+
+
+class NewsSummarizer:
+    def __init__(self, model=MODEL, use_cache=True, schema_retries=SCHEMA_RETRIES):
         self.api_key = os.getenv("OPENAI_API_KEY")
         openai.api_key = self.api_key
+        self.model = model
+        self.schema_retries = schema_retries
+        self.cache = get_llm_cache() if use_cache else None
+
+    def build_request(self, user_message, text, keywords=None, structured=False, logprobs=False):
+        request = dict(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": instruction_message(user_message)},
+                {"role": "user", "content": article_message(text, keywords)}
+            ],
+            max_tokens=500,
+            n=1,
+            stop=None,
+            temperature=0.5,
+        )
+        if structured:
+            request["response_format"] = RESPONSE_FORMAT
+        if logprobs:
+            request["logprobs"] = True
+        return request
+
+    def cache_key(self, user_message, text, keywords=None, structured=True):
+        system = SYSTEM_PROMPT + (RESPONSE_SCHEMA_NAME if structured else "")
+        return make_key(self.model, system, user_message, keywords or "", text)
+
+    def cached_fields(self, user_message, text, keywords=None):
+        """
+        같은 요청의 파싱된 결과가 캐시에 있으면 돌려주고, 없으면 None을 돌려줍니다.
+        """
+        if self.cache is None:
+            return None
+        entry = self.cache.lookup(self.cache_key(user_message, text, keywords), count=False)
+        if entry is None or entry.parsed is None:
+            return None
+        self.cache.hits += 1
+        return entry.parsed
+
+    def remember_fields(self, user_message, text, parsed, keywords=None):
+        if self.cache is not None and parsed.get('summary') != '요약 실패':
+            self.cache.store_parsed(self.cache_key(user_message, text, keywords), parsed)
+
+    def is_cached(self, user_message, text, keywords=None):
+        return self.cache is not None and \
+            self.cache.lookup(self.cache_key(user_message, text, keywords), count=False) is not None
+
+    def remember_raw(self, user_message, text, raw, keywords=None):
+        self._remember_raw(self.cache_key(user_message, text, keywords), user_message, raw)
 
-    def summarize_with_gpt(self, user_message, text):
+    def _cached_raw(self, key):
+        if self.cache is None:
+            return None
+        entry = self.cache.lookup(key)
+        return entry.raw if entry is not None else None
+
+    def _remember_raw(self, key, user_message, raw):
+        if self.cache is not None:
+            self.cache.store(key, self.model, user_message, raw)
+
+    def summarize_with_gpt(self, user_message, text, keywords=None, structured=False, use_cache=True):
+        key = self.cache_key(user_message, text, keywords, structured)
+        cached = self._cached_raw(key) if use_cache else None
+        if cached is not None:
+            return cached
         try:
             response = openai.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that summarizes news articles. You must respond in JSON format only."},
-                    {"role": "user", "content": f"{user_message}\n\n본문: {text}"}
-                ],
-                max_tokens=500,
-                n=1,
-                stop=None,
-                temperature=0.5,
-            )
+                **self.build_request(user_message, text, keywords, structured))
+            get_prompt_cache_stats().record(getattr(response, "usage", None))
+            summary = response.choices[0].message.content.strip()
+            self._remember_raw(key, user_message, summary)
+            return summary
+        except Exception as e:
+            print("GPT 요약 오류:", e)
+            return FAILED_RESPONSE
+
+    async def asummarize_with_gpt(self, user_message, text, keywords=None, structured=False, use_cache=True):
+        """
+        summarize_with_gpt의 비동기 버전. 공유 AsyncOpenAI 클라이언트로 바로 호출합니다.
+        """
+        key = self.cache_key(user_message, text, keywords, structured)
+        cached = self._cached_raw(key) if use_cache else None
+        if cached is not None:
+            return cached
+        try:
+            response = await get_async_client().chat.completions.create(
+                **self.build_request(user_message, text, keywords, structured))
+            get_prompt_cache_stats().record(getattr(response, "usage", None))
             summary = response.choices[0].message.content.strip()
+            self._remember_raw(key, user_message, summary)
             return summary
         except Exception as e:
             print("GPT 요약 오류:", e)
-            return "{\"is_related\": false, \"label\": \"False\", \"summary\": \"요약 실패\"}"
+            return FAILED_RESPONSE
+
+    def _finish(self, user_message, text, keywords, raw, attempt):
+        """
+        응답 하나를 검증합니다. 결과 dict, 또는 스키마 재시도가 필요하면 None을 돌려줍니다.
+        """
+        if raw == FAILED_RESPONSE:
+            # API 오류는 SDK가 이미 재시도했으므로 스키마 재시도 대상이 아님
+            get_parse_stats().record("api_error")
+            return dict(FAILED_FIELDS)
+        fields = parse_response(raw)
+        if fields is not None:
+            self.remember_fields(user_message, text, fields, keywords)
+            return fields
+        if attempt == self.schema_retries:
+            return dict(FAILED_FIELDS)
+        get_parse_stats().record("retried")
+        return None
+
+    def analyze(self, user_message, text, keywords=None):
+        """
+        기사 하나를 스키마({is_related, label, summary})에 맞춰 분석해 dict로 돌려줍니다.
+        응답이 스키마에 맞지 않을 때만 schema_retries번까지 다시 요청합니다.
+        """
+        fields = self.cached_fields(user_message, text, keywords)
+        if fields is not None:
+            return fields
+        for attempt in range(self.schema_retries + 1):
+            raw = self.summarize_with_gpt(user_message, text, keywords, structured=True, use_cache=attempt == 0)
+            fields = self._finish(user_message, text, keywords, raw, attempt)
+            if fields is not None:
+                return fields
+
+    async def aanalyze(self, user_message, text, keywords=None):
+        """
+        analyze의 비동기 버전.
+        """
+        fields = self.cached_fields(user_message, text, keywords)
+        if fields is not None:
+            return fields
+        for attempt in range(self.schema_retries + 1):
+            raw = await self.asummarize_with_gpt(user_message, text, keywords, structured=True,
+                                                 use_cache=attempt == 0)
+            fields = self._finish(user_message, text, keywords, raw, attempt)
+            if fields is not None:
+                return fields
+
+    def _scored_fields(self, user_message, text, keywords, response):
+        get_prompt_cache_stats().record(getattr(response, "usage", None))
+        choice = response.choices[0]
+        raw = choice.message.content
+        fields = parse_response(raw.strip())
+        if fields is None:
+            # 스키마가 깨진 응답은 확신도 0으로 보고 큰 모델에 맡김 (1단계에서는 다시 요청하지 않음)
+            return dict(FAILED_FIELDS, confidence=0.0)
+        logprobs = getattr(getattr(choice, "logprobs", None), "content", None)
+        fields["confidence"] = decision_confidence(raw, logprobs)
+        self.remember_raw(user_message, text, raw.strip(), keywords)
+        self.remember_fields(user_message, text, fields, keywords)
+        return fields
+
+    def score(self, user_message, text, keywords=None):
+        """
+        analyze와 같지만 logprobs로 구한 판단 확신도(confidence)를 결과에 함께 담습니다.
+        확신도를 알 수 없으면(logprobs 미지원) confidence는 None입니다.
+        """
+        fields = self.cached_fields(user_message, text, keywords)
+        if fields is not None:
+            return fields
+        try:
+            response = openai.chat.completions.create(
+                **self.build_request(user_message, text, keywords, structured=True, logprobs=True))
+        except Exception as e:
+            print("GPT 요약 오류:", e)
+            get_parse_stats().record("api_error")
+            return dict(FAILED_FIELDS, confidence=0.0)
+        return self._scored_fields(user_message, text, keywords, response)
+
+    async def ascore(self, user_message, text, keywords=None):
+        """
+        score의 비동기 버전.
+        """
+        fields = self.cached_fields(user_message, text, keywords)
+        if fields is not None:
+            return fields
+        try:
+            response = await get_async_client().chat.completions.create(
+                **self.build_request(user_message, text, keywords, structured=True, logprobs=True))
+        except Exception as e:
+            print("GPT 요약 오류:", e)
+            get_parse_stats().record("api_error")
+            return dict(FAILED_FIELDS, confidence=0.0)
+        return self._scored_fields(user_message, text, keywords, response)
+
+    def build_packed_request(self, user_message, articles):
+        parts = [f"[기사 id={article_id}]\n{article_message(text, keywords)}" for article_id, text, keywords in articles]
+        return dict(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": instruction_message(f"{user_message}\n\n{PACK_INSTRUCTION}")},
+                {"role": "user", "content": "\n\n".join(parts)}
+            ],
+            max_tokens=PACK_TOKENS_PER_ITEM * len(articles),
+            n=1,
+            stop=None,
+            temperature=0.5,
+            response_format=PACKED_RESPONSE_FORMAT,
+        )
+
+    def _request_tokens(self, request):
+        return sum(count_tokens(message["content"], self.model) for message in request["messages"])
+
+    def _single_prompt_tokens(self, user_message, articles):
+        return sum(self._request_tokens(self.build_request(user_message, text, keywords))
+                   for _, text, keywords in articles)
+
+    async def apack_analyze(self, user_message, articles):
+        """
+        [(id, 본문, 키워드)] 여러 건을 한 요청으로 분석해 {id: dict}를 돌려줍니다.
+
+        묶음 전체가 깨지면 반으로 나눠 다시 보내고, 일부 기사만 빠지거나 깨지면
+        그 기사만 aanalyze로 한 건씩 다시 요청합니다. 결과는 기사별 캐시에도 저장합니다.
+        """
+        article_ids = {str(article_id) for article_id, _, _ in articles}
+        request = self.build_packed_request(user_message, articles)
+        raw = None
+        try:
+            response = await get_async_client().chat.completions.create(**request)
+            raw = response.choices[0].message.content.strip()
+            usage = getattr(response, "usage", None)
+            get_prompt_cache_stats().record(usage)
+            prompt_tokens = getattr(usage, "prompt_tokens", None) or self._request_tokens(request)
+            get_pack_stats().add(requests=1, articles=len(articles), prompt_tokens=prompt_tokens,
+                                 single_prompt_tokens=self._single_prompt_tokens(user_message, articles))
+        except Exception as e:
+            print("GPT 묶음 요약 오류:", e)
+
+        results = parse_packed_response(raw, article_ids) if raw else {}
+        if not results and len(articles) > 1:
+            get_pack_stats().add(split=1)
+            half = len(articles) // 2
+            for part in await asyncio.gather(self.apack_analyze(user_message, articles[:half]),
+                                             self.apack_analyze(user_message, articles[half:])):
+                results.update(part)
+            return results
+
+        for article_id, text, keywords in articles:
+            key = str(article_id)
+            if key in results:
+                fields = results[key]
+                self.remember_raw(user_message, text, json.dumps(fields, ensure_ascii=False), keywords)
+                self.remember_fields(user_message, text, fields, keywords)
+            else:
+                get_pack_stats().add(fallback=1)
+                results[key] = await self.aanalyze(user_message, text, keywords)
+        return results
+
+def decision_confidence(raw, logprobs):
+    """
+    응답에서 is_related 값과 label 값을 이루는 토큰들의 확률 곱을 돌려줍니다. logprobs가 없으면 None.
+    """
+    if not logprobs:
+        return None
+    spans = [m.span(1) for m in re.finditer(r'"(?:is_related|label)"\s*:\s*"?([A-Za-z]+)', raw)]
+    if not spans:
+        return None
+    offset, total = 0, 0.0
+    for token in logprobs:
+        start, end = offset, offset + len(token.token)
+        offset = end
+        if any(start < span_end and end > span_start for span_start, span_end in spans):
+            total += token.logprob
+    return round(math.exp(total), 4)
+
+
+class CascadeStats:
+    """
+    단계별 처리 건수와 지연 시간(최근 LATENCY_WINDOW건 기준 중앙값/p90), 큰 모델로 넘긴 이유별 건수.
+    total은 기사 하나를 끝까지 처리하는 데 걸린 시간입니다.
+    """
+    LATENCY_WINDOW = 10000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {"small": 0, "large": 0, "total": 0}
+        self.latencies = {tier: deque(maxlen=self.LATENCY_WINDOW) for tier in self.counts}
+        self.escalated = {"label": 0, "low_confidence": 0}
+
+    def record(self, tier, seconds, reason=None):
+        with self._lock:
+            self.counts[tier] += 1
+            self.latencies[tier].append(seconds)
+            if reason is not None:
+                self.escalated[reason] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = {}
+            for tier, count in self.counts.items():
+                values = sorted(self.latencies[tier])
+                stats[tier] = {
+                    "count": count,
+                    "p50_ms": round(values[len(values) // 2] * 1000) if values else 0,
+                    "p90_ms": round(values[int(len(values) * 0.9)] * 1000) if values else 0,
+                }
+            stats["escalated"] = dict(self.escalated)
+            total = self.counts["total"]
+        stats["escalation_rate"] = round(stats["large"]["count"] / total, 3) if total else 0.0
+        return stats
+
+
+_cascade_stats = CascadeStats()
+
+
+def get_cascade_stats():
+    return _cascade_stats
+
+
+class CascadeSummarizer:
+    """
+    작은 모델로 관련성/감정을 먼저 판단하고, 관련 있는 기사 중 escalate_labels 감정이거나
+    판단 확신도가 min_confidence보다 낮은 기사만 큰 모델로 다시 분석합니다.
+    NewsSummarizer의 analyze/aanalyze 자리에 그대로 쓸 수 있습니다.
+
+    Args:
+    small_model (str): 1단계 모델.
+    large_model (str): 큰 모델 (요약 품질이 중요한 기사용).
+    min_confidence (float): 1단계 확신도 기준.
+    escalate_labels (tuple): 큰 모델로 넘길 감정 라벨.
+    """
+
+    def __init__(self, small_model=CASCADE_SMALL_MODEL, large_model=MODEL, min_confidence=CASCADE_MIN_CONFIDENCE,
+                 escalate_labels=CASCADE_ESCALATE_LABELS, use_cache=True):
+        self.small = NewsSummarizer(small_model, use_cache)
+        self.large = NewsSummarizer(large_model, use_cache)
+        self.model = large_model
+        self.cache = self.large.cache
+        self.min_confidence = min_confidence
+        self.escalate_labels = tuple(escalate_labels)
+
+    def escalation_reason(self, fields):
+        if fields.get('is_related') and fields.get('label') in self.escalate_labels:
+            return "label"
+        confidence = fields.get('confidence')
+        if confidence is not None and confidence < self.min_confidence:
+            return "low_confidence"
+        return None
+
+    def _without_confidence(self, fields):
+        return {key: value for key, value in fields.items() if key != 'confidence'}
+
+    def analyze(self, user_message, text, keywords=None):
+        started = time.perf_counter()
+        fields = self.small.score(user_message, text, keywords)
+        get_cascade_stats().record("small", time.perf_counter() - started)
+        reason = self.escalation_reason(fields)
+        if reason is not None:
+            escalated = time.perf_counter()
+            fields = self.large.analyze(user_message, text, keywords)
+            get_cascade_stats().record("large", time.perf_counter() - escalated, reason)
+        get_cascade_stats().record("total", time.perf_counter() - started)
+        return self._without_confidence(fields)
+
+    async def aanalyze(self, user_message, text, keywords=None):
+        started = time.perf_counter()
+        fields = await self.small.ascore(user_message, text, keywords)
+        get_cascade_stats().record("small", time.perf_counter() - started)
+        reason = self.escalation_reason(fields)
+        if reason is not None:
+            escalated = time.perf_counter()
+            fields = await self.large.aanalyze(user_message, text, keywords)
+            get_cascade_stats().record("large", time.perf_counter() - escalated, reason)
+        get_cascade_stats().record("total", time.perf_counter() - started)
+        return self._without_confidence(fields)
+
+
+def make_cascade(use_cache=True):
+    """
+    NEWSBOT_CASCADE=1로 켠 경우에만 환경변수 설정으로 CascadeSummarizer를, 아니면 None을 돌려줍니다.
+    (기본은 꺼짐: 켜면 대부분의 기사가 작은 모델로 처리되므로, 품질을 확인한 배포에서만 켬)
+    """
+    if os.getenv("NEWSBOT_CASCADE", "0").lower() in ("0", "false", "no"):
+        return None
+    labels = os.getenv("NEWSBOT_CASCADE_ESCALATE", ",".join(CASCADE_ESCALATE_LABELS))
+    return CascadeSummarizer(
+        small_model=os.getenv("NEWSBOT_CASCADE_MODEL", CASCADE_SMALL_MODEL),
+        large_model=MODEL,
+        min_confidence=float(os.getenv("NEWSBOT_CASCADE_MIN_CONFIDENCE", str(CASCADE_MIN_CONFIDENCE))),
+        escalate_labels=tuple(label.strip() for label in labels.split(",") if label.strip()),
+        use_cache=use_cache,
+    )
+
 
 def read_prompt_from_file(file_path):
     try:
@@ -0,0 +1,140 @@
+# article_registry.py
+# 실시간 루프가 이미 본/처리한/알림 보낸 기사를 기록하는 SQLite 레지스트리
+# (processed_links.json, sent_articles.json 대체)
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+DEFAULT_RETENTION_DAYS = 30
+
+
+class ArticleRegistry:
+    """
+    URL을 기본키로 최초 발견/처리/알림 시각을 저장하는 레지스트리.
+
+    URL 조회는 기본키 B-tree 인덱스를 타므로 O(log n)이고, 파일 전체를 다시 쓰지 않습니다.
+    WAL 모드 + busy timeout이라 여러 프로세스가 같은 파일에 동시에 써도 안전합니다.
+
+    Args:
+    path (str): SQLite 파일 경로.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                url TEXT PRIMARY KEY,
+                first_seen REAL NOT NULL,
+                processed_at REAL,
+                notified_at REAL
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_first_seen ON articles (first_seen)")
+
+    def _write(self, sql, rows):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(sql, rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _filter(self, urls, column):
+        urls = list(dict.fromkeys(u for u in urls if u))
+        if not urls:
+            return []
+        found = set()
+        with self._lock:
+            # SQLite 바인딩 변수 개수 제한을 넘지 않도록 나눠서 조회
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT url FROM articles WHERE url IN ({placeholders}) AND {column} IS NOT NULL", chunk
+                ).fetchall()
+                found.update(row[0] for row in rows)
+        return [u for u in urls if u not in found]
+
+    def filter_unprocessed(self, urls):
+        return self._filter(urls, "processed_at")
+
+    def filter_unnotified(self, urls):
+        return self._filter(urls, "notified_at")
+
+    def is_processed(self, url):
+        return not self.filter_unprocessed([url])
+
+    def is_notified(self, url):
+        return not self.filter_unnotified([url])
+
+    def mark_seen(self, urls, at=None):
+        at = at or time.time()
+        self._write("INSERT INTO articles (url, first_seen) VALUES (?, ?) ON CONFLICT(url) DO NOTHING",
+                    [(u, at) for u in urls if u])
+
+    def mark_processed(self, urls, at=None):
+        at = at or time.time()
+        self._write("INSERT INTO articles (url, first_seen, processed_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(url) DO UPDATE SET processed_at = excluded.processed_at",
+                    [(u, at, at) for u in urls if u])
+
+    def mark_notified(self, urls, at=None):
+        at = at or time.time()
+        self._write("INSERT INTO articles (url, first_seen, processed_at, notified_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(url) DO UPDATE SET notified_at = excluded.notified_at, "
+                    "processed_at = COALESCE(articles.processed_at, excluded.processed_at)",
+                    [(u, at, at, at) for u in urls if u])
+
+    def prune(self, retention_days=DEFAULT_RETENTION_DAYS):
+        """
+        최초 발견 후 retention_days가 지난 기사를 지우고 지운 개수를 돌려줍니다.
+        """
+        cutoff = time.time() - retention_days * 24 * 60 * 60
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM articles WHERE first_seen < ?", (cutoff,))
+        return cursor.rowcount
+
+    def urls(self, notified=False):
+        column = "notified_at" if notified else "processed_at"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT url FROM articles WHERE {column} IS NOT NULL ORDER BY first_seen").fetchall()
+        return [row[0] for row in rows]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def import_legacy_json(self, json_path, notified=False):
+        """
+        예전 JSON 목록 파일을 한 번만 옮겨 담고, 옮긴 파일은 .migrated로 이름을 바꿉니다.
+        """
+        if not os.path.exists(json_path):
+            return 0
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                urls = json.load(f)
+        except json.JSONDecodeError:
+            urls = []
+        if notified:
+            self.mark_notified(urls)
+        else:
+            self.mark_processed(urls)
+        os.replace(json_path, json_path + ".migrated")
+        print(f"📦 {json_path}에서 {len(urls)}건을 레지스트리로 옮겼습니다.")
+        return len(urls)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,282 @@
+# dedup.py
+# 오래 도는 실시간 루프용 중복 제거기
+#   - windowed : 최근 기사는 정확하게(해시), 오래된 기사는 Bloom 필터로 압축 (메모리 상한 고정)
+#   - registry : SQLite 기사 레지스트리로 정확하게 확인 (디스크 사용)
+
+import os
+import sys
+import math
+import time
+import struct
+import hashlib
+
+MAGIC = b"NBDD"
+VERSION = 1
+DEFAULT_WINDOW = 24 * 60 * 60          # 이 기간 안의 기사는 정확하게 기억
+DEFAULT_ERROR_RATE = 0.001             # 오래된 기사에 대한 목표 오탐률 (전체 세대 합)
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024   # 중복 제거기 전체 메모리 상한 (최근 항목 + Bloom 필터)
+BLOOM_SHARE = 0.25                     # 그중 Bloom 필터 세대에 쓰는 비율 (나머지는 최근 항목)
+DEFAULT_GENERATION_CAPACITY = 50000    # Bloom 필터 한 세대에 넣을 기사 수
+DEFAULT_MAX_EXACT = 200000             # 정확하게 들고 있을 최근 기사 수 상한 (메모리 예산이 더 작으면 그쪽을 따름)
+# 최근 항목 하나의 메모리: 해시 bytes 객체 + 시각 float 객체 (sys.getsizeof로 잰 값)
+RECENT_ITEM_BYTES = sys.getsizeof(bytes(16)) + sys.getsizeof(0.0)
+# dict 슬롯(해시/키/값 포인터 + 인덱스)은 테이블이 갓 커졌을 때 항목당 약 55바이트라서 넉넉히 잡은 추정치
+RECENT_ENTRY_BYTES = RECENT_ITEM_BYTES + 56
+
+
+def _digest(key):
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    __slots__ = ("capacity", "n_bits", "n_hashes", "count", "created_at", "bits")
+
+    def __init__(self, capacity, error_rate, created_at=None):
+        self.capacity = capacity
+        self.n_bits = self.bits_for(capacity, error_rate)
+        self.n_hashes = max(1, int(round(self.n_bits / capacity * math.log(2))))
+        self.count = 0
+        self.created_at = created_at or time.time()
+        self.bits = bytearray((self.n_bits + 7) // 8)
+
+    @staticmethod
+    def bits_for(capacity, error_rate):
+        return max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+
+    def _positions(self, digest):
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.n_bits for i in range(self.n_hashes)]
+
+    def add(self, digest):
+        for pos in self._positions(digest):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, digest):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest))
+
+    @property
+    def full(self):
+        return self.count >= self.capacity
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+
+class WindowedDeduplicator:
+    """
+    시간 창 기반 중복 제거기.
+
+    window 안에 본 기사는 16바이트 해시로 정확하게 기억하고, 창을 벗어난 기사는
+    Bloom 필터 세대로 옮깁니다. max_bytes 중 BLOOM_SHARE는 Bloom 세대, 나머지는 최근 항목 몫이고,
+    최근 항목이 제 몫을 넘으면 오래된 것부터 Bloom으로 옮기고, 세대가 제 몫을 넘으면 가장 오래된
+    세대부터 버리므로 몇 주를 돌아도 메모리가 일정합니다. (아주 오래된 기사는 결국 잊어버림)
+
+    Args:
+    path (str): 저장 파일 경로 (None이면 저장하지 않음).
+    window (float): 정확하게 기억할 기간(초).
+    error_rate (float): Bloom 필터 전체 목표 오탐률.
+    max_bytes (int): 전체 메모리 상한 (최근 항목 + Bloom 필터).
+    generation_capacity (int): Bloom 필터 한 세대의 기사 수.
+    max_exact (int): 정확하게 기억할 기사 수 상한 (넘치면 오래된 것부터 Bloom으로).
+                     최근 항목 몫의 메모리에 RECENT_ENTRY_BYTES로 들어가는 수보다 크면 그 수로 줄입니다.
+    """
+
+    def __init__(self, path=None, window=DEFAULT_WINDOW, error_rate=DEFAULT_ERROR_RATE,
+                 max_bytes=DEFAULT_MAX_BYTES, generation_capacity=DEFAULT_GENERATION_CAPACITY,
+                 max_exact=DEFAULT_MAX_EXACT):
+        self.path = path
+        self.window = window
+        self.error_rate = error_rate
+        self.max_bytes = max_bytes
+        self.generation_capacity = generation_capacity
+        bloom_bytes = int(max_bytes * BLOOM_SHARE)
+        self.recent_budget = max_bytes - bloom_bytes
+        self.max_exact = max(1, min(max_exact, self.recent_budget // RECENT_ENTRY_BYTES))
+        # 세대 수만큼 오탐이 누적되므로 세대별 오탐률을 나눠서 잡고,
+        # 그 크기로도 Bloom 몫 안에 들어가는 세대 수를 찾는다
+        generations = max(1, bloom_bytes // self._generation_bytes(error_rate))
+        while generations > 1 and generations * self._generation_bytes(error_rate / generations) > bloom_bytes:
+            generations -= 1
+        self.max_generations = generations
+        self.generation_error_rate = error_rate / generations
+        self.recent = {}        # digest -> 본 시각 (삽입 순서 = 시간 순서)
+        self.generations = []   # 오래된 세대부터
+
+    def _generation_bytes(self, error_rate):
+        return (BloomFilter.bits_for(self.generation_capacity, error_rate) + 7) // 8
+
+    def _new_generation(self):
+        return BloomFilter(self.generation_capacity, self.generation_error_rate)
+
+    def _spill(self, digest):
+        if not self.generations or self.generations[-1].full:
+            self.generations.append(self._new_generation())
+            if len(self.generations) > self.max_generations:
+                self.generations.pop(0)
+        self.generations[-1].add(digest)
+
+    def expire(self, now=None):
+        """
+        창을 벗어났거나 max_exact를 넘친 최근 항목을 Bloom 세대로 옮깁니다.
+        """
+        now = now or time.time()
+        cutoff = now - self.window
+        while self.recent:
+            digest, seen_at = next(iter(self.recent.items()))
+            if seen_at >= cutoff and len(self.recent) <= self.max_exact:
+                break
+            del self.recent[digest]
+            self._spill(digest)
+        if self._recent_bytes() > self.recent_budget:
+            # 항목을 지워도 dict 테이블은 줄지 않으므로 새로 만들어 줄이고, 그래도 넘치면 오래된 것부터 더 옮김
+            self.recent = dict(self.recent)
+            while self.recent and self._recent_bytes() > self.recent_budget:
+                for digest in list(self.recent)[:max(1, len(self.recent) // 10)]:
+                    del self.recent[digest]
+                    self._spill(digest)
+                self.recent = dict(self.recent)
+
+    def _recent_bytes(self):
+        return sys.getsizeof(self.recent) + len(self.recent) * RECENT_ITEM_BYTES
+
+    def _contains_digest(self, digest):
+        if digest in self.recent:
+            return True
+        return any(digest in generation for generation in reversed(self.generations))
+
+    def __contains__(self, key):
+        return self._contains_digest(_digest(key))
+
+    def add(self, keys, now=None):
+        now = now or time.time()
+        for key in keys:
+            if not key:
+                continue
+            digest = _digest(key)
+            if digest not in self.recent:
+                self.recent[digest] = now
+        self.expire(now)
+
+    def filter_new(self, keys):
+        keys = list(dict.fromkeys(k for k in keys if k))
+        return [k for k in keys if not self._contains_digest(_digest(k))]
+
+    def memory_bytes(self):
+        return sum(g.nbytes for g in self.generations) + self._recent_bytes()
+
+    def stats(self):
+        return {
+            "recent": len(self.recent),
+            "max_recent": self.max_exact,
+            "generations": len(self.generations),
+            "max_generations": self.max_generations,
+            "memory_kb": round(self.memory_bytes() / 1024, 1),
+        }
+
+    def save(self, path=None):
+        """
+        헤더 + 최근 항목(해시, 시각) + Bloom 세대 비트를 바이너리 한 파일로 저장합니다.
+        임시 파일에 쓴 뒤 교체하므로 저장 중에 죽어도 이전 파일이 남습니다.
+        """
+        path = path or self.path
+        if path is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<HdddqqII", VERSION, self.window, self.error_rate, self.generation_error_rate,
+                                self.max_bytes, self.generation_capacity, len(self.recent), len(self.generations)))
+            f.write(b"".join(digest + struct.pack("<d", seen_at) for digest, seen_at in self.recent.items()))
+            for g in self.generations:
+                f.write(struct.pack("<qqIqd", g.capacity, g.n_bits, g.n_hashes, g.count, g.created_at))
+                f.write(g.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """
+        저장된 파일이 있으면 읽어서, 없으면 새로 만들어서 돌려줍니다.
+        """
+        dedup = cls(path=path, **kwargs)
+        if not os.path.exists(path):
+            return dedup
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:4] != MAGIC:
+            print(f"⚠️ 중복 제거 파일 형식이 달라 새로 시작합니다: {path}")
+            return dedup
+        header = struct.Struct("<HdddqqII")
+        version, window, error_rate, gen_error_rate, max_bytes, capacity, n_recent, n_generations = \
+            header.unpack_from(data, 4)
+        offset = 4 + header.size
+        recent = {}
+        for _ in range(n_recent):
+            recent[data[offset:offset + 16]] = struct.unpack_from("<d", data, offset + 16)[0]
+            offset += 24
+        generations = []
+        gen_header = struct.Struct("<qqIqd")
+        for _ in range(n_generations):
+            g_capacity, n_bits, n_hashes, count, created_at = gen_header.unpack_from(data, offset)
+            offset += gen_header.size
+            g = BloomFilter.__new__(BloomFilter)
+            g.capacity, g.n_bits, g.n_hashes, g.count, g.created_at = g_capacity, n_bits, n_hashes, count, created_at
+            n_bytes = (n_bits + 7) // 8
+            g.bits = bytearray(data[offset:offset + n_bytes])
+            offset += n_bytes
+            generations.append(g)
+        dedup.recent = recent
+        # 설정이 바뀌었으면 기존 세대는 그대로 읽되, 상한을 넘는 오래된 세대는 버린다
+        dedup.generations = generations[-dedup.max_generations:]
+        dedup.expire()
+        return dedup
+
+
+class RegistryDeduplicator:
+    """
+    ArticleRegistry를 그대로 쓰는 정확한 중복 제거기 (WindowedDeduplicator와 같은 인터페이스).
+    notified=True면 알림 보낸 기사를, 아니면 처리한 기사를 중복으로 봅니다.
+    """
+
+    def __init__(self, registry, notified=False):
+        self.registry = registry
+        self.notified = notified
+
+    def __contains__(self, key):
+        return not self.filter_new([key])
+
+    def filter_new(self, keys):
+        if self.notified:
+            return self.registry.filter_unnotified(keys)
+        return self.registry.filter_unprocessed(keys)
+
+    def add(self, keys, now=None):
+        if self.notified:
+            self.registry.mark_notified(keys, at=now)
+        else:
+            self.registry.mark_processed(keys, at=now)
+
+    def stats(self):
+        return {"registry": self.registry.count()}
+
+    def save(self, path=None):
+        pass
+
+
+def make_deduplicator(kind, path, registry, notified=False, **kwargs):
+    """
+    kind("windowed" | "registry")에 맞는 중복 제거기를 만듭니다.
+    windowed 파일이 아직 없으면 레지스트리에 있는 기사로 채워서 시작합니다.
+    """
+    if kind == "windowed":
+        seed = not os.path.exists(path)
+        dedup = WindowedDeduplicator.load(path, **kwargs)
+        if seed:
+            dedup.add(registry.urls(notified=notified))
+        return dedup
+    if kind == "registry":
+        return RegistryDeduplicator(registry, notified=notified)
+    raise ValueError(f"지원하지 않는 중복 제거 방식입니다: {kind} (windowed | registry)")
@@ -0,0 +1,187 @@
+# embedding_store.py
+# 임베딩 벡터를 디스크에 모아 두고 다시 쓰는 저장소 (모델별 파일, 키 = 정규화한 텍스트 해시)
+#
+# 파일 구성 (data/embeddings/)
+#   {model}.f32   : float32 벡터를 행 단위로 이어 붙인 파일 (np.memmap으로 읽음)
+#   {model}.keys  : 행마다 텍스트 해시 16바이트
+#   {model}.json  : 모델 이름, 차원, 확정된 행 수
+#   {model}.lock  : 추가할 때 잡는 프로세스 간 잠금 파일
+#
+# 추가할 때는 벡터/키를 먼저 쓰고 마지막에 json의 행 수를 바꾸므로, 중간에 끊겨도
+# json에 기록된 행까지만 읽습니다 (뒤에 남은 반쪽 행은 다음에 추가할 때 잘라냄).
+# 반쪽 행을 잘라내는 기준은 json의 행 수라서 쓰는 쪽은 한 번에 하나여야 합니다. 그래서 add()는
+# {model}.lock에 배타 잠금(fcntl.flock)을 잡고, 잠금 안에서 json을 다시 읽어 다른 프로세스가 그사이
+# 추가한 행까지 반영한 뒤에 자르고 이어 씁니다. (fcntl이 없는 환경에서는 한 프로세스만 써야 함)
+
+import os
+import re
+import json
+import hashlib
+import threading
+import unicodedata
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+EMBEDDING_DIR = os.path.join(DATA_DIR, "embeddings")
+KEY_BYTES = 16
+
+
+def text_key(text):
+    """
+    유니코드 NFC, 공백 연속은 한 칸으로 정규화한 텍스트의 16바이트 해시.
+    """
+    text = re.sub(r"\s+", " ", unicodedata.normalize("NFC", str(text or ""))).strip()
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=KEY_BYTES).digest()
+
+
+class EmbeddingStore:
+    """
+    Args:
+    model (str): 임베딩 모델 이름 (모델마다 파일이 따로 생김).
+    store_dir (str): 저장 디렉터리.
+    """
+
+    def __init__(self, model, store_dir=EMBEDDING_DIR):
+        self.model = model
+        self.store_dir = store_dir
+        name = re.sub(r"[^A-Za-z0-9._-]", "_", model)
+        self.vector_path = os.path.join(store_dir, f"{name}.f32")
+        self.key_path = os.path.join(store_dir, f"{name}.keys")
+        self.meta_path = os.path.join(store_dir, f"{name}.json")
+        self.lock_path = os.path.join(store_dir, f"{name}.lock")
+        self.dim = None
+        self.count = 0
+        self.hits = self.misses = 0
+        self._rows = {}
+        self._vectors = None
+        self._meta_stamp = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        self._refresh()
+
+    def _refresh(self):
+        # json에 확정된 행 수가 메모리보다 많으면(다른 프로세스가 추가함) 늘어난 키만 읽어서 붙임
+        try:
+            stat = os.stat(self.meta_path)
+        except FileNotFoundError:
+            return
+        stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if stamp == self._meta_stamp:
+            return  # json이 그대로면 다시 읽지 않음 (조회마다 stat 한 번)
+        self._meta_stamp = stamp
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["count"] < self.count:
+            # 파일을 지우고 새로 만든 경우: 처음부터 다시 읽음
+            self.count, self._rows = 0, {}
+        if meta["count"] == self.count:
+            return
+        self.dim = meta["dim"]
+        with open(self.key_path, "rb") as f:
+            f.seek(self.count * KEY_BYTES)
+            keys = np.fromfile(f, dtype=f"S{KEY_BYTES}", count=meta["count"] - self.count)
+        for offset, key in enumerate(keys):
+            self._rows[bytes(key).ljust(KEY_BYTES, b"\0")] = self.count + offset
+        self.count = meta["count"]
+        self._map()
+
+    @contextmanager
+    def _file_lock(self):
+        os.makedirs(self.store_dir, exist_ok=True)
+        with open(self.lock_path, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _map(self):
+        self._vectors = np.memmap(self.vector_path, dtype=np.float32, mode="r",
+                                  shape=(self.count, self.dim)) if self.count else None
+
+    def _save_meta(self):
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"model": self.model, "dim": self.dim, "count": self.count}, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, text):
+        with self._lock:
+            self._refresh()
+            return text_key(text) in self._rows
+
+    def lookup(self, texts, count=True):
+        """
+        texts의 벡터를 (n, dim) float32 배열로 돌려주고, 저장소에 없는 항목의 위치 목록을 함께 돌려줍니다.
+        없는 항목의 행은 0으로 채워집니다. 저장소가 비어 있으면 배열 대신 None을 돌려줍니다.
+        """
+        with self._lock:
+            # 실시간 루프와 일일 run_cluster가 같은 파일을 쓰므로 다른 프로세스가 추가한 행도 찾음
+            self._refresh()
+            rows = [self._rows.get(text_key(text)) for text in texts]
+            missing = [i for i, row in enumerate(rows) if row is None]
+            if count:
+                self.hits += len(rows) - len(missing)
+                self.misses += len(missing)
+            if self.dim is None:
+                return None, missing
+            vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+            found = [i for i, row in enumerate(rows) if row is not None]
+            if found:
+                vectors[found] = self._vectors[[rows[i] for i in found]]
+            return vectors, missing
+
+    def add(self, texts, vectors):
+        """
+        texts와 같은 순서의 벡터를 저장합니다. 이미 있는 텍스트는 건너뜁니다.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(texts):
+            return 0
+        with self._lock, self._file_lock():
+            # 잠금을 잡은 뒤 json을 다시 읽어야 다른 프로세스가 추가한 행을 잘라내지 않음
+            self._refresh()
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"벡터 차원이 저장소와 다릅니다: {vectors.shape[1]} != {self.dim}")
+            new_keys, new_rows, seen = [], [], set()
+            for i, text in enumerate(texts):
+                key = text_key(text)
+                if key not in self._rows and key not in seen:
+                    seen.add(key)
+                    new_keys.append(key)
+                    new_rows.append(i)
+            if not new_keys:
+                return 0
+
+            for path, row_bytes, data in ((self.vector_path, self.dim * 4, vectors[new_rows].tobytes()),
+                                          (self.key_path, KEY_BYTES, b"".join(new_keys))):
+                with open(path, "ab") as f:
+                    f.truncate(self.count * row_bytes)  # 확정되지 않은 반쪽 행 제거
+                    f.write(data)
+            for offset, key in enumerate(new_keys):
+                self._rows[key] = self.count + offset
+            self.count += len(new_keys)
+            self._save_meta()
+            self._map()
+            return len(new_keys)
+
+    def stats(self):
+        size = os.path.getsize(self.vector_path) if os.path.exists(self.vector_path) else 0
+        return {"model": self.model, "vectors": self.count, "dim": self.dim, "hits": self.hits,
+                "misses": self.misses, "size_mb": round(size / 1024 / 1024, 1)}
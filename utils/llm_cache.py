@@ -0,0 +1,240 @@
+# llm_cache.py
+# 같은 기사 본문을 같은 프롬프트로 다시 요약하지 않도록 LLM 응답을 디스크에 저장하는 캐시
+#
+# 키: (모델, 시스템 프롬프트, 프롬프트 템플릿 해시, 키워드, 정규화한 본문 해시)
+# prompt/ 아래 파일이 바뀌면 버전을 올리고 예전 템플릿으로 만든 응답을 지웁니다.
+#
+# 환경변수
+#   NEWSBOT_LLM_CACHE : 0이면 캐시를 쓰지 않음
+
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+DEFAULT_CACHE_PATH = os.path.join(BASE_DIR, "data", "llm_cache.sqlite3")
+PROMPT_DIR = os.path.join(BASE_DIR, "prompt")
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60     # 이보다 오래전에 만든 응답은 자주 쓰여도 만료 (모델/프롬프트 변화 대비)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024   # 캐시 전체 크기 상한
+TOUCH_FLUSH_EVERY = 256                 # 접근 시각 갱신을 이만큼 모아서 한 번에 기록
+
+
+def llm_cache_enabled():
+    return os.getenv("NEWSBOT_LLM_CACHE", "1").lower() not in ("0", "false", "no")
+
+
+def text_hash(text):
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def normalize_content(text):
+    """
+    캐시 키용 본문 정규화: 유니코드 NFC, 공백 연속은 한 칸으로, 앞뒤 공백 제거.
+    """
+    text = unicodedata.normalize("NFC", str(text or ""))
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def make_key(model, system_prompt, template, keywords, content):
+    parts = [
+        model,
+        text_hash(system_prompt),
+        text_hash(template),
+        normalize_content(keywords),
+        text_hash(normalize_content(content)),
+    ]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class CachedResponse:
+    __slots__ = ("raw", "parsed", "created_at")
+
+    def __init__(self, raw, parsed, created_at):
+        self.raw = raw
+        self.parsed = parsed
+        self.created_at = created_at
+
+
+class LLMCache:
+    """
+    LLM 응답(원문 + 파싱한 필드)을 저장하는 SQLite 캐시.
+
+    Args:
+    path (str): SQLite 파일 경로.
+    max_age (float): 만든 지 이만큼 지난 항목은 조회되지 않고 정리 대상(초). 접근 시각은 LRU 정리에만 씁니다.
+    max_bytes (int): 캐시 전체 크기 상한. 넘으면 가장 오래 안 쓴 항목부터 지웁니다.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_age=DEFAULT_MAX_AGE, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+        self._touched = {}  # 아직 기록하지 않은 접근 시각 {key: accessed_at}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                template_hash TEXT NOT NULL,
+                raw TEXT NOT NULL,
+                parsed TEXT,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_created ON responses (created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_template ON responses (template_hash)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS prompt_versions (
+                name TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def lookup(self, key, count=True):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT raw, parsed, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            now = time.time()
+            if row is None or row[2] < now - self.max_age:
+                self.misses += count
+                return None
+            # 조회마다 쓰기/커밋하지 않도록 접근 시각은 모아 두었다가 한 번에 기록 (LRU 순서용이라 조금 늦어도 됨)
+            self._touched[key] = now
+            if len(self._touched) >= TOUCH_FLUSH_EVERY:
+                self._flush_touched()
+                self._conn.commit()
+            self.hits += count
+        raw, parsed, created_at = row
+        return CachedResponse(raw, json.loads(parsed) if parsed else None, created_at)
+
+    def _flush_touched(self):
+        # self._lock을 잡은 상태에서 호출
+        if self._touched:
+            self._conn.executemany("UPDATE responses SET accessed_at = ? WHERE key = ?",
+                                   [(accessed_at, key) for key, accessed_at in self._touched.items()])
+            self._touched.clear()
+
+    def store(self, key, model, template, raw, parsed=None):
+        parsed_json = json.dumps(parsed, ensure_ascii=False) if parsed is not None else None
+        size = len(raw.encode("utf-8")) + len((parsed_json or "").encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._touched.pop(key, None)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, template_hash, raw, parsed, created_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, model, text_hash(template), raw, parsed_json, now, now, size),
+            )
+            self._conn.commit()
+
+    def store_parsed(self, key, parsed):
+        parsed_json = json.dumps(parsed, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET parsed = ?, size = length(CAST(raw AS BLOB)) + ? WHERE key = ?",
+                (parsed_json, len(parsed_json.encode("utf-8")), key),
+            )
+            self._conn.commit()
+
+    def sync_prompt_versions(self, prompt_dir=PROMPT_DIR):
+        """
+        prompt_dir의 파일 해시를 기록된 값과 비교해, 바뀐 파일은 버전을 올리고
+        예전 내용으로 만든 응답을 지웁니다. {파일 이름: 버전}을 돌려줍니다.
+        """
+        if not os.path.isdir(prompt_dir):
+            return {}
+        versions = {}
+        now = time.time()
+        with self._lock:
+            known = {name: (hash_, version) for name, hash_, version in
+                     self._conn.execute("SELECT name, hash, version FROM prompt_versions")}
+            for name in sorted(os.listdir(prompt_dir)):
+                path = os.path.join(prompt_dir, name)
+                if not os.path.isfile(path):
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    current = text_hash(f.read())
+                old_hash, version = known.get(name, (None, 0))
+                if current != old_hash:
+                    version += 1
+                    if old_hash is not None:
+                        removed = self._conn.execute(
+                            "DELETE FROM responses WHERE template_hash = ?", (old_hash,)).rowcount
+                        print(f"🔄 프롬프트 변경 감지: {name} v{version} (캐시 {removed}건 무효화)")
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO prompt_versions (name, hash, version, updated_at) VALUES (?, ?, ?, ?)",
+                        (name, current, version, now),
+                    )
+                versions[name] = version
+            self._conn.commit()
+        return versions
+
+    def evict(self):
+        """
+        만든 지 max_age를 넘긴 항목을 지우고, 전체 크기가 max_bytes를 넘으면 LRU 순서로 지웁니다.
+        """
+        with self._lock:
+            self._flush_touched()
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.max_age,))
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+                doomed = []
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    doomed.append((key,))
+                    total -= size
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+            self._conn.commit()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._flush_touched()
+            self._conn.commit()
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """
+    프로세스 전체에서 공유하는 LLM 캐시를 돌려줍니다. 처음 열 때 prompt/ 버전을 맞춥니다.
+    NEWSBOT_LLM_CACHE=0이면 None을 돌려줍니다.
+    """
+    global _cache
+    if not llm_cache_enabled():
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                cache = LLMCache()
+                cache.sync_prompt_versions()
+                _cache = cache
+    return _cache
@@ -0,0 +1,149 @@
+# near_dup.py
+# 통신사 기사를 조금씩 고쳐 쓴 재전송 기사(연합뉴스, 뉴스1, 뉴시스 등)를 묶는 근접 중복 탐지
+#
+# 본문을 글자 n-gram(shingle)으로 나눠 MinHash 서명을 만들고, LSH(밴드별 버킷)로 후보 쌍만
+# 비교하므로 기사 수가 늘어도 전체 쌍을 다 비교하지 않습니다.
+#
+# 환경변수
+#   NEWSBOT_NEAR_DUP : 같은 묶음으로 볼 추정 자카드 유사도 (기본 0.8, 0이면 근접 중복을 묶지 않음)
+
+import os
+import re
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+
+DEFAULT_THRESHOLD = 0.8
+SHINGLE_SIZE = 5           # 글자 5-gram
+BANDS, ROWS = 20, 6        # 서명 길이 = BANDS * ROWS, 후보가 되는 유사도 ≈ (1/BANDS) ** (1/ROWS) ≈ 0.61
+MERSENNE_PRIME = (1 << 31) - 1
+ROLLING_BASE = 1000003
+
+
+def near_dup_threshold():
+    return float(os.getenv("NEWSBOT_NEAR_DUP", str(DEFAULT_THRESHOLD)))
+
+
+def normalize_text(text):
+    """
+    유니코드 NFC, 공백 연속은 한 칸으로, 앞뒤 공백 제거.
+    """
+    text = unicodedata.normalize("NFC", str(text or ""))
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    """
+    text의 글자 size-gram을 31비트 정수로 해시한 배열(중복 제거)을 돌려줍니다.
+    """
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    if len(codes) < size:
+        return np.unique(codes % MERSENNE_PRIME) if len(codes) else codes
+    n = len(codes) - size + 1
+    hashes = np.zeros(n, dtype=np.uint64)
+    for j in range(size):
+        hashes = (hashes * ROLLING_BASE + codes[j:j + n]) % MERSENNE_PRIME
+    return np.unique(hashes)
+
+
+class MinHasher:
+    """
+    h(x) = (a * x + b) mod p 꼴의 해시 num_perm개로 MinHash 서명을 만듭니다.
+    """
+
+    def __init__(self, num_perm=BANDS * ROWS, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, MERSENNE_PRIME, num_perm, dtype=np.uint64)[:, None]
+        self.b = rng.integers(0, MERSENNE_PRIME, num_perm, dtype=np.uint64)[:, None]
+
+    def signature(self, text):
+        shingles = shingle_hashes(normalize_text(text))
+        if not len(shingles):
+            return None
+        return ((self.a * shingles[None, :] + self.b) % MERSENNE_PRIME).min(axis=1).astype(np.uint32)
+
+
+class NearDupGrouper:
+    """
+    본문이 서로 비슷한 기사를 묶고, 묶음마다 대표 기사(가장 긴 본문)를 고릅니다.
+
+    Args:
+    threshold (float): 같은 묶음으로 볼 추정 자카드 유사도.
+    bands (int), rows (int): LSH 밴드 수와 밴드당 서명 길이.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, bands=BANDS, rows=ROWS, seed=1):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.hasher = MinHasher(bands * rows, seed)
+        self.articles = self.groups = self.duplicates = self.compared = 0
+
+    def group(self, texts):
+        """
+        texts의 각 항목에 대해 대표 기사의 위치를 담은 리스트를 돌려줍니다.
+        묶이지 않은 기사와 빈 본문은 자기 자신의 위치가 대표입니다.
+        """
+        texts = list(texts)
+        signatures = [self.hasher.signature(t) if isinstance(t, str) else None for t in texts]
+        valid = [i for i, s in enumerate(signatures) if s is not None]
+        parent = list(range(len(texts)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        if valid:
+            matrix = np.stack([signatures[i] for i in valid])
+            for band in range(self.bands):
+                buckets = defaultdict(list)
+                block = matrix[:, band * self.rows:(band + 1) * self.rows]
+                for pos, key in enumerate(map(bytes, block)):
+                    buckets[key].append(pos)
+                for members in buckets.values():
+                    if len(members) < 2:
+                        continue
+                    # 버킷 안에서는 첫 기사와만 비교해 버킷이 커도 선형으로 유지
+                    similarity = (matrix[members[1:]] == matrix[members[0]]).mean(axis=1)
+                    self.compared += len(members) - 1
+                    for pos, sim in zip(members[1:], similarity):
+                        if sim >= self.threshold:
+                            root_a, root_b = find(valid[members[0]]), find(valid[pos])
+                            if root_a != root_b:
+                                parent[root_b] = root_a
+
+        clusters = defaultdict(list)
+        for i in range(len(texts)):
+            clusters[find(i)].append(i)
+        representatives = [0] * len(texts)
+        for members in clusters.values():
+            rep = max(members, key=lambda i: (len(texts[i]) if isinstance(texts[i], str) else -1, -i))
+            for i in members:
+                representatives[i] = rep
+
+        self.articles += len(texts)
+        self.groups += sum(1 for members in clusters.values() if len(members) > 1)
+        self.duplicates += sum(len(members) - 1 for members in clusters.values())
+        return representatives
+
+    def stats(self):
+        return {
+            "articles": self.articles,
+            "groups": self.groups,
+            "duplicates": self.duplicates,
+            "duplicate_ratio": round(self.duplicates / self.articles, 3) if self.articles else 0.0,
+            "compared": self.compared,
+            "threshold": self.threshold,
+        }
+
+
+def make_grouper():
+    """
+    NEWSBOT_NEAR_DUP이 0이 아니면 묶음기를, 아니면 None을 돌려줍니다.
+    """
+    threshold = near_dup_threshold()
+    return NearDupGrouper(threshold) if threshold > 0 else None
@@ -0,0 +1,168 @@
+# neighbors.py
+# 임베딩 군집화용 희소 반경 이웃 그래프 (n×n 거리 행렬을 만들지 않음)
+#
+# 벡터를 정규화한 뒤 코사인 거리(1 - 내적)가 eps 이하인 쌍만 CSR 행렬로 모읍니다.
+#   - exact : 행을 chunk_size개씩 나눠 전체와 내적 (메모리 O(chunk_size × n), 결과는 dense와 같음)
+#   - ann   : IVF 색인 (k-means로 목록을 나누고 벡터마다 가까운 목록 n_probe개 안에서만 비교, 근사)
+# DBSCAN(metric="precomputed")에 그대로 넣을 수 있습니다.
+
+import math
+
+import numpy as np
+from scipy import sparse
+from sklearn.cluster import DBSCAN, MiniBatchKMeans
+
+DEFAULT_CHUNK_SIZE = 2048
+DEFAULT_N_PROBE = 8
+KMEANS_SAMPLE = 50000   # IVF 목록 중심을 학습할 때 쓰는 최대 벡터 수
+
+
+def normalize_rows(X):
+    """
+    행 벡터를 길이 1로 맞춘 float32 배열과, 길이가 0이 아닌 행 마스크를 돌려줍니다.
+    """
+    X = np.asarray(X, dtype=np.float32)
+    norms = np.linalg.norm(X, axis=1)
+    valid = norms > 0
+    X = X.copy()
+    X[valid] /= norms[valid, None]
+    return X, valid
+
+
+def _graph(rows, cols, dists, n):
+    # 같은 쌍이 여러 번 나오면 하나만 남김 (explicit 0 거리도 이웃으로 남아야 하므로 합치지 않음)
+    keys = rows.astype(np.int64) * n + cols
+    keys, first = np.unique(keys, return_index=True)
+    return sparse.csr_matrix((dists[first], (keys // n, keys % n)), shape=(n, n))
+
+
+def radius_graph(X, eps, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    정규화된 X에서 코사인 거리가 eps 이하인 모든 쌍(자기 자신 포함)을 CSR 거리 행렬로 돌려줍니다.
+    """
+    n = len(X)
+    rows, cols, dists = [], [], []
+    for start in range(0, n, chunk_size):
+        dist = 1.0 - X[start:start + chunk_size] @ X.T
+        np.clip(dist, 0.0, 2.0, out=dist)
+        r, c = np.nonzero(dist <= eps)
+        rows.append(r + start)
+        cols.append(c)
+        dists.append(dist[r, c])
+    if not rows:
+        return sparse.csr_matrix((n, n), dtype=np.float32)
+    return _graph(np.concatenate(rows), np.concatenate(cols), np.concatenate(dists), n)
+
+
+def spherical_kmeans(X, n_clusters, n_iter, seed=0):
+    """
+    정규화된 X를 내적 기준으로 나누는 가벼운 k-means (무작위 초기화 + n_iter번 갱신).
+    MiniBatchKMeans보다 덜 고르지만 수천 개 벡터면 수십 ms라서 자주 다시 만드는 색인에 씀.
+    """
+    rng = np.random.default_rng(seed)
+    centers = X[rng.choice(len(X), n_clusters, replace=False)]
+    for _ in range(n_iter):
+        assignment = np.argmax(X @ centers.T, axis=1)
+        one_hot = sparse.csr_matrix((np.ones(len(X), dtype=np.float32), (assignment, np.arange(len(X)))),
+                                    shape=(n_clusters, len(X)))
+        sums = np.asarray(one_hot @ X)
+        empty = ~sums.any(axis=1)
+        sums[empty] = centers[empty]  # 빈 목록은 이전 중심 유지
+        centers, _ = normalize_rows(sums)
+    return centers
+
+
+class IVFIndex:
+    """
+    k-means 중심으로 벡터를 목록(list)에 나눠 두고, 벡터마다 중심이 가까운 n_probe개 목록 안에서만
+    거리를 계산하는 근사 최근접 이웃 색인. 비교 횟수가 전체 쌍의 약 n_probe / n_lists로 줄어듭니다.
+
+    Args:
+    n_lists (int): 목록 수 (없으면 sqrt(n)).
+    n_probe (int): 벡터마다 함께 볼 가까운 목록 수 (클수록 정확하고 느림).
+    kmeans_iter (int): 주면 MiniBatchKMeans 대신 spherical_kmeans를 이만큼만 돌려 빨리 만듦.
+    """
+
+    def __init__(self, n_lists=None, n_probe=DEFAULT_N_PROBE, seed=0, kmeans_iter=None):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.seed = seed
+        self.kmeans_iter = kmeans_iter
+        self.X = None
+        self.centroids = None
+        self.lists = []
+        self.compared = 0
+
+    def fit(self, X):
+        self.X = X
+        n_lists = min(len(X), self.n_lists or max(1, int(math.sqrt(len(X)))))
+        rng = np.random.default_rng(self.seed)
+        sample = X[rng.choice(len(X), min(len(X), KMEANS_SAMPLE), replace=False)]
+        if self.kmeans_iter is not None:
+            self.centroids = spherical_kmeans(sample, n_lists, self.kmeans_iter, self.seed)
+        else:
+            kmeans = MiniBatchKMeans(n_clusters=n_lists, n_init=1, batch_size=4096, random_state=self.seed).fit(sample)
+            self.centroids, _ = normalize_rows(kmeans.cluster_centers_)
+        assignment = np.concatenate([np.argmax(X[start:start + DEFAULT_CHUNK_SIZE] @ self.centroids.T, axis=1)
+                                     for start in range(0, len(X), DEFAULT_CHUNK_SIZE)])
+        self.lists = [np.flatnonzero(assignment == i) for i in range(n_lists)]
+        return self
+
+    def nearest_lists(self, vector, n_probe=None):
+        """
+        정규화된 벡터 하나에 중심이 가까운 목록 번호 n_probe개를 돌려줍니다 (온라인 조회용).
+        """
+        n_probe = min(n_probe or self.n_probe, len(self.lists))
+        scores = self.centroids @ vector
+        return np.argpartition(-scores, n_probe - 1)[:n_probe]
+
+    def _nearest_lists(self, queries, n_probe):
+        scores = self.X[queries] @ self.centroids.T
+        return np.argpartition(-scores, n_probe - 1, axis=1)[:, :n_probe]
+
+    def radius_graph(self, eps):
+        """
+        색인한 벡터끼리 코사인 거리가 eps 이하인 쌍을 CSR 거리 행렬로 돌려줍니다 (대칭, 근사).
+        벡터마다 중심이 가까운 n_probe개 목록을 고르고, 목록별로 그 목록을 고른 벡터들과 한 번에 비교합니다.
+        """
+        n = len(self.X)
+        n_probe = min(self.n_probe, len(self.lists))
+        probes = np.concatenate([self._nearest_lists(np.arange(start, min(n, start + DEFAULT_CHUNK_SIZE)), n_probe)
+                                 for start in range(0, n, DEFAULT_CHUNK_SIZE)])
+        # 목록 j를 고른 벡터 번호들 (probes를 목록 번호 기준으로 정렬해서 나눔)
+        order = np.argsort(probes, axis=None, kind="stable")
+        probers = np.split(order // n_probe, np.cumsum(np.bincount(probes.ravel(), minlength=len(self.lists)))[:-1])
+
+        rows, cols, dists = [], [], []
+        for members, queries in zip(self.lists, probers):
+            if not len(members) or not len(queries):
+                continue
+            self.compared += len(members) * len(queries)
+            for start in range(0, len(queries), DEFAULT_CHUNK_SIZE):
+                chunk = queries[start:start + DEFAULT_CHUNK_SIZE]
+                dist = 1.0 - self.X[chunk] @ self.X[members].T
+                np.clip(dist, 0.0, 2.0, out=dist)
+                r, c = np.nonzero(dist <= eps)
+                rows.append(chunk[r])
+                cols.append(members[c])
+                dists.append(dist[r, c])
+        if not rows:
+            return sparse.csr_matrix((n, n), dtype=np.float32)
+        rows, cols, dists = np.concatenate(rows), np.concatenate(cols), np.concatenate(dists)
+        # 한쪽에서만 찾은 쌍도 양쪽 이웃이 되도록 대칭으로 만듦
+        return _graph(np.concatenate([rows, cols]), np.concatenate([cols, rows]), np.concatenate([dists, dists]), n)
+
+
+def sparse_dbscan(X, eps=0.3, min_samples=2, ann=False, n_probe=DEFAULT_N_PROBE):
+    """
+    길이가 0인 행(빈 텍스트)은 빼고 희소 이웃 그래프로 DBSCAN을 돌립니다.
+    빠진 행은 -1(노이즈)입니다. 결과 라벨은 dense 코사인 거리 행렬 + DBSCAN과 같은 규칙입니다.
+    """
+    X, valid = normalize_rows(X)
+    labels = np.full(len(X), -1, dtype=int)
+    if not valid.any():
+        return labels
+    X = X[valid]
+    graph = IVFIndex(n_probe=n_probe).fit(X).radius_graph(eps) if ann else radius_graph(X, eps)
+    labels[valid] = DBSCAN(eps=eps, min_samples=min_samples, metric="precomputed").fit_predict(graph)
+    return labels
@@ -0,0 +1,80 @@
+# prompt_registry.py
+# prompt/ 아래 프롬프트 파일을 한 번만 읽어 두고, 파일이 바뀌면 다시 읽는 레지스트리
+#
+# 기사마다 파일을 다시 열지 않고, 실시간 루프를 재시작하지 않아도 수정한 프롬프트가 반영됩니다.
+# (파일 수정 시각과 크기를 확인해서 바뀐 경우에만 다시 읽음)
+
+import os
+import hashlib
+import threading
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+PROMPT_DIR = os.path.join(BASE_DIR, "prompt")
+
+
+class PromptEntry:
+    __slots__ = ("text", "hash", "mtime", "size", "loads")
+
+    def __init__(self, text, mtime, size, loads):
+        self.text = text
+        self.hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        self.mtime = mtime
+        self.size = size
+        self.loads = loads
+
+
+class PromptRegistry:
+    """
+    Args:
+    prompt_dir (str): 프롬프트 파일이 있는 디렉터리.
+    """
+
+    def __init__(self, prompt_dir=PROMPT_DIR):
+        self.prompt_dir = prompt_dir
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, name):
+        path = os.path.join(self.prompt_dir, name)
+        stat = os.stat(path)  # 파일이 없으면 FileNotFoundError
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and (entry.mtime, entry.size) == (stat.st_mtime_ns, stat.st_size):
+                return entry
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            loads = entry.loads + 1 if entry is not None else 1
+            if entry is not None and entry.text != text:
+                print(f"🔄 프롬프트 변경 감지, 다시 읽음: {name}")
+            entry = PromptEntry(text, stat.st_mtime_ns, stat.st_size, loads)
+            self._entries[name] = entry
+            return entry
+
+    def get(self, name):
+        """
+        prompt/{name}의 내용을 돌려줍니다. 파일이 바뀌었으면 다시 읽습니다.
+        """
+        return self._entry(name).text
+
+    def hash(self, name):
+        return self._entry(name).hash
+
+    def stats(self):
+        with self._lock:
+            return {name: {"hash": entry.hash[:12], "loads": entry.loads} for name, entry in self._entries.items()}
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_prompt_registry():
+    """
+    프로세스 전체에서 공유하는 프롬프트 레지스트리를 돌려줍니다.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = PromptRegistry()
+    return _registry
@@ -0,0 +1,114 @@
+# storage.py
+# 파이프라인 단계 사이의 중간 결과 저장소 (기본 Parquet, 필요할 때만 Excel 내보내기)
+#
+# 파일 이름 규칙: {prefix}_{date}[_{stage}].{확장자}
+#   - 목록 수집   : stage=None       (예: cnews_20250411.parquet)
+#   - 본문 수집   : stage="naver"
+#   - 요약        : stage="summary"
+#   - 클러스터링  : stage="cluster"
+#
+# 환경변수
+#   NEWSBOT_STORAGE_FORMAT : parquet(기본) | feather | excel
+#   NEWSBOT_EXCEL_EXPORT   : 1이면 저장할 때 사람이 볼 .xlsx도 같이 씀
+
+import os
+import pandas as pd
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+EXTENSIONS = {
+    "parquet": ".parquet",
+    "feather": ".arrow",
+    "excel": ".xlsx",
+}
+# 읽을 때는 빠른 형식부터 찾고, 예전 실행에서 남은 .xlsx도 읽을 수 있게 둔다
+READ_ORDER = ["parquet", "feather", "excel"]
+
+
+def storage_format():
+    fmt = os.getenv("NEWSBOT_STORAGE_FORMAT", "parquet").lower()
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"지원하지 않는 저장 형식입니다: {fmt} (parquet | feather | excel)")
+    return fmt
+
+
+def excel_export_enabled():
+    return os.getenv("NEWSBOT_EXCEL_EXPORT", "0").lower() in ("1", "true", "yes")
+
+
+def stage_path(prefix, date, stage=None, fmt=None, data_dir=DATA_DIR):
+    fmt = fmt or storage_format()
+    suffix = f"_{stage}" if stage else ""
+    return os.path.join(data_dir, f"{prefix}_{date}{suffix}{EXTENSIONS[fmt]}")
+
+
+def _arrow_safe(df):
+    # object 컬럼에 여러 타입이 섞여 있으면(예: bool과 str) Arrow가 거부하므로 문자열로 통일
+    df = df.copy()
+    for column in df.columns[df.dtypes == object]:
+        types = {type(v) for v in df[column] if v is not None and not (isinstance(v, float) and pd.isna(v))}
+        if len(types) > 1 and not types <= {int, float}:
+            df[column] = df[column].map(lambda v: v if v is None or (isinstance(v, float) and pd.isna(v)) else str(v))
+    return df
+
+
+def write_frame(df, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.endswith(".parquet"):
+        _arrow_safe(df).to_parquet(path, index=False)
+    elif path.endswith(".arrow"):
+        _arrow_safe(df).reset_index(drop=True).to_feather(path)
+    else:
+        df.to_excel(path, index=False)
+    return path
+
+
+def read_frame(path):
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    if path.endswith(".arrow"):
+        return pd.read_feather(path)
+    return pd.read_excel(path, engine='openpyxl')
+
+
+def find_stage_file(prefix, date, stage=None, data_dir=DATA_DIR):
+    """
+    단계 파일을 찾아 경로를 돌려줍니다. 설정된 형식을 먼저 보고, 없으면 다른 형식도 찾습니다.
+    """
+    preferred = storage_format()
+    for fmt in [preferred] + [f for f in READ_ORDER if f != preferred]:
+        path = stage_path(prefix, date, stage, fmt, data_dir)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def load_stage(prefix, date, stage=None, data_dir=DATA_DIR):
+    """
+    단계 결과를 DataFrame으로 읽습니다. 파일이 없으면 None을 돌려줍니다.
+    """
+    path = find_stage_file(prefix, date, stage, data_dir)
+    if path is None:
+        print(f"파일이 존재하지 않아요: {stage_path(prefix, date, stage, data_dir=data_dir)}")
+        return None
+    return read_frame(path)
+
+
+def save_frame(df, path, excel=None):
+    """
+    DataFrame을 path에 저장합니다. excel이 True이거나 NEWSBOT_EXCEL_EXPORT가 켜져 있으면
+    같은 이름의 .xlsx도 함께 씁니다.
+    """
+    write_frame(df, path)
+    print(f"뉴스 데이터가 {os.path.basename(path)} 파일로 저장되었습니다.")
+    if excel is None:
+        excel = excel_export_enabled()
+    if excel and not path.endswith(".xlsx"):
+        excel_path = os.path.splitext(path)[0] + EXTENSIONS["excel"]
+        write_frame(df, excel_path)
+        print(f"📤 엑셀 내보내기: {os.path.basename(excel_path)}")
+    return path
+
+
+def save_stage(df, prefix, date, stage=None, data_dir=DATA_DIR, excel=None):
+    return save_frame(df, stage_path(prefix, date, stage, data_dir=data_dir), excel=excel)
@@ -0,0 +1,183 @@
+# token_budget.py
+# LLM/임베딩 호출 전에 본문을 작업별 토큰 예산에 맞게 줄이는 도구
+#
+# tiktoken이 설치되어 있으면 모델 토크나이저로 세고, 없으면 글자 수를 토큰 수로 봅니다.
+# (한국어 기사는 글자 수가 토큰 수보다 크거나 비슷하므로 보수적으로 잘림)
+
+import re
+import threading
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# 작업별 (토큰 예산, 자르는 방식). 예산은 프롬프트 + 본문을 합친 입력 토큰 수입니다.
+TASK_BUDGETS = {
+    "summary": (3000, "lead_tail"),   # 기사 분류/요약: 리드가 중요하고 끝부분 결론도 일부 남김
+    "cluster": (800, "lead"),         # 임베딩용 제목 + 본문 앞부분
+    "report": (400, "sentence"),      # 리포트에 넣는 기사 본문 일부
+    "excerpt": (80, "lead"),          # 목록용 짧은 발췌
+}
+STRATEGIES = ("lead", "lead_tail", "sentence")
+TAIL_RATIO = 0.2
+ELLIPSIS = " … "
+SENTENCE_END = re.compile(r"(?<=[.!?。])\s+")
+
+
+class _CharEncoder:
+    """
+    tiktoken이 없을 때 쓰는 대체 인코더. 글자 하나를 토큰 하나로 봅니다.
+    """
+
+    def encode(self, text):
+        return list(text)
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+_encoders = {}
+_encoders_lock = threading.Lock()
+
+
+def get_encoder(model):
+    with _encoders_lock:
+        if model not in _encoders:
+            if tiktoken is None:
+                _encoders[model] = _CharEncoder()
+            else:
+                try:
+                    _encoders[model] = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    _encoders[model] = tiktoken.get_encoding("o200k_base")
+        return _encoders[model]
+
+
+def count_tokens(text, model="gpt-4o"):
+    return len(get_encoder(model).encode(text or ""))
+
+
+def truncate_tokens(text, max_tokens, strategy="lead", model="gpt-4o", tail_ratio=TAIL_RATIO):
+    """
+    text를 max_tokens 이하로 줄여서 돌려줍니다.
+
+    Args:
+    strategy (str): "lead"(앞부분만), "lead_tail"(앞부분 + 끝부분 일부),
+                    "sentence"(앞에서부터 문장 단위로 들어가는 만큼).
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"지원하지 않는 자르기 방식입니다: {strategy} ({' | '.join(STRATEGIES)})")
+    encoder = get_encoder(model)
+    tokens = encoder.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+
+    if strategy == "sentence":
+        kept, used = [], 0
+        for sentence in SENTENCE_END.split(text):
+            n = len(encoder.encode(sentence)) + (1 if kept else 0)
+            if used + n > max_tokens:
+                break
+            kept.append(sentence)
+            used += n
+        if kept:
+            return " ".join(kept)
+        strategy = "lead"  # 첫 문장부터 예산을 넘으면 앞부분만 자름
+
+    if strategy == "lead_tail":
+        tail = int(max_tokens * tail_ratio)
+        head = max_tokens - tail - len(encoder.encode(ELLIPSIS))
+        if tail > 0 and head > 0:
+            return encoder.decode(tokens[:head]).rstrip() + ELLIPSIS + encoder.decode(tokens[-tail:]).lstrip()
+
+    return encoder.decode(tokens[:max_tokens]).rstrip()
+
+
+class TokenBudgeter:
+    """
+    작업 하나의 토큰 예산을 적용하고, 한 번 실행 동안 줄인 토큰 수를 집계합니다.
+
+    Args:
+    task (str): TASK_BUDGETS의 작업 이름.
+    max_tokens (int): 예산을 직접 지정할 때 (없으면 작업 기본값).
+    strategy (str): 자르는 방식을 직접 지정할 때 (없으면 작업 기본값).
+    model (str): 토큰을 셀 모델 이름.
+    min_content_tokens (int): 프롬프트가 길어도 본문에 최소한 남길 토큰 수.
+    """
+
+    def __init__(self, task, max_tokens=None, strategy=None, model="gpt-4o", min_content_tokens=200):
+        default_tokens, default_strategy = TASK_BUDGETS[task]
+        self.task = task
+        self.max_tokens = max_tokens or default_tokens
+        self.strategy = strategy or default_strategy
+        self.model = model
+        self.min_content_tokens = min(min_content_tokens, self.max_tokens)
+        self.articles = self.truncated = 0
+        self.tokens_before = self.tokens_after = 0
+        self._prompt_tokens = {}
+        self._lock = threading.Lock()
+
+    def _count_prompt(self, prompt):
+        if prompt not in self._prompt_tokens:
+            self._prompt_tokens[prompt] = count_tokens(prompt, self.model)
+        return self._prompt_tokens[prompt]
+
+    def fit(self, text, prompt=""):
+        """
+        prompt와 합쳐 예산을 넘지 않도록 text를 줄여서 돌려줍니다. 비어 있으면 그대로 돌려줍니다.
+        """
+        if not isinstance(text, str) or not text:
+            return text
+        budget = max(self.min_content_tokens, self.max_tokens - self._count_prompt(prompt or ""))
+        before = count_tokens(text, self.model)
+        fitted = text if before <= budget else truncate_tokens(text, budget, self.strategy, self.model)
+        after = before if fitted is text else count_tokens(fitted, self.model)
+        with self._lock:
+            self.articles += 1
+            self.truncated += fitted is not text
+            self.tokens_before += before
+            self.tokens_after += after
+        return fitted
+
+    def stats(self):
+        saved = self.tokens_before - self.tokens_after
+        return {
+            "articles": self.articles,
+            "truncated": self.truncated,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "tokens_saved": saved,
+            "saved_ratio": round(saved / self.tokens_before, 3) if self.tokens_before else 0.0,
+        }
+
+    def report(self):
+        stats = self.stats()
+        tokenizer = "tiktoken" if tiktoken is not None else "글자 수 근사"
+        print(f"✂️ [{self.task}] 토큰 예산 {self.max_tokens} ({self.strategy}, {tokenizer}): "
+              f"{stats['articles']}건 중 {stats['truncated']}건 축약, "
+              f"본문 토큰 {stats['tokens_before']} → {stats['tokens_after']} "
+              f"({stats['tokens_saved']} 절약, {stats['saved_ratio']:.1%})")
+        return stats
+
+
+def pack_by_tokens(items, max_tokens, overhead=0, max_items=8, model="gpt-4o"):
+    """
+    [(id, 본문, 키워드)] 목록을 한 요청에 들어갈 묶음들로 나눕니다.
+    묶음마다 overhead(프롬프트) + 기사 토큰 합이 max_tokens를 넘지 않고, 기사 수는 max_items 이하입니다.
+    예산보다 큰 기사는 혼자 한 묶음이 됩니다.
+    """
+    packs, current, used = [], [], overhead
+    for item in items:
+        _, text, keywords = item
+        n = count_tokens(text, model) + count_tokens(str(keywords or ""), model) + 16  # id/구분자 여유분
+        if current and (used + n > max_tokens or len(current) >= max_items):
+            packs.append(current)
+            current, used = [], overhead
+        current.append(item)
+        used += n
+    if current:
+        packs.append(current)
+    return packs